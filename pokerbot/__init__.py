@@ -0,0 +1,47 @@
+"""Texas Hold 'Em (and Omaha) hand evaluation, equity and simulation.
+
+Importing the package is cheap: the public names below are imported from
+their modules on first access, so e.g. pandas is only imported by the
+modules that build DataFrames, when they're used.
+"""
+import importlib
+
+# Public name -> module that defines it:
+_EXPORTS = {
+    "Card": "card",
+    "Deck": "deck",
+    "Hand": "hand",
+    "TexasHoldem5Hand": "hand",
+    "HandState": "hand",
+    "evaluate": "evaluator",
+    "evaluate_batch": "batch_evaluator",
+    "OmahaHand": "omaha",
+    "evaluate_omaha_batch": "omaha",
+    "Equity": "equity",
+    "exact_equity": "equity",
+    "monte_carlo_equity": "monte_carlo",
+    "Range": "ranges",
+    "range_equity": "range_equity",
+    "preflop_equity": "preflop",
+    "preflop_matchup": "preflop",
+    "analyze_outs": "outs",
+    "HoldemFlopOdds": "odds_calculators",
+    "Table": "table",
+    "TableBatch": "table",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Only look it up once.
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,255 @@
+"""Hand strength, potential and equity distributions, and bucket tables that
+abstract every (hole cards, board) situation into one of K buckets.
+
+For a hand on a flop or turn, `hand_potential` enumerates every opponent hand
+and runout to compute:
+    - HS: the probability of being ahead of a random hand now (ties count
+      half);
+    - PPot / NPot: the positive / negative potential, i.e. the probability
+      of going from behind to ahead / ahead to behind by the river;
+    - EHS: the effective hand strength, HS * (1 - NPot) + (1 - HS) * PPot;
+    - the histogram of the hand's river equity against a random hand over
+      the runouts.
+
+`build_buckets` clusters the equity histograms of every canonical (suit
+isomorphic, see `isomorphism`) situation of the flop or turn into K buckets
+with k-means, computing the histograms of each board in parallel, and
+`bucket` looks a situation's bucket up in the table at play time, with a
+binary search of the sorted canonical keys. Tables are built ahead of time,
+see `indexes`. (On the river, the equity itself is the situation's feature,
+see `range_equity.combo_equities`.)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .card import card_codes
+from .indexes import load_table
+from .isomorphism import canonical_boards, canonical_keys
+from .preflop import COMBOS
+from .range_equity import board_strengths, combo_equities
+from .shared import SharedTables
+from .utils import combinations_array
+
+BINS = 20  # Default number of bins of equity histograms.
+STREETS = {"flop": 3, "turn": 4}  # Street -> number of board cards.
+
+
+class HandPotential:
+    """Strength and potential of a hand."""
+
+    def __init__(self, hs: float, ppot: float, npot: float, histogram: np.ndarray, n: int):
+        """
+        Args:
+            hs (float): hand strength against a random hand on the board.
+            ppot (float): positive potential.
+            npot (float): negative potential.
+            histogram (np.ndarray): fraction of runouts in each equal-width
+                bin of river equity (0 -> 1) against a random hand.
+            n (int): number of (opponent hand, runout) pairs enumerated.
+        """
+        self.hs = hs
+        self.ppot = ppot
+        self.npot = npot
+        self.histogram = histogram
+        self.n = n
+
+    @property
+    def ehs(self):
+        """Effective hand strength."""
+        return self.hs * (1.0 - self.npot) + (1.0 - self.hs) * self.ppot
+
+    def __repr__(self):
+        return f"HandPotential(hs={self.hs:.4f}, ppot={self.ppot:.4f}, npot={self.npot:.4f}, ehs={self.ehs:.4f})"
+
+
+def _runout_boards(board, dead):
+    """(R, 5) array of the complete boards of every runout of a board, not
+    using any dead card."""
+    deck = np.array([c for c in range(52) if c not in set(board) | set(dead)], dtype=np.uint8)
+    runouts = deck[combinations_array(len(deck), 5 - len(board))]
+    return np.hstack([np.broadcast_to(np.array(board, dtype=np.uint8), (len(runouts), len(board))), runouts])
+
+
+def hand_potential(hole, board, bins: int = BINS):
+    """Calculate the strength and potential of a hand by enumerating every
+    opponent hand and runout (see module docstring).
+
+    Args:
+        hole (sequence): 2 hole cards (see `card.card_code`).
+        board (sequence): 3 or 4 board cards.
+        bins (int): number of bins of the equity histogram.
+    """
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(hole) == 2, "Invalid number of hole cards, must be exactly 2."
+    assert len(board) in (3, 4), f"Invalid number of board cards, must be 3 or 4: {len(board)}"
+    assert len(set(hole + board)) == len(hole + board), "Duplicate playing cards in hand."
+    dead = set(hole + board)
+    villain_index = [i for i, (a, b) in enumerate(COMBOS.tolist()) if a not in dead and b not in dead]
+    villains = COMBOS[villain_index]
+    known = np.broadcast_to(np.array(board, dtype=np.uint8), (len(villains), len(board)))
+    now = np.sign(evaluate_batch(np.array([hole + board], dtype=np.uint8))[0].astype(np.int64)
+                  - evaluate_batch(np.hstack([villains, known])))  # (M, ), 1 = ahead.
+
+    boards = _runout_boards(board, hole)
+    hero = evaluate_batch(np.hstack([np.broadcast_to(np.array(hole, dtype=np.uint8), (len(boards), 2)), boards]))
+    # Strengths of the villain combos on each runout, 0 where blocked:
+    later = board_strengths(boards)[:, villain_index].astype(np.int64)
+    live = later > 0
+    later = np.sign(hero[:, None].astype(np.int64) - later)  # (R, M).
+
+    # Counts of each (now, later) pair of outcomes, indexed by outcome + 1:
+    transitions = np.zeros((3, 3))
+    for i in range(3):
+        for j in range(3):
+            transitions[i, j] = np.count_nonzero(live & (now[None, :] == i - 1) & (later == j - 1))
+    behind, tied, ahead = 0, 1, 2
+    totals = transitions.sum(axis=1)
+    hs = (np.count_nonzero(now == 1) + np.count_nonzero(now == 0) / 2) / len(now)
+    ppot_base = totals[behind] + totals[tied] / 2
+    npot_base = totals[ahead] + totals[tied] / 2
+    ppot = ((transitions[behind, ahead] + transitions[behind, tied] / 2 + transitions[tied, ahead] / 2) / ppot_base
+            if ppot_base else 0.0)
+    npot = ((transitions[ahead, behind] + transitions[tied, behind] / 2 + transitions[ahead, tied] / 2) / npot_base
+            if npot_base else 0.0)
+
+    # River equity of each runout against the live villain combos:
+    river = ((later == 1) * live).sum(axis=1) + ((later == 0) * live).sum(axis=1) / 2
+    river = river / live.sum(axis=1)
+    histogram = np.bincount(np.minimum((river * bins).astype(np.intp), bins - 1), minlength=bins) / len(river)
+    return HandPotential(hs=float(hs), ppot=float(ppot), npot=float(npot), histogram=histogram,
+                         n=int(live.sum()))
+
+
+def equity_histograms(board, bins: int = BINS):
+    """Histograms of the river equity against a random hand over every runout,
+    for every combo on a board of 3, 4 or 5 cards.
+
+    Returns a (1326, bins) float array of the fraction of runouts in each bin,
+    with zero rows for combos which share a card with the board.
+    """
+    board = card_codes(board)
+    equities = combo_equities(board_strengths(_runout_boards(board, ())))  # (R, 1326), NaN if blocked.
+    live = ~np.isnan(equities)
+    combos = np.broadcast_to(np.arange(len(COMBOS)), equities.shape)[live]
+    index = np.minimum((equities[live] * bins).astype(np.intp), bins - 1)
+    histograms = np.bincount(combos * bins + index, minlength=len(COMBOS) * bins).reshape(len(COMBOS), bins)
+    runouts = live.sum(axis=0)
+    return histograms / np.maximum(runouts, 1)[:, None]
+
+
+def board_situations(board, bins: int = BINS):
+    """Return a tuple of (keys, histograms) of the distinct canonical
+    situations of every combo on a board: an (N, ) int64 array of the keys
+    of `isomorphism.canonical_keys` of (hole, board), and an (N, bins) array
+    of their equity histograms."""
+    board = card_codes(board)
+    histograms = equity_histograms(board, bins)
+    live = np.flatnonzero(~np.isin(COMBOS, board).any(axis=1))
+    keys, _ = canonical_keys(COMBOS[live], np.broadcast_to(np.array(board, dtype=np.uint8), (len(live), len(board))))
+    keys, first = np.unique(keys, return_index=True)
+    return keys, histograms[live[first]]
+
+
+def _board_situations(args):
+    return board_situations(*args)
+
+
+def _nearest(features: np.ndarray, centers: np.ndarray, executor=None, chunk_size: int = 1 << 16):
+    """Index of the nearest center (squared Euclidean distance) of each row."""
+    center_norms = np.square(centers).sum(axis=1)
+
+    def nearest(chunk):
+        return np.argmin(center_norms - 2 * chunk @ centers.T, axis=1)
+
+    chunks = [features[i:i + chunk_size] for i in range(0, len(features), chunk_size)]
+    results = executor.map(nearest, chunks) if executor is not None else map(nearest, chunks)
+    return np.concatenate(list(results))
+
+
+def kmeans(features: np.ndarray, k: int, iterations: int = 100, seed: int = 0, workers: int = 1):
+    """Cluster rows of features into k clusters with Lloyd's algorithm, from
+    k-means++ initial centers. Returns a tuple of ((k, d) centers, (N, )
+    labels)."""
+    rng = np.random.default_rng(seed)
+    features = np.asarray(features, dtype=np.float32)
+    k = min(k, len(features))
+    # k-means++ on a sample of the rows:
+    sample = features[rng.choice(len(features), size=min(len(features), 100 * k), replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    distances = np.square(sample - centers[0]).sum(axis=1)
+    for _ in range(1, k):
+        p = distances / distances.sum() if distances.sum() > 0 else None
+        centers.append(sample[rng.choice(len(sample), p=p)])
+        distances = np.minimum(distances, np.square(sample - centers[-1]).sum(axis=1))
+    centers = np.array(centers)
+
+    with ThreadPoolExecutor(workers) if workers > 1 else nullcontext() as executor:
+        labels = _nearest(features, centers, executor)
+        for _ in range(iterations):
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, features)
+            # Empty clusters keep their center:
+            centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+            new_labels = _nearest(features, centers, executor)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+    return centers, labels
+
+
+def build_buckets(street: str = "flop", k: int = 200, bins: int = BINS, boards=None, iterations: int = 100,
+                  seed: int = 0, workers: int = 1):
+    """Build the bucket table of a street: cluster the cumulative equity
+    histograms of every canonical situation with k-means, so that distances
+    between histograms approximate the earth mover's distance.
+
+    Args:
+        street (str): "flop" or "turn".
+        k (int): number of buckets.
+        bins (int): number of bins of the equity histograms.
+        boards (np.ndarray): boards to include, by default every canonical
+            board of the street (see `isomorphism.canonical_boards`).
+        iterations (int): maximum number of k-means iterations.
+        seed (int): seed of the k-means initialization.
+        workers (int): number of processes computing histograms, which share
+            the lookup tables (see `shared`), and of threads assigning
+            clusters.
+
+    Returns an (N, 2) int64 array of rows of (canonical key, bucket), sorted
+    by key. Buckets are ordered by mean equity, so higher is stronger.
+    """
+    if boards is None:
+        boards, _ = canonical_boards(STREETS[street])
+    args = [(board.tolist(), bins) for board in np.asarray(boards)]
+    if workers > 1:
+        with SharedTables() as tables, tables.executor(workers) as executor:
+            results = list(executor.map(_board_situations, args, chunksize=max(1, len(args) // (4 * workers))))
+    else:
+        results = [_board_situations(a) for a in args]
+    keys = np.concatenate([r[0] for r in results])
+    histograms = np.concatenate([r[1] for r in results])
+    keys, first = np.unique(keys, return_index=True)
+    histograms = histograms[first].astype(np.float32)
+
+    centers, labels = kmeans(np.cumsum(histograms, axis=1), k, iterations=iterations, seed=seed, workers=workers)
+    # Relabel the buckets by the mean equity of their center (1 - mean of its CDF):
+    order = np.argsort(np.argsort(-centers.mean(axis=1)))
+    return np.stack([keys, order[labels]], axis=1).astype(np.int64)
+
+
+def bucket(hole, board):
+    """Bucket of a situation of 2 hole cards and 3 or 4 board cards, from the
+    street's bucket table (see `build_buckets`)."""
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(board) in (3, 4), f"Invalid number of board cards, must be 3 or 4: {len(board)}"
+    street = {n: s for s, n in STREETS.items()}[len(board)]
+    table = load_table(f"buckets_{street}")
+    key, _ = canonical_keys(np.array([hole]), np.array([board]))
+    i = np.searchsorted(table[:, 0], key[0])
+    if i == len(table) or table[i, 0] != key[0]:
+        raise KeyError(f"Situation isn't in the {street} bucket table: {hole} {board}")
+    return int(table[i, 1])
@@ -0,0 +1,86 @@
+"""Vectorized hand evaluation over NumPy arrays of card codes.
+
+Evaluates an (N, k) integer array of card codes (see `card.Card.code`), for k
+in 5, 6 or 7, to an (N, ) array of the same strengths as `evaluator.evaluate`
+without creating any per-hand Python objects:
+    - the suit rank masks of each row are looked up in the flush table;
+    - the product of the rank primes of each row is looked up in the sorted
+      keys of the `evaluator.unsuited_table` for k cards.
+"""
+import numpy as np
+
+from .card import CARDS
+from . import evaluator
+
+
+PRIMES = np.array([c.prime for c in CARDS], dtype=np.int64)
+BITS = np.array([c.bit for c in CARDS], dtype=np.int16)
+RANKS = np.array([c.rank_index for c in CARDS], dtype=np.int8)
+SUITS = np.array([c.suit_index for c in CARDS], dtype=np.int8)
+
+# Lower bound of each category in `evaluator.CATEGORIES`, for `categories`:
+CATEGORY_FLOORS = np.array(evaluator.CATEGORY_FLOORS, dtype=np.int16)
+
+_UNSUITED = dict()  # Number of cards -> (sorted prime products, strengths).
+_FLUSH = None  # `evaluator.FLUSH_TABLE` as an array, once built.
+
+
+def flush_array():
+    """The `evaluator.FLUSH_TABLE` as an int16 array, built on first use."""
+    global _FLUSH
+    if _FLUSH is None:
+        evaluator.build_tables()
+        _FLUSH = np.array(evaluator.FLUSH_TABLE, dtype=np.int16)
+    return _FLUSH
+
+
+def unsuited_arrays(n: int):
+    """Tuple of (sorted prime products, strengths) arrays for `n` cards."""
+    try:
+        return _UNSUITED[n]
+    except KeyError:
+        pass
+    table = evaluator.unsuited_table(n)
+    keys = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+    values = np.fromiter(table.values(), dtype=np.int16, count=len(table))
+    order = np.argsort(keys)
+    _UNSUITED[n] = keys[order], values[order]
+    return _UNSUITED[n]
+
+
+def _evaluate_chunk(codes: np.ndarray):
+    keys, values = unsuited_arrays(codes.shape[1])
+    flush = flush_array()
+    products = PRIMES[codes].prod(axis=1)
+    strengths = values[np.searchsorted(keys, products)]
+    bits, suits = BITS[codes], SUITS[codes]
+    for suit in range(4):
+        masks = np.bitwise_or.reduce(np.where(suits == suit, bits, 0), axis=1)
+        np.maximum(strengths, flush[masks], out=strengths)  # A flush beats any unsuited hand of <= 7 cards.
+    return strengths
+
+
+def evaluate_batch(codes, chunk_size: int = 1 << 18):
+    """Return an (N, ) int16 array of the strengths of an (N, 5), (N, 6) or
+    (N, 7) array of integer card codes. Rows are processed in chunks of
+    `chunk_size` to bound the size of intermediate arrays."""
+    codes = np.asarray(codes)
+    assert codes.ndim == 2 and codes.shape[1] in (5, 6, 7), f"Invalid shape of cards to evaluate: {codes.shape}"
+    codes = codes.astype(np.intp, copy=False)
+    if len(codes) <= chunk_size:
+        return _evaluate_chunk(codes)
+    strengths = np.empty(len(codes), dtype=np.int16)
+    for start in range(0, len(codes), chunk_size):
+        strengths[start:start + chunk_size] = _evaluate_chunk(codes[start:start + chunk_size])
+    return strengths
+
+
+def categories(strengths):
+    """Return an array of the indexes into `evaluator.CATEGORIES` of an array
+    of strengths."""
+    return (np.searchsorted(CATEGORY_FLOORS, strengths, side="right") - 1).astype(np.int8)
+
+
+def category_labels(strengths):
+    """Return an array of category labels (e.g. "FH") of an array of strengths."""
+    return np.array(evaluator.CATEGORIES)[categories(strengths)]
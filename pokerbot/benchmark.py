@@ -0,0 +1,304 @@
+"""Benchmarks and a correctness oracle for the evaluators, decks and odds
+calculators.
+
+Run as a script to time every benchmark, check the evaluators against all
+2,598,960 five-card and 133,784,560 seven-card hands (see
+`check_category_counts`), write the results as JSON and compare them with a
+baseline, e.g.
+
+    python -m pokerbot.benchmark --output bench.json --save-baseline baseline.json
+    python -m pokerbot.benchmark --baseline baseline.json --tolerance 0.25
+
+The script exits with status 1 if the oracle fails or any benchmark is slower
+than its baseline by more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from .batch_evaluator import categories, evaluate_batch
+from .cache import equity_key
+from .card import CARDS, Card, card_codes
+from .deck import Deck
+from .equity import exact_equity
+from .evaluator import CATEGORIES, evaluate, evaluate5
+from .hand import Hand, HandState, TexasHoldem5Hand
+from .monte_carlo import monte_carlo_equity
+from .omaha import evaluate_omaha_batch
+from .odds_calculators import HoldemFlopOdds
+from .range_equity import range_equity
+from .ranges import Range
+from .table import TableBatch, random_policy
+from .utils import combinations_array
+
+# Number of 5-card hands of each category:
+FIVE_CARD_COUNTS = {
+    "HC": 1302540, "P": 1098240, "2P": 123552, "3": 54912, "S": 10200,
+    "F": 5108, "FH": 3744, "4": 624, "SF": 36, "RF": 4,
+}
+
+# Number of 7-card hands (133,784,560) whose best 5 cards are of each category:
+SEVEN_CARD_COUNTS = {
+    "HC": 23294460, "P": 58627800, "2P": 31433400, "3": 6461620, "S": 6180020,
+    "F": 4047644, "FH": 3473184, "4": 224848, "SF": 37260, "RF": 4324,
+}
+
+# Name -> function which does any setup and returns the callable to time:
+BENCHMARKS = dict()
+
+
+def benchmark(name: str):
+    """Decorator to register a benchmark."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _random_hands(n: int, size: int, seed: int = 0):
+    """List of `n` random hands of `size` cards."""
+    codes = Deck(seed).shuffles(n)[:, :size]
+    return [[CARDS[c] for c in row] for row in codes.tolist()]
+
+
+@benchmark("card_construction")
+def _card_construction():
+    return lambda: (Card("AS"), Card("10", "H"), Card("q", "d"), Card.from_int(17))
+
+
+@benchmark("hand_best_hand")
+def _hand_best_hand():
+    hands = _random_hands(100, 7)
+    return lambda: [Hand(*cards).best_hand for cards in hands]
+
+
+@benchmark("texas_holdem_5_hand_best_hand")
+def _texas_holdem_5_hand_best_hand():
+    hands = _random_hands(100, 5)
+    return lambda: [TexasHoldem5Hand(*cards).best_hand for cards in hands]
+
+
+@benchmark("evaluate5")
+def _evaluate5():
+    hands = [[c.code for c in cards] for cards in _random_hands(1000, 5)]
+    return lambda: [evaluate5(*codes) for codes in hands]
+
+
+@benchmark("evaluate_7")
+def _evaluate_7():
+    hands = [[c.code for c in cards] for cards in _random_hands(1000, 7)]
+    return lambda: [evaluate(codes) for codes in hands]
+
+
+@benchmark("evaluate_batch_7")
+def _evaluate_batch_7():
+    codes = Deck(0).shuffles(100000)[:, :7]
+    return lambda: evaluate_batch(codes)
+
+
+@benchmark("evaluate_omaha_batch")
+def _evaluate_omaha_batch():
+    codes = Deck(0).shuffles(10000)
+    return lambda: evaluate_omaha_batch(codes[:, :4], codes[:, 4:9])
+
+
+@benchmark("deck_shuffle_deal")
+def _deck_shuffle_deal():
+    deck = Deck(0)
+
+    def run():
+        deck.reset()
+        return [deck.deal() for _ in range(52)]
+
+    return run
+
+
+@benchmark("deck_shuffles")
+def _deck_shuffles():
+    deck = Deck(0)
+    return lambda: deck.shuffles(10000)
+
+
+@benchmark("holdem_flop_odds_init")
+def _holdem_flop_odds_init():
+    return HoldemFlopOdds
+
+
+@benchmark("create_hands_df")
+def _create_hands_df():
+    odds = HoldemFlopOdds()
+    return lambda: odds.create_hands_df(Card("AS"), Card("KD"))
+
+
+@benchmark("exact_equity_flop")
+def _exact_equity_flop():
+    return lambda: exact_equity(["as", "ks"], ["qs", "js", "2d"], [["qh", "qd"]])
+
+
+@benchmark("monte_carlo_equity")
+def _monte_carlo_equity():
+    return lambda: monte_carlo_equity(["as", "ks"], ["qs", "js", "2d"], villains=2, samples=20000, seed=0)
+
+
+@benchmark("range_equity_turn")
+def _range_equity_turn():
+    hero, villain = Range("22+, A2s+, KTo+"), Range("TT+, AQs+")
+    return lambda: range_equity(hero, villain, ["qs", "js", "2d", "3c"])
+
+
+@benchmark("equity_key_range")
+def _equity_key_range():
+    combos = Range("22+, A2+, K2+, Q2+, J2+, T2+").combos()
+    hole, board = card_codes(["as", "ah"]), card_codes(["qs", "js", "2d", "3c", "9h"])
+    return lambda: equity_key("exact", hole, board, [combos])
+
+
+@benchmark("table_batch_hand")
+def _table_batch_hand():
+    batch = TableBatch(1000, [random_policy(seed=i) for i in range(6)], seed=0)
+    return batch.play_hand
+
+
+def measure(func, repeat: int = 5, min_time: float = 0.2):
+    """Best time in seconds of one call of `func`, over `repeat` runs of as
+    many calls as take at least `min_time` seconds."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(names=None, repeat: int = 5, min_time: float = 0.2):
+    """Dict of benchmark name -> best seconds per call."""
+    results = dict()
+    for name, setup in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = measure(setup(), repeat=repeat, min_time=min_time)
+    return results
+
+
+def _count_errors(counts: np.ndarray, expected: dict, n: int):
+    return [f"{n} cards, {cat}: {count} hands, expected {expected[cat]}"
+            for cat, count in zip(CATEGORIES, counts.tolist()) if count != expected[cat]]
+
+
+def _seven_card_counts():
+    """Category counts of every 7-card hand with the batch evaluator, in
+    chunks of the hands sharing their 2 lowest cards."""
+    counts = np.zeros(len(CATEGORIES), dtype=np.int64)
+    for low, second in combinations_array(52, 2).tolist():
+        rest = combinations_array(51 - second, 5) + (second + 1)
+        hands = np.hstack([np.broadcast_to(np.array([low, second], dtype=np.uint8), (len(rest), 2)), rest])
+        counts += np.bincount(categories(evaluate_batch(hands)), minlength=len(CATEGORIES))
+    return counts
+
+
+def best_subset_strengths(hands: np.ndarray):
+    """Strengths of (N, 6) or (N, 7) card codes as the maximum over their
+    5-card subsets, with the (exhaustively checked) 5-card batch evaluator."""
+    subsets = combinations_array(hands.shape[1], 5, dtype=np.intp)
+    return np.max([evaluate_batch(hands[:, s]) for s in subsets], axis=0)
+
+
+def check_category_counts(seven_cards: bool = True, samples: int = 100000):
+    """Check the evaluators, returning a list of error messages (empty if
+    correct):
+        - every 5-card hand with the batch evaluator, against the number of
+          hands of each category, and with the scalar `evaluate5`;
+        - if `seven_cards`, every 7-card hand with the batch evaluator,
+          against the number of hands of each category (about a minute);
+        - a fixed sample of `samples` 6- and 7-card hands with the batch
+          evaluator, `evaluate`, `Hand.strength` and `HandState.strength`,
+          against the best of their 5-card subsets.
+    """
+    hands = combinations_array(52, 5)
+    strengths = evaluate_batch(hands)
+    errors = _count_errors(np.bincount(categories(strengths), minlength=len(CATEGORIES)), FIVE_CARD_COUNTS, 5)
+    mismatches = sum(evaluate5(*row) != s for row, s in zip(hands.tolist(), strengths.tolist()))
+    if mismatches:
+        errors.append(f"evaluate5 disagrees with the batch evaluator on {mismatches} 5-card hands.")
+    if seven_cards:
+        errors += _count_errors(_seven_card_counts(), SEVEN_CARD_COUNTS, 7)
+
+    shuffles = Deck(0).shuffles(samples)
+    for n in (6, 7):
+        hands = shuffles[:, :n]
+        expected = best_subset_strengths(hands).tolist()
+        rows = hands.tolist()
+        evaluators = {
+            "evaluate_batch": evaluate_batch(hands).tolist(),
+            "evaluate": [evaluate(row) for row in rows],
+            "Hand.strength": [Hand(*[CARDS[c] for c in row]).strength for row in rows],
+            "HandState.strength": [HandState(*row).strength for row in rows],
+        }
+        for name, results in evaluators.items():
+            mismatches = sum(a != b for a, b in zip(results, expected))
+            if mismatches:
+                errors.append(f"{name} disagrees with the best 5-card subset on {mismatches} {n}-card hands.")
+    return errors
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25):
+    """List of (name, seconds, baseline seconds) of the benchmarks slower than
+    their baseline by more than `tolerance` (a fraction)."""
+    return [(name, seconds, baseline[name]) for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * (1.0 + tolerance)]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", help="path to write the results as JSON")
+    parser.add_argument("--baseline", help="path of a JSON results file to compare against")
+    parser.add_argument("--save-baseline", help="path to write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-oracle", action="store_true", help="don't check the evaluators")
+    args = parser.parse_args(args)
+
+    failed = False
+    errors = list()
+    if not args.skip_oracle:
+        start = time.perf_counter()
+        errors = check_category_counts()
+        print(f"Oracle: {'FAILED' if errors else 'passed'} in {time.perf_counter() - start:.2f}s")
+        for e in errors:
+            print(f"    {e}")
+        failed = bool(errors)
+
+    results = run_benchmarks(args.names, repeat=args.repeat)
+    for name, seconds in results.items():
+        print(f"{name:<32}{seconds * 1e3:>12.4f} ms")
+    report = dict(
+        meta=dict(time=time.strftime("%Y-%m-%dT%H:%M:%S"), python=platform.python_version(),
+                  numpy=np.__version__, platform=platform.platform()),
+        oracle=dict(checked=not args.skip_oracle, errors=errors),
+        results=results,
+    )
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for name, seconds, before in regressions:
+            print(f"REGRESSION {name}: {seconds * 1e3:.4f} ms vs. {before * 1e3:.4f} ms baseline "
+                  f"({seconds / before - 1:+.0%})")
+        failed |= bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
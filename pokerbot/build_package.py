@@ -1,8 +1,9 @@
-"""Script to set up files required by the package."""
-from itertools import combinations
-import numpy as np
+"""Script to set up files required by the package: `python -m
+pokerbot.build_package`. Indexes are otherwise built on first use, but tables
+must be built here (see `indexes`)."""
 import os
-import pandas as pd
+
+from .indexes import INDEXES, build_index, build_table, index_path, save_array, table_path
 
 
 DIR, FILENAME = os.path.split(__file__)
@@ -15,31 +16,28 @@ def setup_dirs():
 
 
 def setup_indexes():
-    # Flop hands:
-    flop_fp = os.path.join(DIR, "indexes", "flop_index.csv")
-    if not os.path.exists(flop_fp):
-        unseen = 50
-        hands = list(combinations(list(range(unseen)), 3))
-        df = pd.DataFrame([[1.0 if i in hand else np.nan for i in range(unseen)] for hand in hands])
-        df.to_csv(flop_fp, encoding="utf-8", index=False)
-
-    # Turn hands:
-    turn_fp = os.path.join(DIR, "indexes", "turn_index.csv")
-    if not os.path.exists(turn_fp):
-        unseen = 47
-        hands = list(combinations(list(range(unseen)), 1))
-        df = pd.DataFrame([[1.0 if i in hand else np.nan for i in range(unseen)] for hand in hands])
-        df.to_csv(turn_fp, encoding="utf-8", index=False)
-
-    # River hands:
-    river_fp = os.path.join(DIR, "indexes", "river_index.csv")
-    if not os.path.exists(river_fp):
-        unseen = 46
-        hands = list(combinations(list(range(unseen)), 1))
-        df = pd.DataFrame([[1.0 if i in hand else np.nan for i in range(unseen)] for hand in hands])
-        df.to_csv(river_fp, encoding="utf-8", index=False)
+    # Flop, turn and river hands, as uint8 arrays of unseen card positions:
+    for name in INDEXES:
+        save_array(index_path(name), lambda: build_index(name))
+
+
+def setup_preflop_tables(class_samples: int = 20000, matchup_samples: int = 10000, workers: int = 1):
+    # Equity of each starting hand class against 1-9 random opponents:
+    save_array(table_path("preflop_classes"),
+               lambda: build_table("preflop_classes", samples=class_samples, workers=workers))
+
+    # Heads-up equity of every combo against every other combo:
+    save_array(table_path("preflop_matchups"), lambda: build_table("preflop_matchups", samples=matchup_samples))
+
+
+def setup_buckets(workers: int = 1):
+    # Buckets of every canonical flop and turn situation (see `abstraction`):
+    for name in ("buckets_flop", "buckets_turn"):
+        save_array(table_path(name), lambda: build_table(name, workers=workers))
 
 
 if __name__ == "__main__":
     setup_dirs()
     setup_indexes()
+    setup_preflop_tables(workers=os.cpu_count())
+    setup_buckets(workers=os.cpu_count())
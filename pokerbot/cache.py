@@ -0,0 +1,237 @@
+"""Caches for equity results, keyed on canonical (suit-isomorphic) situations.
+
+Any object with `get(key, default=None)` and `set(key, value)` methods can be
+passed as the `cache` argument of the equity APIs (e.g.
+`equity.exact_equity`). Two backends are provided:
+    - `LRUCache`: an in-process least-recently-used cache bounded by the total
+      (pickled) size of its entries and/or their number.
+    - `SQLiteCache`: an on-disk cache that can be shared between processes.
+`TieredCache` chains caches, e.g. an `LRUCache` in front of a `SQLiteCache`.
+All caches count hits, misses and evictions, see `stats`.
+"""
+from collections import OrderedDict
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .isomorphism import PERMUTED_CODE_TUPLES, PERMUTED_COMBOS
+from .utils import combo_weights
+
+
+def sizeof(key, value):
+    """Approximate size of a cache entry in bytes."""
+    return len(pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class LRUCache:
+    """In-process least-recently-used cache."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_items: int = None):
+        """
+        Args:
+            max_bytes (int): maximum total size of the entries (see `sizeof`).
+            max_items (int): maximum number of entries, unbounded if None.
+        """
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.__entries = OrderedDict()  # Key -> (value, size).
+        self.__lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value, _ = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = sizeof(key, value)
+        with self.__lock:
+            if key in self.__entries:
+                self.bytes -= self.__entries.pop(key)[1]
+            if size > self.max_bytes:
+                return  # Too large to ever be cached.
+            self.__entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes or (self.max_items is not None and len(self.__entries) > self.max_items):
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Dict of the cache's counters."""
+        lookups = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, items=len(self),
+                    bytes=self.bytes, hit_rate=self.hits / lookups if lookups else 0.0)
+
+
+class SQLiteCache:
+    """On-disk cache in a SQLite database, which can be shared between worker
+    processes. Values are pickled. Counters are kept per process."""
+
+    def __init__(self, path: str, max_items: int = None, timeout: float = 30.0):
+        """
+        Args:
+            path (str): file path of the database.
+            max_items (int): maximum number of entries, unbounded if None. The
+                least recently used entries are evicted first.
+            timeout (float): seconds to wait for another process's lock.
+        """
+        self.path = path
+        self.max_items = max_items
+        self.timeout = timeout
+        self.__local = threading.local()
+        self.hits = self.misses = self.evictions = 0
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value BLOB, accessed REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def _connection(self):
+        """Connection for the current thread (SQLite connections can't be
+        shared between threads)."""
+        conn = getattr(self.__local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.__local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __contains__(self, key):
+        row = self._connection().execute("SELECT 1 FROM cache WHERE key = ?", (self._key(key), )).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _key(key):
+        return pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get(self, key, default=None):
+        conn = self._connection()
+        k = self._key(key)
+        row = conn.execute("SELECT value FROM cache WHERE key = ?", (k, )).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.max_items is not None:
+            with conn:
+                conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (time.time(), k))
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)",
+                         (self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time()))
+            if self.max_items is not None:
+                excess = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_items
+                if excess > 0:
+                    conn.execute("DELETE FROM cache WHERE key IN "
+                                 "(SELECT key FROM cache ORDER BY accessed LIMIT ?)", (excess, ))
+                    self.evictions += excess
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache")
+
+    def close(self):
+        conn = getattr(self.__local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.__local.conn = None
+
+    def stats(self):
+        """Dict of the cache's counters (for this process)."""
+        lookups = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, items=len(self),
+                    hit_rate=self.hits / lookups if lookups else 0.0)
+
+
+class TieredCache:
+    """Chain of caches, checked in order. A hit in a later cache is copied into
+    the earlier ones, and values are set in every cache."""
+
+    def __init__(self, *caches):
+        self.caches = caches
+
+    def get(self, key, default=None):
+        missing = object()
+        for i, cache in enumerate(self.caches):
+            value = cache.get(key, missing)
+            if value is not missing:
+                for earlier in self.caches[:i]:
+                    earlier.set(key, value)
+                return value
+        return default
+
+    def set(self, key, value):
+        for cache in self.caches:
+            cache.set(key, value)
+
+    def stats(self):
+        """List of the stats of each cache."""
+        return [cache.stats() for cache in self.caches]
+
+
+def equity_key(name: str, hole, board, villains, **params):
+    """Cache key of an equity query, which is the same for every suit-isomorphic
+    version of the situation and for any order of the villains.
+
+    Ranges of 2-card hands are canonicalized as arrays: the weights of the 1326
+    combos are permuted by all 24 suit permutations at once, and each image is
+    represented by the bytes of its weights, so a key of a wide range costs
+    about as much as one of a single hand.
+
+    Args:
+        name (str): name of the equity API.
+        hole (list): the hero's hole card codes.
+        board (list): board card codes.
+        villains (list): one entry per opponent, either None for a random hand,
+            or a list of (card codes, weight) combos.
+        params: any other arguments that change the result.
+    """
+    if all(v is None or all(len(codes) == 2 for codes, _ in v) for v in villains):
+        images = list()
+        for v in villains:
+            if v is None:
+                images.append([b""] * len(PERMUTED_CODE_TUPLES))
+            else:
+                permuted = np.zeros(PERMUTED_COMBOS.shape)
+                permuted[np.arange(len(PERMUTED_COMBOS))[:, None], PERMUTED_COMBOS] = combo_weights(v)
+                images.append([row.tobytes() for row in permuted])
+    else:  # E.g. Omaha hands.
+        images = [[tuple(sorted((tuple(sorted([perm[c] for c in codes])), w) for codes, w in v)) if v else ()
+                   for perm in PERMUTED_CODE_TUPLES] for v in villains]
+    best = None
+    for i, perm in enumerate(PERMUTED_CODE_TUPLES):
+        image = (
+            tuple(sorted([perm[c] for c in hole])),
+            tuple(sorted([perm[c] for c in board])),
+            tuple(sorted(v[i] for v in images)),
+        )
+        if best is None or image < best:
+            best = image
+    return (name, ) + best + (tuple(sorted(params.items())), )
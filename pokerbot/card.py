@@ -1,13 +1,77 @@
+from operator import index
 
+from .variables import RANKS, SUITS
+
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)  # One prime per rank, 2 -> A.
 
-class Card:
-    """A single playing card."""
 
-    def __init__(self, *args):
-        """Create an instance to store the value of a single playing card. Suit
-        and rank can either be passed as 2 separate arguments, or as a single
-        string, e.g. `as` for Ace of Spades, `d10` for 10 of Diamonds, etc.
+class Card:
+    """A single playing card.
+
+    Cards are interned: there are exactly 52 instances, one per entry of the
+    `CARDS` table, and constructing a card returns the shared instance. Each
+    card carries precomputed integer fields so that hand evaluation never has
+    to parse or look anything up:
+
+        code:       0 <= 51, `suit_index * 13 + rank_index` (the order of
+                    `Deck.cards`).
+        rank_index: 0 <= 12 for 2 -> Ace.
+        suit_index: 0 <= 3 for Clubs, Diamonds, Hearts, Spades.
+        int_rank:   2 <= 14, the value returned by `int(card)`.
+        prime:      a unique prime per rank, for rank-multiset products.
+        bit:        `1 << rank_index`, for rank bitmasks.
+        mask:       `1 << code`, for card-set bitmasks.
+    """
+
+    __slots__ = ("code", "rank", "suit", "rank_index", "suit_index", "int_rank", "prime", "bit", "mask")
+
+    def __new__(cls, *args):
+        """Return the card for a suit and rank. These can either be passed as 2
+        separate arguments, or as a single string, e.g. `as` for Ace of Spades,
+        `d10` for 10 of Diamonds, etc.
         """
+        try:
+            return _LOOKUP[args]
+        except (KeyError, TypeError):  # TypeError if args are unhashable.
+            pass
+        rank, suit = cls.parse_args(*args)
+        return CARDS[SUITS.index(suit) * 13 + RANKS.index(rank)]
+
+    @classmethod
+    def _create(cls, code: int):
+        """Build the single instance for `code` (only used to fill `CARDS`)."""
+        card = object.__new__(cls)
+        rank_index, suit_index = code % 13, code // 13
+        fields = dict(
+            code=code, rank=RANKS[rank_index], suit=SUITS[suit_index], rank_index=rank_index,
+            suit_index=suit_index, int_rank=rank_index + 2, prime=PRIMES[rank_index],
+            bit=1 << rank_index, mask=1 << code,
+        )
+        for k, v in fields.items():
+            object.__setattr__(card, k, v)
+        return card
+
+    @classmethod
+    def from_int(cls, code: int):
+        """Return the card with integer `code` (see `Card.code`)."""
+        return CARDS[code]
+
+    @classmethod
+    def from_ints(cls, codes):
+        """Return a list of cards from an iterable of integer codes, e.g. a
+        list or 1-dimensional NumPy array."""
+        return [CARDS[c] for c in codes]
+
+    @staticmethod
+    def to_ints(cards):
+        """Return a list of integer codes for an iterable of cards."""
+        return [c.code for c in cards]
+
+    @classmethod
+    def parse_args(cls, *args):
+        """Parse the arguments accepted by the constructor into a tuple of
+        parsed (rank, suit) strings."""
         if len(args) == 1:
             card = args[0]
             if str(card[-1]).upper() in list("CDHS"):
@@ -25,16 +89,7 @@ class Card:
                 raise ValueError(f"Couldn't parse suit and rank from: {args}")
         else:
             raise ValueError(f"Couldn't parse suit and rank from: {args}")
-        self.__rank = self.parse_rank(rank)
-        self.__suit = self.parse_suit(suit)
-
-    @property
-    def rank(self):
-        return self.__rank
-
-    @property
-    def suit(self):
-        return self.__suit
+        return cls.parse_rank(rank), cls.parse_suit(suit)
 
     @staticmethod
     def parse_rank(rank):
@@ -54,37 +109,100 @@ class Card:
         assert parsed_suit in list("CDHS"), f"Invalid suit: {suit}"  # Clubs, Diamonds, Hearts, Spades.
         return parsed_suit
 
+    def __setattr__(self, key, value):
+        raise AttributeError("Card instances are shared and cannot be modified.")
+
+    def __reduce__(self):
+        return Card.from_int, (self.code, )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __hash__(self):
-        suit = {"C": 0, "D": 1, "H": 2, "S": 3}[self.suit] * 14
-        return suit + int(self)
+        return self.code
 
     def __repr__(self):
         return f"{self.rank}{self.suit}"
 
     def __int__(self):
-        return int({"J": 11, "Q": 12, "K": 13, "A": 14}.get(self.rank, self.rank))
+        return self.int_rank
 
     def __str__(self):
-        rank = {"J": "Jack", "Q": "Queen", "K": "King", "A": "Ace"}.get(self.rank, self.rank)
-        suit = {"C": "Clubs", "D": "Diamonds", "H": "Hearts", "S": "Spades"}.get(self.suit)
-        return f"{rank} of {suit}"
+        return _NAMES[self.code]
 
     def __eq__(self, other):
         """Returns True only if the rank and suit of the cards both match."""
-        return True if ((self.rank == other.rank) and (self.suit == other.suit)) else False
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self is other
 
     def __ne__(self, other):
         """Returns False if the rank or suit of this card differs from other."""
-        return True if ((self.rank != other.rank) or (self.suit != other.suit)) else False
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self is not other
 
     def __lt__(self, other):
-        return True if (int(self) < int(other)) else False
+        return self.int_rank < other.int_rank
 
     def __gt__(self, other):
-        return True if (int(self) > int(other)) else False
+        return self.int_rank > other.int_rank
 
     def __le__(self, other):
-        return True if (int(self) <= int(other)) else False
+        return self.int_rank <= other.int_rank
 
     def __ge__(self, other):
-        return True if (int(self) >= int(other)) else False
+        return self.int_rank >= other.int_rank
+
+
+def card_code(card):
+    """Integer code of a card passed as a `Card`, a string (e.g. "as"), a tuple
+    of (rank, suit) or an integer code."""
+    if isinstance(card, Card):
+        return card.code
+    elif isinstance(card, str):
+        return Card(card).code
+    elif isinstance(card, tuple):
+        return Card(*card).code
+    try:
+        code = index(card)
+    except TypeError:
+        raise TypeError(f"Invalid type to interpret as a card: {type(card)}")
+    assert 0 <= code < 52, f"Invalid card code: {code}"
+    return code
+
+
+def card_codes(cards):
+    """List of the integer codes of an iterable of cards (see `card_code`)."""
+    return [card_code(c) for c in cards]
+
+
+# The 52 shared card instances, indexed by `Card.code`:
+CARDS = tuple(Card._create(code) for code in range(52))
+
+_NAMES = tuple(
+    "{} of {}".format(
+        {"J": "Jack", "Q": "Queen", "K": "King", "A": "Ace"}.get(c.rank, c.rank),
+        {"C": "Clubs", "D": "Diamonds", "H": "Hearts", "S": "Spades"}[c.suit],
+    ) for c in CARDS
+)
+
+# Constructor arguments resolved without parsing, e.g. ("AS", ), ("s", "a"), (10, "D"):
+_LOOKUP = dict()
+for _c in CARDS:
+    _ranks = [_c.rank, _c.rank.lower()]
+    if _c.rank in ("A", "J", "Q", "K"):
+        _ranks.append({"A": 1, "J": 11, "Q": 12, "K": 13}[_c.rank])
+    else:
+        _ranks.append(int(_c.rank))
+    for _r in _ranks:
+        for _s in (_c.suit, _c.suit.lower()):
+            _LOOKUP[(_r, _s)] = _c
+            _LOOKUP[(_s, _r)] = _c
+            if isinstance(_r, str):
+                _LOOKUP[(f"{_r}{_s}", )] = _c
+                _LOOKUP[(f"{_s}{_r}", )] = _c
+del _c, _ranks, _r, _s
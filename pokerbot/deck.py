@@ -1,39 +1,71 @@
+import numpy as np
 
-from itertools import product
-import random
-
-from card import Card
-from variables import RANKS, SUITS
+from .card import CARDS, Card, card_codes
 
 
 class Deck:
-    """A single standard deck of 52 playing cards."""
+    """A single standard deck of 52 playing cards.
+
+    Each deck keeps its own state and random number generator, so decks can be
+    used concurrently and reproducibly. The deck is a permutation of card
+    codes with a cursor, so dealing is O(1).
+    """
 
-    cards = [Card(t[0], t[1]) for t in list(product(SUITS, RANKS))]
+    cards = tuple(CARDS)  # Every card, in the order of `Card.code`. Never shuffled.
 
-    def __init__(self):
-        self.__dealt = list()
+    def __init__(self, seed=None, dead=()):
+        """
+        Args:
+            seed: seed of the deck's random number generator (see
+                `np.random.default_rng`), or a `np.random.Generator`, e.g. to
+                share one stream between decks.
+            dead (sequence): cards excluded from the deck, e.g. known hole
+                cards (see `card.card_code`).
+        """
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        dead = set(card_codes(dead))
+        self.__live = np.array([c for c in range(52) if c not in dead], dtype=np.uint8)
+        self.__order = self.__live.copy()
+        self.__cursor = 0
         self.shuffle()
 
+    def __len__(self):
+        """Number of cards not dealt yet."""
+        return len(self.__order) - self.__cursor
+
     @property
     def dealt(self):
-        return self.__dealt
+        return Card.from_ints(self.__order[:self.__cursor])
 
     @property
     def not_dealt(self):
-        return self.__not_dealt
-
-    def deal(self):
-        """Deal a card."""
-        try:
-            card = self.not_dealt.pop(0)
-            self.__dealt.append(card)
-            return card
-        except IndexError:
+        return Card.from_ints(self.__order[self.__cursor:])
+
+    def deal_codes(self, n: int):
+        """Deal `n` cards, as a uint8 array of card codes."""
+        if n > len(self):
             raise IndexError("All cards in deck dealt.")
+        codes = self.__order[self.__cursor:self.__cursor + n]
+        self.__cursor += n
+        return codes
+
+    def deal(self, n: int = None):
+        """Deal a card, or a list of `n` cards."""
+        if n is None:
+            return CARDS[self.deal_codes(1)[0]]
+        return Card.from_ints(self.deal_codes(n))
 
     def shuffle(self):
-        """Shuffle the deck at the `cards` attribute."""
-        assert not len(self.dealt), "Cannot shuffle cards after dealing starts."
-        random.shuffle(self.cards)
-        self.__not_dealt = self.cards.copy()
+        """Shuffle the cards not excluded from the deck."""
+        assert not self.__cursor, "Cannot shuffle cards after dealing starts."
+        self.__order = self.rng.permutation(self.__live)
+
+    def reset(self):
+        """Return every dealt card to the deck and shuffle it."""
+        self.__cursor = 0
+        self.shuffle()
+
+    def shuffles(self, n: int):
+        """Return an (n, 52 - dead cards) uint8 array of independent shuffles
+        of the deck's cards, without changing the deck's state."""
+        return self.rng.permuted(np.broadcast_to(self.__live, (n, len(self.__live))), axis=1)
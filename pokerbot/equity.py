@@ -0,0 +1,191 @@
+"""Exact Texas Hold 'Em (or Omaha) equity by enumerating every runout of the
+board."""
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .cache import equity_key
+from .card import card_codes
+from .omaha import evaluate_omaha_batch
+from .utils import combinations_array, combo_weights
+
+
+def holdem_strengths(holes: np.ndarray, boards: np.ndarray):
+    """Return an (N, ) array of the Hold 'Em strengths of (N, 2) hole cards
+    with (N, 3 <= 5) board cards."""
+    return evaluate_batch(np.hstack([holes, boards]))
+
+
+# Number of board cards -> minimum number of villain combos for which a
+# heads-up Hold 'Em equity is computed by the sorted strength sweep of
+# `range_equity` rather than by evaluating each combo (on the flop, evaluating
+# each combo is faster for any range):
+SWEEP_MIN_COMBOS = {4: 512, 5: 16}
+
+# Game -> (number of hole cards, function of arrays of hole and board cards -> strengths):
+GAMES = {
+    "holdem": (2, holdem_strengths),
+    "omaha": (4, evaluate_omaha_batch),
+    "omaha5": (5, evaluate_omaha_batch),
+}
+
+
+class Equity:
+    """Result of an equity calculation for the hero's hand."""
+
+    def __init__(self, win: float, tie: float, loss: float, share: float, n: int, se: float = 0.0):
+        """
+        Args:
+            win (float): probability that the hero wins the whole pot.
+            tie (float): probability that the hero splits the pot.
+            loss (float): probability that the hero wins nothing.
+            share (float): expected share of the pot (i.e. the equity).
+            n (int): number of showdowns (runouts x villain hands) evaluated.
+            se (float): standard error of `share` (0 for exact results).
+        """
+        self.win = win
+        self.tie = tie
+        self.loss = loss
+        self.share = share
+        self.n = n
+        self.se = se
+
+    @property
+    def equity(self):
+        return self.share
+
+    def __repr__(self):
+        return f"Equity(win={self.win:.4f}, tie={self.tie:.4f}, loss={self.loss:.4f}, equity={self.share:.4f})"
+
+
+def parse_villain(villain, hole_cards: int = 2):
+    """Parse a villain into a list of (card codes, weight) tuples. A villain can
+    be a single hand of `hole_cards` cards, a `ranges.Range` (of Hold 'Em
+    hands), or a range as a sequence of hands."""
+    if hasattr(villain, "combos"):  # A `ranges.Range`.
+        return villain.combos()
+    if len(villain) == hole_cards:
+        try:
+            return [(tuple(card_codes(villain)), 1.0)]
+        except (TypeError, ValueError, AssertionError):
+            pass
+    return [(tuple(card_codes(hand)), 1.0) for hand in villain]
+
+
+def _live(combos, dead_mask: int):
+    """Filter (codes, weight) combos to those that don't use a dead card."""
+    return [(codes, w) for codes, w in combos if not any((1 << c) & dead_mask for c in codes)]
+
+
+def _assignments(villains, dead_mask: int):
+    """Yield (villain hands, weight) for every combination of live villain hands
+    that don't share any cards."""
+    if not villains:
+        yield tuple(), 1.0
+        return
+    for codes, w in _live(villains[0], dead_mask):
+        mask = dead_mask
+        for c in codes:
+            mask |= 1 << c
+        for rest, rest_w in _assignments(villains[1:], mask):
+            yield (codes, ) + rest, w * rest_w
+
+
+def showdown(hero: np.ndarray, villains):
+    """Compare an (N, ) array of the hero's strengths against a list of (N, )
+    arrays of villain strengths, and return (win, tie, share) arrays."""
+    villains = np.asarray(villains)
+    hero_best = hero >= villains.max(axis=0)
+    n_best = (villains == hero).sum(axis=0) + 1
+    win = hero_best & (n_best == 1)
+    tie = hero_best & (n_best > 1)
+    share = np.where(hero_best, 1.0 / n_best, 0.0)
+    return win, tie, share
+
+
+def exact_equity(hole, board=(), villains=(), cache=None, game: str = "holdem"):
+    """Calculate the hero's exact equity by enumerating every runout of the
+    board against every combination of villain hands.
+
+    Args:
+        hole (sequence): the hero's hole cards (see `card.card_code`), 2 in
+            Hold 'Em.
+        board (sequence): 0, 3, 4 or 5 board cards.
+        villains (sequence): one entry per opponent, each either a hand, a
+            `ranges.Range`, or a range given as a sequence of hands (see
+            `parse_villain`). Combos are weighted by their weight in a
+            `Range`. Villain hands that
+            use a card held by the hero, the board or another villain are
+            excluded (card removal).
+        cache: optional cache (see `cache`), keyed on the canonical situation.
+        game (str): one of `GAMES`, e.g. "omaha" for 4 hole cards of which
+            exactly 2 must be played (see `omaha`).
+
+    Heads-up Hold 'Em against a range on the river or a wide range on the
+    turn is computed as a matrix problem, by the sorted strength sweep of
+    `range_equity` (see `SWEEP_MIN_COMBOS`).
+    """
+    assert game in GAMES, f"Invalid game, must be one of {tuple(GAMES)}: {game}"
+    hole_cards, strengths = GAMES[game]
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(hole) == hole_cards, f"Invalid number of hole cards, must be exactly {hole_cards}."
+    assert len(board) in (0, 3, 4, 5), f"Invalid number of board cards: {len(board)}"
+    assert villains, "At least one villain is required."
+    assert len(set(hole + board)) == len(hole + board), "Duplicate playing cards in hand."
+    villains = [parse_villain(v, hole_cards) for v in villains]
+    assert all(len(codes) == hole_cards for v in villains for codes, _ in v), \
+        f"Invalid number of villain hole cards, must be exactly {hole_cards}."
+    if game == "holdem" and len(villains) == 1 and len(villains[0]) >= SWEEP_MIN_COMBOS.get(len(board), float("inf")):
+        from .range_equity import _range_equity  # Imports this module.
+
+        def compute():
+            dead = set(hole + board)
+            villain = combo_weights([(codes, w) for codes, w in villains[0] if not dead.intersection(codes)])
+            assert villain.any(), "No combination of villain hands is possible with the cards dealt."
+            return _range_equity(combo_weights([(hole, 1.0)]), villain, board)
+    else:
+        def compute():
+            return _exact_equity(hole, board, villains, strengths)
+    if cache is None:
+        return compute()
+    key = equity_key("exact", hole, board, villains)  # The number of hole cards identifies the game.
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result)
+    return result
+
+
+def _exact_equity(hole, board, villains, strengths=holdem_strengths):
+    """Exact equity of hole and board card codes against parsed villains,
+    given the function evaluating hands (see `GAMES`)."""
+    dead_mask = 0
+    for c in hole + board:
+        dead_mask |= 1 << c
+    deck = np.array([c for c in range(52) if not (1 << c) & dead_mask], dtype=np.uint8)
+    runouts = deck[combinations_array(len(deck), 5 - len(board))]
+    runout_masks = np.bitwise_or.reduce(np.left_shift(1, runouts.astype(np.int64)), axis=1)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.uint8), (len(runouts), len(board))), runouts])
+    hero = strengths(np.broadcast_to(np.array(hole, dtype=np.uint8), (len(boards), len(hole))), boards)
+
+    win = tie = share = total = 0.0
+    n = 0
+    for hands, weight in _assignments(villains, dead_mask):
+        villain_mask = 0
+        for codes in hands:
+            for c in codes:
+                villain_mask |= 1 << c
+        live = (runout_masks & villain_mask) == 0
+        live_boards = boards[live]
+        villain_strengths = [
+            strengths(np.broadcast_to(np.array(codes, dtype=np.uint8), (len(live_boards), len(codes))), live_boards)
+            for codes in hands
+        ]
+        w, t, s = showdown(hero[live], villain_strengths)
+        win += weight * w.mean()
+        tie += weight * t.mean()
+        share += weight * s.mean()
+        total += weight
+        n += len(live_boards) * len(hands)
+    assert total > 0, "No combination of villain hands is possible with the cards dealt."
+    win, tie, share = win / total, tie / total, share / total
+    return Equity(win=win, tie=tie, loss=1.0 - win - tie, share=share, n=n)
@@ -0,0 +1,259 @@
+"""Lookup-table poker hand evaluator.
+
+Maps any 5, 6 or 7 cards (as integer card codes, see `card.Card.code`) to a
+single integer strength in the range 1 <= 7462, where higher is better: 1 is
+7-5-4-3-2 high card and 7462 is a royal flush. Every distinct 5-card poker
+hand has exactly one strength, so hands can be compared directly, and the
+category and kickers can be recovered from the strength alone.
+
+Lookups use two tables:
+    - flushes are looked up by the 13-bit rank mask of the flush suit;
+    - everything else is looked up by the product of the rank primes (see
+      `card.PRIMES`), which is unique for every multiset of ranks.
+The tables take tens of milliseconds to build, so are built on the first
+evaluation (or by `build_tables`) rather than on import.
+"""
+from bisect import bisect_right
+from itertools import combinations, combinations_with_replacement
+
+from .card import CARDS, PRIMES
+
+
+# Hand categories, from weakest to strongest:
+CATEGORIES = ("HC", "P", "2P", "3", "S", "F", "FH", "4", "SF", "RF")
+MAX_STRENGTH = 7462
+
+# Rank masks of the 10 straights, from the wheel (A-2-3-4-5) to broadway:
+STRAIGHTS = (0b1000000001111, ) + tuple(0b11111 << i for i in range(9))
+
+# Precomputed per-card fields, indexed by card code:
+_PRIME = tuple(c.prime for c in CARDS)
+_BIT = tuple(c.bit for c in CARDS)
+_SUIT = tuple(c.suit_index for c in CARDS)
+
+
+def _popcount(mask: int):
+    return bin(mask).count("1")
+
+
+def _high_ranks(mask: int):
+    """Rank indexes set in `mask`, from highest to lowest."""
+    return tuple(r for r in range(12, -1, -1) if mask & (1 << r))
+
+
+def straight_high(mask: int):
+    """Index (0 = wheel, 9 = broadway) of the highest straight in `mask`, or
+    -1 if the mask doesn't contain a straight."""
+    for i in range(9, -1, -1):
+        if mask & STRAIGHTS[i] == STRAIGHTS[i]:
+            return i
+    return -1
+
+
+def _build_classes():
+    """Enumerate all 7462 hand classes from weakest to strongest as tuples of
+    (category, rank indexes), with the rank indexes ordered by significance."""
+    singles = sorted((m for m in range(1 << 13) if _popcount(m) == 5 and m not in STRAIGHTS))
+    ranks = range(13)
+    classes = list()
+    # High card:
+    classes += [("HC", _high_ranks(m)) for m in singles]
+    # Pair:
+    for p in ranks:
+        kickers = sorted(sum(1 << r for r in c) for c in combinations([r for r in ranks if r != p], 3))
+        classes += [("P", (p, p) + _high_ranks(k)) for k in kickers]
+    # Two pairs:
+    for high, low in sorted(((h, l) for h in ranks for l in ranks if l < h)):
+        classes += [("2P", (high, high, low, low, k)) for k in ranks if k not in (high, low)]
+    # Three of a kind:
+    for t in ranks:
+        kickers = sorted(sum(1 << r for r in c) for c in combinations([r for r in ranks if r != t], 2))
+        classes += [("3", (t, t, t) + _high_ranks(k)) for k in kickers]
+    # Straight:
+    classes += [("S", _high_ranks(m) if i else (3, 2, 1, 0, 12)) for i, m in enumerate(STRAIGHTS)]
+    # Flush:
+    classes += [("F", _high_ranks(m)) for m in singles]
+    # Full house:
+    classes += [("FH", (t, t, t, p, p)) for t in ranks for p in ranks if p != t]
+    # Four of a kind:
+    classes += [("4", (q, q, q, q, k)) for q in ranks for k in ranks if k != q]
+    # Straight flush and royal flush:
+    classes += [("SF", _high_ranks(m) if i else (3, 2, 1, 0, 12)) for i, m in enumerate(STRAIGHTS[:-1])]
+    classes.append(("RF", _high_ranks(STRAIGHTS[-1])))
+    assert len(classes) == MAX_STRENGTH
+    return classes
+
+
+# First strength of each category, for `category` (checked by `build_tables`):
+CATEGORY_FLOORS = [1, 1278, 4138, 4996, 5854, 5864, 7141, 7297, 7453, 7462]
+
+# The tables, filled in place by `build_tables`:
+_CLASSES = list()  # (category, rank indexes) of each class, indexed by strength.
+# Non-flush 5-card hands keyed by the product of their rank primes, and the
+# best flush for every 13-bit rank mask of a single suit (0 if no flush):
+_UNSUITED5 = dict()
+FLUSH_TABLE = list()
+
+
+def build_tables():
+    """Build the lookup tables, unless they've already been built."""
+    if _CLASSES:
+        return
+    classes = [None] + _build_classes()
+    floors = [s for s in range(1, len(classes)) if s == 1 or classes[s - 1][0] != classes[s][0]]
+    assert floors == CATEGORY_FLOORS, f"Invalid category floors: {floors}"
+    unsuited, flush_table = dict(), [0] * (1 << 13)
+    for strength, (cat, ranks) in enumerate(classes[1:], 1):
+        if cat in ("F", "SF", "RF"):
+            flush_table[sum(1 << r for r in ranks)] = strength
+        else:
+            unsuited[_product(ranks)] = strength
+    for mask in range(1 << 13):
+        if _popcount(mask) > 5:
+            i = straight_high(mask)
+            if i >= 0:
+                flush_table[mask] = flush_table[STRAIGHTS[i]]
+            else:
+                # Drop the lowest ranks, leaving the 5 highest:
+                high = mask
+                while _popcount(high) > 5:
+                    high &= high - 1
+                flush_table[mask] = flush_table[high]
+    _UNSUITED5.update(unsuited)
+    FLUSH_TABLE.extend(flush_table)
+    _CLASSES.extend(classes)  # Last, as it marks the tables as built.
+
+
+def _product(ranks):
+    p = 1
+    for r in ranks:
+        p *= PRIMES[r]
+    return p
+
+
+def _unsuited_strength(counts):
+    """Strength of the best non-flush hand from a sequence of 13 rank counts
+    (for any number of cards >= 5)."""
+    by_count = [list(), list(), list(), list(), list()]  # Ranks (high to low) by count.
+    for r in range(12, -1, -1):
+        by_count[counts[r]].append(r)
+    quads, trips, pairs, singles = by_count[4], by_count[3], by_count[2], by_count[1]
+    if quads:
+        q = quads[0]
+        kicker = max(r for r in range(13) if counts[r] and r != q)
+        return _UNSUITED5[PRIMES[q] ** 4 * PRIMES[kicker]]
+    if trips and (len(trips) > 1 or pairs):
+        t = trips[0]
+        p = max(trips[1:] + pairs)
+        return _UNSUITED5[PRIMES[t] ** 3 * PRIMES[p] ** 2]
+    mask = sum(1 << r for r in range(13) if counts[r])
+    i = straight_high(mask)
+    if i >= 0:
+        return _UNSUITED5[_product(_high_ranks(STRAIGHTS[i]))]
+    if trips:
+        t = trips[0]
+        return _UNSUITED5[PRIMES[t] ** 3 * _product(singles[:2])]
+    if len(pairs) >= 2:
+        high, low = pairs[:2]
+        kicker = max(pairs[2:] + singles)
+        return _UNSUITED5[(PRIMES[high] * PRIMES[low]) ** 2 * PRIMES[kicker]]
+    if pairs:
+        return _UNSUITED5[PRIMES[pairs[0]] ** 2 * _product(singles[:3])]
+    return _UNSUITED5[_product(singles[:5])]
+
+
+_UNSUITED = {5: _UNSUITED5}
+
+
+def unsuited_table(n: int):
+    """Dict mapping the product of the rank primes of `n` cards to the
+    strength of the best non-flush hand they make. The 5-card table is built
+    with the other tables; 6- and 7-card tables are built on first use."""
+    build_tables()
+    try:
+        return _UNSUITED[n]
+    except KeyError:
+        pass
+    assert n in (6, 7), f"Invalid number of cards for a lookup table: {n}"
+    table = dict()
+    for ranks in combinations_with_replacement(range(13), n):
+        counts = [0] * 13
+        for r in ranks:
+            counts[r] += 1
+        if max(counts) <= 4:
+            table[_product(ranks)] = _unsuited_strength(counts)
+    _UNSUITED[n] = table
+    return table
+
+
+def evaluate5(a: int, b: int, c: int, d: int, e: int):
+    """Strength of exactly 5 cards, passed as integer card codes."""
+    try:
+        if _SUIT[a] == _SUIT[b] == _SUIT[c] == _SUIT[d] == _SUIT[e]:
+            return FLUSH_TABLE[_BIT[a] | _BIT[b] | _BIT[c] | _BIT[d] | _BIT[e]]
+        return _UNSUITED5[_PRIME[a] * _PRIME[b] * _PRIME[c] * _PRIME[d] * _PRIME[e]]
+    except LookupError:
+        if _CLASSES:
+            raise  # Not a valid hand.
+        build_tables()
+        return evaluate5(a, b, c, d, e)
+
+
+def evaluate(codes):
+    """Strength of the best 5-card hand that can be made from a sequence of 5
+    or more integer card codes."""
+    n = len(codes)
+    if n == 5:
+        return evaluate5(*codes)
+    assert n > 5, f"Invalid number of cards to evaluate, must be at least 5: {n}"
+    if not _CLASSES:
+        build_tables()
+    suit_masks = [0, 0, 0, 0]
+    product = 1
+    for c in codes:
+        suit_masks[_SUIT[c]] |= _BIT[c]
+        product *= _PRIME[c]
+    flush = max(FLUSH_TABLE[m] for m in suit_masks)
+    if n <= 7:
+        # With 7 or fewer cards a flush rules out a full house or quads:
+        return flush or unsuited_table(n)[product]
+    counts = [0] * 13
+    for c in codes:
+        counts[c % 13] += 1
+    return max(flush, _unsuited_strength(counts))
+
+
+def evaluate_cards(cards):
+    """Strength of the best 5-card hand from a sequence of `card.Card`."""
+    return evaluate([c.code for c in cards])
+
+
+def category(strength: int):
+    """Category (one of `CATEGORIES`) of a hand strength."""
+    return CATEGORIES[bisect_right(CATEGORY_FLOORS, strength) - 1]
+
+
+def category_range(cat: str):
+    """Tuple of the (lowest, highest) strengths in a category."""
+    i = CATEGORIES.index(cat)
+    high = CATEGORY_FLOORS[i + 1] - 1 if i + 1 < len(CATEGORIES) else MAX_STRENGTH
+    return CATEGORY_FLOORS[i], high
+
+
+def describe(strength: int):
+    """Tuple of (category, ranks), where ranks are the integer ranks (2 <= 14)
+    of the 5 cards ordered by significance, e.g. (13, 13, 13, 4, 4) for kings
+    full of fours."""
+    assert 1 <= strength <= MAX_STRENGTH, f"Invalid hand strength: {strength}"
+    build_tables()
+    cat, ranks = _CLASSES[strength]
+    return cat, tuple(r + 2 for r in ranks)
+
+
+def kickers(strength: int):
+    """Integer ranks of the kickers (the cards that don't form part of the
+    pair, two pairs, three of a kind or four of a kind, or all but the highest
+    card for high card) of a hand strength, highest first."""
+    cat, ranks = describe(strength)
+    n = {"HC": 1, "P": 2, "2P": 4, "3": 3, "4": 4}.get(cat)
+    return ranks[n:] if n else tuple()
@@ -0,0 +1,108 @@
+"""Vectorized features of every 5-card hand that can be made on the flop.
+
+For a pair of hole cards, `flop_features` computes features of the 19,600
+hands of the hole cards plus each possible flop as dense NumPy arrays, with
+rank and suit histograms built by a single `bincount` each. Rows follow the
+`indexes.load_index("flop")` index over the 50 unseen cards, sorted by rank
+and then suit.
+"""
+import numpy as np
+
+from .batch_evaluator import RANKS as CARD_RANKS, SUITS as CARD_SUITS, categories, evaluate_batch
+from .card import card_codes
+from . import evaluator
+from .indexes import load_index
+from .variables import RANKS, SUITS
+
+# Index of the highest straight (0 = wheel, 9 = broadway) in each 13-bit rank mask, or -1:
+STRAIGHT_HIGH = np.array([evaluator.straight_high(m) for m in range(1 << 13)], dtype=np.int8)
+_RANK_BITS = (1 << np.arange(13)).astype(np.int16)
+
+
+def unseen_cards(card1, card2):
+    """Array of the codes of the 50 cards not in the hole, sorted by rank and
+    then suit."""
+    hole = set(card_codes([card1, card2]))
+    assert len(hole) == 2, "Duplicate playing cards in hand."
+    return np.array(sorted((c for c in range(52) if c not in hole), key=lambda c: (c % 13, c // 13)), dtype=np.uint8)
+
+
+def histograms(codes: np.ndarray):
+    """Return (rank counts, suit counts) uint8 arrays of shapes (N, 13) and
+    (N, 4) for an (N, k) array of card codes."""
+    n = len(codes)
+    offsets = np.arange(n)[:, None]
+    rank_counts = np.bincount((offsets * 13 + CARD_RANKS[codes]).ravel(), minlength=n * 13).reshape(n, 13)
+    suit_counts = np.bincount((offsets * 4 + CARD_SUITS[codes]).ravel(), minlength=n * 4).reshape(n, 4)
+    return rank_counts.astype(np.uint8), suit_counts.astype(np.uint8)
+
+
+def hand_features(codes: np.ndarray):
+    """Dict of feature arrays for an (N, k) array of card codes (k >= 5):
+
+        cards:        (N, k) uint8 card codes.
+        rank_counts:  (N, 13) uint8 number of cards of each rank (2 -> Ace).
+        suit_counts:  (N, 4) uint8 number of cards of each suit (C, D, H, S).
+        suit_max:     (N, ) uint8 number of cards of the most common suit.
+        flush:        (N, ) bool, at least 5 cards of one suit.
+        straight:     (N, ) bool, at least 5 consecutive ranks (inc. wheel).
+        highest_rank: (N, ) uint8 highest rank index (0 = 2, 12 = Ace).
+        lowest_rank:  (N, ) uint8 lowest rank index.
+        pair_count:   (N, ) uint8 number of ranks with exactly 2 cards.
+        three_count:  (N, ) uint8 number of ranks with exactly 3 cards.
+        four_count:   (N, ) uint8 number of ranks with 4 cards.
+        full_house:   (N, ) bool, exactly 1 pair and 1 three of a kind.
+        strength:     (N, ) int16 hand strength (see `evaluator`).
+        category:     (N, ) int8 index into `evaluator.CATEGORIES`.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    rank_counts, suit_counts = histograms(codes)
+    present = rank_counts > 0
+    rank_masks = present.astype(np.int16) @ _RANK_BITS
+    suit_max = suit_counts.max(axis=1)
+    pair_count = (rank_counts == 2).sum(axis=1, dtype=np.uint8)
+    three_count = (rank_counts == 3).sum(axis=1, dtype=np.uint8)
+    strength = evaluate_batch(codes) if codes.shape[1] <= 7 else None
+    return dict(
+        cards=codes,
+        rank_counts=rank_counts,
+        suit_counts=suit_counts,
+        suit_max=suit_max,
+        flush=suit_max >= 5,
+        straight=STRAIGHT_HIGH[rank_masks] >= 0,
+        highest_rank=(12 - np.argmax(present[:, ::-1], axis=1)).astype(np.uint8),
+        lowest_rank=np.argmax(present, axis=1).astype(np.uint8),
+        pair_count=pair_count,
+        three_count=three_count,
+        four_count=(rank_counts == 4).sum(axis=1, dtype=np.uint8),
+        full_house=(pair_count == 1) & (three_count == 1),
+        strength=strength,
+        category=None if strength is None else categories(strength),
+    )
+
+
+def flop_features(card1, card2, as_frame: bool = False):
+    """Features (see `hand_features`) of the hole cards plus every possible
+    flop. If `as_frame`, returns a DataFrame with one column per feature, the
+    rank counts in columns named by rank and the suit counts in columns named
+    by suit."""
+    unseen = unseen_cards(card1, card2)
+    flops = unseen[load_index("flop")]
+    hole = np.broadcast_to(np.array(card_codes([card1, card2]), dtype=np.uint8), (len(flops), 2))
+    features = hand_features(np.hstack([flops, hole]))
+    return features_frame(features) if as_frame else features
+
+
+def features_frame(features: dict):
+    """DataFrame of a dict of features from `hand_features`."""
+    import pandas as pd
+
+    columns = dict()
+    for i, rank in enumerate(RANKS):
+        columns[rank] = features["rank_counts"][:, i]
+    for i, suit in enumerate(SUITS):
+        columns[suit] = features["suit_counts"][:, i]
+    for k, v in features.items():
+        if v is not None and v.ndim == 1:
+            columns[k] = v
+    return pd.DataFrame(columns, copy=False)
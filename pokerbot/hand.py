@@ -1,14 +1,13 @@
 
 from collections import Counter
 
-from card import Card
-from variables import RANKS, ROYAL_RANKS, SUITS
+from .card import CARDS, Card, card_code
+from .evaluator import FLUSH_TABLE, category, evaluate, evaluate5, unsuited_table
+from .variables import RANKS, SUITS
 
 
-ROYAL_FLUSHES = list()
-for suit in SUITS:
-    royal_flush = set([Card(f"{rank}{suit}") for rank in ROYAL_RANKS])
-    ROYAL_FLUSHES.append(royal_flush)
+# Royal flush of each suit, from the card table by code (10 -> Ace are rank indexes 8 -> 12):
+ROYAL_FLUSHES = [set(CARDS[suit * 13 + rank] for rank in range(8, 13)) for suit in range(len(SUITS))]
 
 
 class Hand:
@@ -64,6 +63,17 @@ class Hand:
         self.int_rank_count = {i: int_rank_count.get(i, 0) for i in list(range(2, 15, 1))}
         suit_count = Counter(self.suits)
         self.suit_count = {s: suit_count.get(s, 0) for s in SUITS}
+        self.__strength = None
+
+    @property
+    def strength(self):
+        """Integer strength (1 <= 7462, higher is better) of the best 5-card
+        hand that can be made from the cards, for hands of at least 5 cards.
+        Computed directly from rank/suit tables, without enumerating subsets
+        of 5 cards. See `evaluator`."""
+        if self.__strength is None:
+            self.__strength = evaluate([c.code for c in self.cards])
+        return self.__strength
 
     @property
     def royal_flush(self):
@@ -185,6 +195,7 @@ class TexasHoldem5Hand:
         self.__suits = suits
         self.__suit_count = Counter(self.suits)
         self.__rank_count = Counter(self.ranks)
+        self.__strength = None
 
     @property
     def cards(self):
@@ -206,6 +217,14 @@ class TexasHoldem5Hand:
     def rank_count(self):
         return self.__rank_count
 
+    @property
+    def strength(self):
+        """Integer strength of the hand (1 <= 7462, higher is better), which
+        orders any 2 hands including kickers. See `evaluator`."""
+        if self.__strength is None:
+            self.__strength = evaluate5(*[c.code for c in self.cards])
+        return self.__strength
+
     @property
     def straight_high_card(self):
         """If the cards are a straight returns the rank of the highest card,
@@ -307,3 +326,103 @@ class TexasHoldem5Hand:
         else:
             kickers = tuple()
         return tuple(kickers)
+
+
+class HandState:
+    """A hand that cards can be added to and removed from in O(1), e.g. street
+    by street or while enumerating runouts, without rebuilding a `Hand`.
+
+    The state is a bitmask of the cards, the rank bitmask of each suit, the
+    rank and suit counts, and the product of the rank primes (see
+    `evaluator`), from which the strength is looked up directly.
+    """
+
+    __slots__ = ("mask", "suit_masks", "rank_counts", "suit_counts", "product", "n", "_strength")
+
+    def __init__(self, *cards):
+        """A hand of any number of unique cards (see `card.card_code`)."""
+        self.mask = 0
+        self.suit_masks = [0, 0, 0, 0]
+        self.rank_counts = [0] * 13
+        self.suit_counts = [0, 0, 0, 0]
+        self.product = 1
+        self.n = 0
+        self._strength = None
+        for c in cards:
+            self.add(c)
+
+    def add(self, card):
+        """Add a card to the hand."""
+        c = CARDS[card_code(card)]
+        assert not self.mask & c.mask, "Duplicate playing cards in hand."
+        self.mask |= c.mask
+        self.suit_masks[c.suit_index] |= c.bit
+        self.rank_counts[c.rank_index] += 1
+        self.suit_counts[c.suit_index] += 1
+        self.product *= c.prime
+        self.n += 1
+        self._strength = None
+        return self
+
+    def remove(self, card):
+        """Remove a card from the hand."""
+        c = CARDS[card_code(card)]
+        assert self.mask & c.mask, f"Card not in hand: {c!r}"
+        self.mask ^= c.mask
+        self.suit_masks[c.suit_index] ^= c.bit
+        self.rank_counts[c.rank_index] -= 1
+        self.suit_counts[c.suit_index] -= 1
+        self.product //= c.prime
+        self.n -= 1
+        self._strength = None
+        return self
+
+    def copy(self):
+        """Independent copy of the hand, e.g. to branch on the next card."""
+        other = HandState.__new__(HandState)
+        other.mask, other.product, other.n, other._strength = self.mask, self.product, self.n, self._strength
+        other.suit_masks = self.suit_masks.copy()
+        other.rank_counts = self.rank_counts.copy()
+        other.suit_counts = self.suit_counts.copy()
+        return other
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, card):
+        return bool(self.mask & CARDS[card_code(card)].mask)
+
+    @property
+    def cards(self):
+        """List of the cards in the hand, in code order."""
+        return [c for c in CARDS if self.mask & c.mask]
+
+    @property
+    def strength(self):
+        """Integer strength (1 <= 7462, higher is better) of the best 5-card
+        hand that can be made from the cards, for hands of at least 5 cards.
+        See `evaluator`."""
+        if self._strength is None:
+            assert self.n >= 5, f"Invalid number of cards to evaluate, must be at least 5: {self.n}"
+            if self.n > 7:
+                self._strength = evaluate([c.code for c in self.cards])
+            else:
+                # With 7 or fewer cards a flush rules out a full house or quads:
+                unsuited = unsuited_table(self.n)  # Builds the flush table on first use.
+                self._strength = max(FLUSH_TABLE[m] for m in self.suit_masks) or unsuited[self.product]
+        return self._strength
+
+    @property
+    def category(self):
+        """Category of the hand (one of `evaluator.CATEGORIES`): of its
+        strength, or for fewer than 5 cards, of its pairs, trips or quads."""
+        if self.n >= 5:
+            return category(self.strength)
+        most = max(self.rank_counts)
+        if most >= 3:
+            return str(most)
+        pairs = self.rank_counts.count(2)
+        return "2P" if pairs == 2 else "P" if pairs else "HC"
+
+    def __repr__(self):
+        return f"HandState({', '.join(repr(c) for c in self.cards)})"
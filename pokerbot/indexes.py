@@ -0,0 +1,135 @@
+"""Indexes of the combinations of unseen cards that can be dealt at each street,
+and other precomputed tables.
+
+Each index is a (`unseen` choose `dealt`, `dealt`) uint8 array, where each row
+holds the positions (in a sorted list of the unseen cards) of the cards dealt
+in one possible runout. Tables hold other precomputed arrays, e.g. preflop
+equities (see `preflop`) or the buckets of the card abstraction (see
+`abstraction`).
+
+Indexes and tables are saved as `.npy` files and memory-mapped read-only once
+per process. Indexes are cheap, so a missing index is built on first use
+while holding a lock on the file, so that concurrent processes build it once
+and the others wait for it (or in memory, if the directory isn't writable).
+Preflop and bucket tables take hours to build, so must be built ahead of time
+by `python -m pokerbot.build_package`: looking up a missing table raises
+`FileNotFoundError` rather than blocking the caller, unless it explicitly
+opts in to building it with `load_table(name, build=True)`.
+"""
+from contextlib import contextmanager
+import importlib
+import os
+
+import numpy as np
+
+from .utils import combinations_array
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where builds aren't locked.
+    fcntl = None
+
+DIR, FILENAME = os.path.split(__file__)
+
+# Index name -> (number of unseen cards, number of cards dealt):
+INDEXES = {"flop": (50, 3), "turn": (47, 1), "river": (46, 1)}
+
+# Table name -> (module, function, default arguments) which builds it:
+TABLES = {
+    "preflop_classes": ("preflop", "build_class_table", dict()),
+    "preflop_matchups": ("preflop", "build_matchup_table", dict()),
+    "buckets_flop": ("abstraction", "build_buckets", dict(street="flop")),
+    "buckets_turn": ("abstraction", "build_buckets", dict(street="turn")),
+}
+
+_LOADED = dict()
+
+
+def index_path(name: str):
+    """File path of the `.npy` file of a named index."""
+    return os.path.join(DIR, "indexes", f"{name}_index.npy")
+
+
+def build_index(name: str):
+    """Create the array of a named index."""
+    unseen, dealt = INDEXES[name]
+    return combinations_array(unseen, dealt, dtype=np.uint8)
+
+
+def table_path(name: str):
+    """File path of the `.npy` file of a named table."""
+    return os.path.join(DIR, "indexes", f"{name}.npy")
+
+
+def build_table(name: str, **kwargs):
+    """Create the array of a named table, passing any arguments to its
+    builder (see `TABLES`)."""
+    module, function, defaults = TABLES[name]
+    return getattr(importlib.import_module(f".{module}", __package__), function)(**{**defaults, **kwargs})
+
+
+@contextmanager
+def file_lock(fp: str):
+    """Hold an exclusive lock on a file path (via a `.lock` file next to it)."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{fp}.lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def save_array(fp: str, build):
+    """Build an array with the `build` callable and save it at a `.npy` file
+    path, unless another process already has. The file is written under a lock
+    and moved into place atomically, so it's never read half-written."""
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    with file_lock(fp):
+        if os.path.exists(fp):
+            return
+        tmp = f"{fp}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, build())
+        os.replace(tmp, fp)
+
+
+def _load(key, fp: str, build):
+    """Memory-map an array, building and saving it first if it's missing, or
+    raising FileNotFoundError if `build` is None."""
+    try:
+        return _LOADED[key]
+    except KeyError:
+        pass
+    if build is None:
+        array = np.load(fp, mmap_mode="r")
+        _LOADED[key] = array
+        return array
+    try:
+        if not os.path.exists(fp):
+            save_array(fp, build)
+        array = np.load(fp, mmap_mode="r")
+    except OSError:  # E.g. a read-only install.
+        array = build()
+        array.flags.writeable = False
+    _LOADED[key] = array
+    return array
+
+
+def load_index(name: str):
+    """Return the array of a named index. Arrays are cached, so each file is
+    memory-mapped at most once per process."""
+    return _load(name, index_path(name), lambda: build_index(name))
+
+
+def load_table(name: str, build: bool = False):
+    """Return the memory-mapped array of a named table, loaded at most once
+    per process. A missing table raises FileNotFoundError, unless `build` is
+    True to build it now (which can take hours, see `build_package`)."""
+    fp = table_path(name)
+    if not build and ("table", name) not in _LOADED and not os.path.exists(fp):
+        raise FileNotFoundError(f"The {name} table hasn't been built, run `python -m pokerbot.build_package` "
+                                f"(or pass build=True to build it now): {fp}")
+    return _load(("table", name), fp, (lambda: build_table(name)) if build else None)
@@ -0,0 +1,82 @@
+"""Suit isomorphism: situations that only differ by a permutation of the suits
+have identical equities, so can be collapsed onto one canonical representative.
+
+A situation is a tuple of groups of cards, e.g. (hole cards, board) or (hero
+hand, villain hand). The order of cards within a group doesn't matter but the
+order of the groups does. The canonical form of a situation is the smallest
+(comparing the sorted card codes of each group in turn) of its images under
+the 24 permutations of the suits, and its multiplicity is the number of
+distinct situations that share that canonical form.
+"""
+from itertools import permutations
+
+import numpy as np
+
+from .card import card_codes
+from .utils import combination_index, combinations_array
+
+# The 24 suit permutations, as tables mapping each card code to its image:
+SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+PERMUTED_CODES = np.array([[p[c // 13] * 13 + c % 13 for c in range(52)] for p in SUIT_PERMUTATIONS], dtype=np.uint8)
+PERMUTED_CODE_TUPLES = tuple(tuple(row) for row in PERMUTED_CODES.tolist())
+
+# The same permutations as (24, 1326) tables mapping the index of each 2-card
+# combo (a row of `combinations_array(52, 2)`) to the index of its image:
+_PERMUTED_PAIRS = np.sort(PERMUTED_CODES[:, combinations_array(52, 2)].astype(np.intp), axis=2)
+PERMUTED_COMBOS = combination_index(_PERMUTED_PAIRS[:, :, 0], _PERMUTED_PAIRS[:, :, 1])
+
+
+def canonical_form(*groups):
+    """Return a tuple of (canonical groups, multiplicity) of a situation given
+    as groups of integer card codes. The canonical groups are tuples of sorted
+    card codes."""
+    best, images = None, set()
+    for perm in PERMUTED_CODE_TUPLES:
+        image = tuple(tuple(sorted([perm[c] for c in g])) for g in groups)
+        images.add(image)
+        if best is None or image < best:
+            best = image
+    return best, len(images)
+
+
+def canonicalize(hole, board=()):
+    """Return a tuple of (canonical hole card codes, canonical board card codes,
+    multiplicity) of a hand and board (see `card.card_code`)."""
+    (hole, board), multiplicity = canonical_form(card_codes(hole), card_codes(board))
+    return hole, board, multiplicity
+
+
+def canonical_keys(*groups):
+    """Vectorized canonical form of N situations, given as one (N, k) array of
+    card codes per group. Returns a tuple of (keys, permutations): an (N, )
+    int64 array of keys which are equal for isomorphic situations (and are
+    ordered like `canonical_form`), and the index into `SUIT_PERMUTATIONS` of
+    the permutation mapping each situation onto its canonical form."""
+    groups = [np.asarray(g, dtype=np.intp) for g in groups]
+    n = len(groups[0])
+    keys = np.zeros((len(SUIT_PERMUTATIONS), n), dtype=np.int64)
+    for g in groups:
+        images = np.sort(PERMUTED_CODES[:, g], axis=2)  # (24, N, k)
+        for i in range(g.shape[1]):
+            keys = keys * 52 + images[:, :, i]
+    best = np.argmin(keys, axis=0)
+    return keys[best, np.arange(n)], best
+
+
+def permute(codes, permutation: int):
+    """Apply a suit permutation (an index into `SUIT_PERMUTATIONS`) to an array
+    of card codes."""
+    return PERMUTED_CODES[permutation][np.asarray(codes, dtype=np.intp)]
+
+
+def canonical_boards(n: int = 3):
+    """Return a tuple of (boards, multiplicities): an (M, n) uint8 array of the
+    canonical boards of `n` cards (e.g. 1,755 of the 22,100 flops), and the
+    number of boards each represents."""
+    boards = combinations_array(52, n)
+    keys, _ = canonical_keys(boards)
+    _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    canonical = np.sort(boards[first], axis=1)
+    # Each representative is the first board (in lexicographic order) of its
+    # class, which is its canonical form:
+    return canonical.astype(np.uint8), counts
@@ -0,0 +1,169 @@
+"""Monte Carlo Texas Hold 'Em (or Omaha) equity, for spots too large to
+enumerate exactly.
+
+Runouts are sampled in batches with vectorized NumPy sampling. Each batch has
+its own random stream derived from the seed and the batch number, and batches
+are always combined in order, so a result depends only on the seed (and the
+batch size), not on how many worker processes computed it.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import math
+
+import numpy as np
+
+from .cache import equity_key
+from .card import card_codes
+from .equity import GAMES, Equity, parse_villain, showdown
+
+
+def _batch_rng(entropy: int, batch: int):
+    return np.random.default_rng(np.random.SeedSequence(entropy=entropy, spawn_key=(batch, )))
+
+
+def sample_showdowns(hole, board, villains, size: int, rng: np.random.Generator, game: str = "holdem"):
+    """Sample `size` runouts and return (win, tie, share) arrays for the hero.
+
+    Args:
+        hole (list): the hero's hole card codes.
+        board (list): 0, 3, 4 or 5 board card codes.
+        villains (list): one entry per opponent, either None for a random
+            hand, or a list of (card codes, weight) combos (see
+            `equity.parse_villain`).
+        size (int): number of runouts to sample. Samples where villain ranges
+            collide are rejected, so fewer may be returned.
+        rng (np.random.Generator): random number generator.
+        game (str): one of `equity.GAMES`.
+    """
+    hole_cards, strengths = GAMES[game]
+    dead = np.zeros((size, 52), dtype=bool)
+    dead[:, hole + board] = True
+    hands = [None] * len(villains)
+    for i, combos in enumerate(villains):
+        if combos is None:
+            continue
+        codes = np.array([c for c, _ in combos], dtype=np.intp)
+        weights = np.array([w for _, w in combos], dtype=float)
+        hands[i] = codes[rng.choice(len(codes), size=size, p=weights / weights.sum())]
+    # Reject samples where villain hands share a card with each other:
+    ok = np.ones(size, dtype=bool)
+    rows = np.arange(size)[:, None]
+    for h in hands:
+        if h is not None:
+            ok &= ~dead[rows, h].any(axis=1)
+            dead[rows, h] = True
+    dead, hands = dead[ok], [h if h is None else h[ok] for h in hands]
+
+    # Deal the rest of the board and random villain hands from the live cards:
+    to_board = 5 - len(board)
+    n_random = sum(h is None for h in hands)
+    keys = rng.random(dead.shape)
+    keys[dead] = 2.0
+    dealt = np.argsort(keys, axis=1)[:, :to_board + hole_cards * n_random]
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.intp), (len(dealt), len(board))), dealt[:, :to_board]])
+    j = to_board
+    for i, h in enumerate(hands):
+        if h is None:
+            hands[i] = dealt[:, j:j + hole_cards]
+            j += hole_cards
+    hero = strengths(np.broadcast_to(np.array(hole, dtype=np.intp), (len(boards), len(hole))), boards)
+    return showdown(hero, [strengths(h, boards) for h in hands])
+
+
+def _run_batch(args):
+    """Sample one batch and return sums of (n, wins, ties, share, share^2)."""
+    hole, board, villains, size, entropy, batch, game = args
+    win, tie, share = sample_showdowns(hole, board, villains, size, _batch_rng(entropy, batch), game)
+    return len(share), win.sum(), tie.sum(), share.sum(), np.square(share).sum()
+
+
+def monte_carlo_equity(hole, board=(), villains=1, samples: int = 100000, batch_size: int = 10000,
+                       target_se: float = None, seed: int = None, workers: int = 1, cache=None,
+                       game: str = "holdem"):
+    """Estimate the hero's equity by sampling runouts and villain hands.
+
+    Args:
+        hole (sequence): the hero's hole cards (see `card.card_code`), 2 in
+            Hold 'Em.
+        board (sequence): 0, 3, 4 or 5 board cards.
+        villains (int or sequence): the number of opponents with random hands,
+            or one entry per opponent, each either None for a random hand, a
+            hand, a `ranges.Range`, or a range given as a sequence of hands.
+        samples (int): maximum number of runouts to sample.
+        batch_size (int): number of runouts sampled per batch.
+        target_se (float): if given, stop after the first batch at which the
+            standard error of the equity is at most this value.
+        seed (int): seed for reproducible results.
+        workers (int): number of processes to sample batches in parallel.
+        cache: optional cache (see `cache`), keyed on the canonical situation
+            and the sampling arguments (except `workers`). Isomorphic
+            situations share a cached estimate.
+        game (str): one of `equity.GAMES`, e.g. "omaha" for 4 hole cards of
+            which exactly 2 must be played (see `omaha`).
+    """
+    assert game in GAMES, f"Invalid game, must be one of {tuple(GAMES)}: {game}"
+    hole_cards = GAMES[game][0]
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(hole) == hole_cards, f"Invalid number of hole cards, must be exactly {hole_cards}."
+    assert len(board) in (0, 3, 4, 5), f"Invalid number of board cards: {len(board)}"
+    assert len(set(hole + board)) == len(hole + board), "Duplicate playing cards in hand."
+    if isinstance(villains, int):
+        villains = [None] * villains
+    assert villains, "At least one villain is required."
+    dead = set(hole + board)
+    parsed = list()
+    for v in villains:
+        if v is not None:
+            v = [(codes, w) for codes, w in parse_villain(v, hole_cards) if not dead.intersection(codes)]
+            assert v, "No hand in a villain's range is possible with the cards dealt."
+            assert all(len(codes) == hole_cards for codes, _ in v), \
+                f"Invalid number of villain hole cards, must be exactly {hole_cards}."
+        parsed.append(v)
+    if cache is None or seed is None:  # Unseeded results aren't reproducible, so aren't cached.
+        entropy = seed if seed is not None else np.random.SeedSequence().entropy
+        return _monte_carlo_equity(hole, board, parsed, samples, batch_size, target_se, entropy, workers, game)
+    key = equity_key("monte_carlo", hole, board, parsed, samples=samples, batch_size=batch_size,
+                     target_se=target_se, seed=seed)
+    result = cache.get(key)
+    if result is None:
+        result = _monte_carlo_equity(hole, board, parsed, samples, batch_size, target_se, seed, workers, game)
+        cache.set(key, result)
+    return result
+
+
+def _monte_carlo_equity(hole, board, villains, samples, batch_size, target_se, entropy, workers, game="holdem"):
+    """Monte Carlo equity of hole and board card codes against parsed villains."""
+    n_batches = math.ceil(samples / batch_size)
+    # The last batch only samples the rest of `samples`:
+    args = [(hole, board, villains, min(batch_size, samples - i * batch_size), entropy, i, game)
+            for i in range(n_batches)]
+    totals = np.zeros(5)
+    se = float("inf")
+
+    def update(result):
+        nonlocal se
+        totals[:] += result
+        n, _, _, s, s2 = totals
+        se = math.sqrt(max(s2 / n - (s / n) ** 2, 0.0) / (n - 1)) if n > 1 else float("inf")
+        return target_se is not None and se <= target_se
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            # Keep a window of batches in flight, and consume them in order:
+            window = 2 * workers
+            futures = [executor.submit(_run_batch, a) for a in args[:window]]
+            for i in range(n_batches):
+                result = futures[i].result()
+                if i + window < n_batches:
+                    futures.append(executor.submit(_run_batch, args[i + window]))
+                if update(result):
+                    for f in futures[i + 1:]:
+                        f.cancel()
+                    break
+    else:
+        for a in args:
+            if update(_run_batch(a)):
+                break
+
+    n, wins, ties, share, _ = totals.tolist()
+    assert n > 0, "No combination of villain hands is possible with the cards dealt."
+    return Equity(win=wins / n, tie=ties / n, loss=1.0 - (wins + ties) / n, share=share / n, n=int(n), se=se)
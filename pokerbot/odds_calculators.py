@@ -1,73 +1,76 @@
 """Classes/functions for calculating odds at specific moments of a game."""
 
 import os
-import pandas as pd
 import numpy as np
 
-from deck import Deck
-from card import Card
-from variables import RANKS, SUITS
+from .deck import Deck
+from .card import Card
+from .features import flop_features, unseen_cards
+from .indexes import load_index
+from .variables import RANKS, SUITS
 
 DIR, FILENAME = os.path.split(__file__)
 
 
 class HoldemFlopOdds:
     def __init__(self):
-        fp = os.path.join(DIR, "indexes", "flop_index.csv")
-        self.flop_index = pd.read_csv(fp, encoding="utf-8")
+        import pandas as pd
+
+        # (19600, 3) uint8 array of positions of the flop cards among the 50
+        # unseen cards, shared (memory-mapped) by every instance:
+        self.flop_index = load_index("flop")
         self.odds_df = pd.DataFrame()
 
     def ix_hand(self, ix: int):
         """Inspect a hand by index of the `odds_df` DataFrame."""
         return sorted(self.odds_df.loc[ix, sorted(Deck.cards)].dropna().index)
 
+    def features(self, card1: Card, card2: Card, as_frame: bool = False):
+        """Features of the hole cards plus every possible flop as dense arrays
+        (or a DataFrame if `as_frame`), see `features.flop_features`."""
+        return flop_features(card1, card2, as_frame=as_frame)
+
     def create_hands_df(self, card1: Card, card2: Card):
+        import pandas as pd
+
         assert isinstance(card1, Card)
         assert isinstance(card2, Card)
-        df = self.flop_index.copy()
-        unseen = [c for c in Deck.cards if c not in (card1, card2)]
-        columns = [c for c in sorted(unseen)]
-        df.columns = columns
-        df[card1], df[card2] = 1.0, 1.0
-        card_columns = sorted(df.columns)
+        features = self.features(card1, card2)
+        n = len(features["cards"])
+
+        # Columns of each card, 1.0 if the card is in the hand else NaN:
+        unseen = Card.from_ints(unseen_cards(card1, card2))
+        dealt = np.full((n, len(unseen)), np.nan)
+        dealt[np.arange(n)[:, None], self.flop_index] = 1.0
+        columns = dict(zip(unseen, dealt.T))
+        columns[card1], columns[card2] = np.ones(n), np.ones(n)
 
         # Sense check that all cards are accounted for:
-        assert (len(df.columns) == 52) and (len(set(df.columns)) == 52)
-
-        # Calculate the number of each suit in each hand:
-        for suit in SUITS:
-            suit_cols = [c for c in card_columns if c.suit == suit]
-            df[suit] = df[suit_cols].sum(axis=1)
-        # Calculate if hand contains a flush:
-        df["suit_max"] = df[sorted(SUITS)].max(axis=1)
-        df["flush"] = np.where(df["suit_max"] == 5, True, False)
-
-        # Calculate the number of each rank in each hand, and highest/lowest rank:
-        df["highest_rank"], df["lowest_rank"] = -1, 14
-        for rank in RANKS:
-            rank_cols = [c for c in card_columns if c.rank == rank]
-            df[rank] = df[rank_cols].sum(axis=1).astype(int)
-            df["n_rank"] = np.where(df[rank], RANKS.index(rank), np.nan)  # Rank as an integer.
-            df["highest_rank"] = np.where(df["n_rank"] > df["highest_rank"], df["n_rank"], df["highest_rank"])
-            df["lowest_rank"] = np.where(df["n_rank"] < df["lowest_rank"], df["n_rank"], df["lowest_rank"])
-        rank_map = dict(enumerate(RANKS))
-        df["highest_rank"] = df["highest_rank"].map(rank_map)
-        df["lowest_rank"] = df["lowest_rank"].map(rank_map)
-        df.drop(columns=["n_rank"], inplace=True)
+        assert (len(columns) == 52) and (len(set(columns)) == 52)
+
+        # Number of each suit in each hand, and if hand contains a flush:
+        for i, suit in enumerate(SUITS):
+            columns[suit] = features["suit_counts"][:, i].astype(float)
+        columns["suit_max"] = features["suit_max"].astype(float)
+        columns["flush"] = features["flush"]
+
+        # Number of each rank in each hand, and highest/lowest rank:
+        columns["highest_rank"] = np.array(RANKS, dtype=object)[features["highest_rank"]]
+        columns["lowest_rank"] = np.array(RANKS, dtype=object)[features["lowest_rank"]]
+        for i, rank in enumerate(RANKS):
+            columns[rank] = features["rank_counts"][:, i].astype(int)
 
         # Calculate if hand contains pair/ 3/4 of a kind:
-        for i, label in {2: "pair", 3: "three", 4: "four"}.items():
-            boolean = df[sorted(RANKS)] == i
-            columns = [f"{label}_{r}" for r in sorted(RANKS)]
-            boolean.columns = columns
-            boolean[f"{label}_count"] = boolean.sum(axis=1)
-            df = df.merge(boolean, left_index=True, right_index=True)
+        for count, label in {2: "pair", 3: "three", 4: "four"}.items():
+            for rank in sorted(RANKS):
+                columns[f"{label}_{rank}"] = features["rank_counts"][:, RANKS.index(rank)] == count
+            columns[f"{label}_count"] = features[f"{label}_count"].astype(int)
 
         # Calculate if hand contains full house:
-        df["full_house"] = (df["pair_count"] == 1) & (df["three_count"] == 1)
+        columns["full_house"] = features["full_house"]
 
         # Save DataFrame:
-        self.odds_df = df
+        self.odds_df = pd.DataFrame(columns)
 
 
 def base_out_probability(n: int, to_deal: int, in_hand: int = 2,
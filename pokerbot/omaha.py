@@ -0,0 +1,100 @@
+"""Omaha hand evaluation, where a hand is the best 5-card hand made of exactly
+2 of the hole cards and 3 of the board cards.
+
+`evaluate_omaha_batch` evaluates N hands of 4 hole cards (pot-limit Omaha) or
+5 (5-card PLO) as one batch of 5-card hands for the batch evaluator: every
+hole pair is combined with every board triple, i.e. 6 x 10 = 60 hands per
+player on the river in 4-card PLO and 10 x 10 = 100 in 5-card PLO, and the
+maximum is taken over each player's hands. No per-hand Python objects are
+created, so multiway equities are as vectorized as Hold 'Em ones (see the
+`game` argument of `equity.exact_equity` and
+`monte_carlo.monte_carlo_equity`).
+"""
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .card import CARDS, card_codes
+from .evaluator import category
+from .utils import combinations_array
+
+HOLE_SIZES = (4, 5)  # Number of hole cards of each variant.
+
+
+def evaluate_omaha_batch(holes, boards, chunk_size: int = 1 << 18):
+    """Return an (N, ) int16 array of the Omaha strengths of an (N, 4) or
+    (N, 5) array of hole card codes with an (N, 3), (N, 4) or (N, 5) array of
+    board card codes. Rows are processed in chunks of at most `chunk_size`
+    5-card hands to bound the size of intermediate arrays."""
+    holes, boards = np.asarray(holes), np.asarray(boards)
+    assert holes.ndim == 2 and holes.shape[1] in HOLE_SIZES, f"Invalid shape of hole cards: {holes.shape}"
+    assert boards.ndim == 2 and boards.shape[1] in (3, 4, 5), f"Invalid shape of board cards: {boards.shape}"
+    assert len(holes) == len(boards), "Hole and board cards must have the same number of rows."
+    holes, boards = holes.astype(np.intp, copy=False), boards.astype(np.intp, copy=False)
+    pairs = combinations_array(holes.shape[1], 2, dtype=np.intp)
+    triples = combinations_array(boards.shape[1], 3, dtype=np.intp)
+    per_row = len(pairs) * len(triples)
+    step = max(1, chunk_size // per_row)
+    strengths = np.empty(len(holes), dtype=np.int16)
+    for start in range(0, len(holes), step):
+        hole_pairs = holes[start:start + step][:, pairs]  # (n, P, 2)
+        board_triples = boards[start:start + step][:, triples]  # (n, T, 3)
+        n = len(hole_pairs)
+        hands = np.concatenate([
+            np.broadcast_to(hole_pairs[:, :, None], (n, len(pairs), len(triples), 2)),
+            np.broadcast_to(board_triples[:, None], (n, len(pairs), len(triples), 3)),
+        ], axis=3)
+        strengths[start:start + n] = evaluate_batch(hands.reshape(-1, 5)).reshape(n, per_row).max(axis=1)
+    return strengths
+
+
+def evaluate_omaha(hole, board):
+    """Integer strength (1 <= 7462, higher is better) of an Omaha hand of 4 or
+    5 hole cards on a board of 3, 4 or 5 cards (see `card.card_code`)."""
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(set(hole + board)) == len(hole + board), "Duplicate playing cards in hand."
+    return int(evaluate_omaha_batch([hole], [board])[0])
+
+
+class OmahaHand:
+    """A hand of 4 or 5 hole cards and 3, 4 or 5 board cards in Omaha."""
+
+    def __init__(self, hole, board):
+        """
+        Args:
+            hole (sequence): 4 or 5 hole cards (see `card.card_code`).
+            board (sequence): 3, 4 or 5 board cards.
+        """
+        hole, board = card_codes(hole), card_codes(board)
+        assert len(hole) in HOLE_SIZES, f"Invalid number of hole cards, must be 4 or 5: {len(hole)}"
+        assert len(board) in (3, 4, 5), f"Invalid number of board cards, must be 3, 4 or 5: {len(board)}"
+        assert len(set(hole + board)) == len(hole + board), "Duplicate playing cards in hand."
+        self.hole = [CARDS[c] for c in hole]
+        self.board = [CARDS[c] for c in board]
+        self.__strength = None
+
+    @property
+    def strength(self):
+        """Integer strength of the best hand (1 <= 7462, higher is better).
+        See `evaluator`."""
+        if self.__strength is None:
+            self.__strength = evaluate_omaha([c.code for c in self.hole], [c.code for c in self.board])
+        return self.__strength
+
+    @property
+    def best_hand(self):
+        """Category of the best hand (see `evaluator.CATEGORIES`)."""
+        return category(self.strength)
+
+    @property
+    def best_cards(self):
+        """The 5 cards of the best hand, sorted: 2 hole cards then 3 board
+        cards."""
+        hole, board = [c.code for c in self.hole], [c.code for c in self.board]
+        pairs = np.array(hole)[combinations_array(len(hole), 2, dtype=np.intp)]
+        triples = np.array(board)[combinations_array(len(board), 3, dtype=np.intp)]
+        hands = np.hstack([np.repeat(pairs, len(triples), axis=0), np.tile(triples, (len(pairs), 1))])
+        best = hands[np.argmax(evaluate_batch(hands))]
+        return sorted(CARDS[c] for c in best[:2]) + sorted(CARDS[c] for c in best[2:])
+
+    def __repr__(self):
+        return f"OmahaHand(hole={self.hole}, board={self.board})"
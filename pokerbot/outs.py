@@ -0,0 +1,119 @@
+"""Exact outs and improvement probabilities for hole cards on a flop or turn.
+
+Generalizes `odds_calculators.base_out_probability`: instead of the caller
+counting outs by hand, every possible next card (and on the flop, every pair
+of turn and river cards) is evaluated with the batch evaluator.
+"""
+import numpy as np
+
+from .batch_evaluator import categories, evaluate_batch
+from .card import CARDS, card_codes
+from .evaluator import CATEGORIES, category, evaluate, straight_high
+from .utils import combinations_array
+
+# Names of the hand categories, as used for outs and probabilities:
+NAMES = {
+    "HC": "high_card", "P": "pair", "2P": "two_pair", "3": "trips", "S": "straight", "F": "flush",
+    "FH": "full_house", "4": "quads", "SF": "straight_flush", "RF": "royal_flush",
+}
+
+
+class Outs:
+    """Outs and improvement probabilities of a hand."""
+
+    def __init__(self, category: str, outs: dict, draws: dict, next_card: dict, by_river: dict):
+        """
+        Args:
+            category (str): name of the current category (see `NAMES`), where
+                three of a kind made with a pocket pair is named "set".
+            outs (dict): category name -> list of the cards which make that
+                category on the next card, for each category better than the
+                current one.
+            draws (dict): draw name ("flush_draw", "open_ended", "gutshot") ->
+                number of outs that complete the draw.
+            next_card (dict): category name -> probability that the next card
+                makes at least that category, for each category better than
+                the current one.
+            by_river (dict): as `next_card`, but by the river.
+        """
+        self.category = category
+        self.outs = outs
+        self.draws = draws
+        self.next_card = next_card
+        self.by_river = by_river
+
+    @property
+    def n(self):
+        """Total number of cards which improve the hand's category."""
+        return sum(len(v) for v in self.outs.values())
+
+    def __repr__(self):
+        counts = {k: len(v) for k, v in self.outs.items()}
+        return f"Outs(category={self.category}, outs={counts}, draws={self.draws})"
+
+
+def _improvements(hole, board, runouts: np.ndarray):
+    """Tuple of arrays of the categories of the hand after each row of
+    `runouts`, and whether it beats the board alone after that runout (a board
+    of fewer than 5 cards is beaten by any hand)."""
+    n = len(runouts)
+    board = np.broadcast_to(np.array(board, dtype=np.uint8), (n, len(board)))
+    hole = np.broadcast_to(np.array(hole, dtype=np.uint8), (n, len(hole)))
+    strengths = evaluate_batch(np.hstack([hole, board, runouts]))
+    if board.shape[1] + runouts.shape[1] < 5:
+        return categories(strengths), np.ones(n, dtype=bool)
+    return categories(strengths), strengths > evaluate_batch(np.hstack([board, runouts]))
+
+
+def analyze_outs(hole, board):
+    """Calculate the outs of a hand of 2 hole cards on a flop or turn.
+
+    Args:
+        hole (sequence): 2 hole cards (see `card.card_code`).
+        board (sequence): 3 or 4 board cards.
+    """
+    hole, board = card_codes(hole), card_codes(board)
+    assert len(hole) == 2, "Invalid number of hole cards, must be exactly 2."
+    assert len(board) in (3, 4), f"Invalid number of board cards, must be 3 or 4: {len(board)}"
+    seen = hole + board
+    assert len(set(seen)) == len(seen), "Duplicate playing cards in hand."
+    pocket_pair = hole[0] % 13 == hole[1] % 13
+
+    def name(cat: str):
+        return "set" if (cat == "3" and pocket_pair) else NAMES[cat]
+
+    current = CATEGORIES.index(category(evaluate(seen)))
+    unseen = np.array([c for c in range(52) if c not in seen], dtype=np.uint8)
+    next_categories, next_improves = _improvements(hole, board, unseen[:, None])
+    if len(board) == 3:
+        river_categories, river_improves = _improvements(hole, board, unseen[combinations_array(len(unseen), 2)])
+    else:
+        river_categories, river_improves = next_categories, next_improves
+
+    outs, next_card, by_river = dict(), dict(), dict()
+    for i in range(current + 1, len(CATEGORIES)):
+        cards = [CARDS[c] for c in unseen[(next_categories == i) & next_improves]]
+        if cards:
+            outs[name(CATEGORIES[i])] = cards
+        next_card[name(CATEGORIES[i])] = float(np.mean((next_categories >= i) & next_improves))
+        by_river[name(CATEGORIES[i])] = float(np.mean((river_categories >= i) & river_improves))
+
+    # Straight and flush draws, and the cards that complete them:
+    draws = dict()
+    suit_counts = np.bincount([c // 13 for c in seen], minlength=4)
+    for suit in np.flatnonzero(suit_counts == 4):
+        if any(c // 13 == suit for c in hole):
+            draws["flush_draw"] = int(np.sum(unseen // 13 == suit))
+    mask = board_mask = 0
+    for c in seen:
+        mask |= 1 << (c % 13)
+    for c in board:
+        board_mask |= 1 << (c % 13)
+    if straight_high(mask) < 0:
+        # Only straights that use a hole card, i.e. beat any straight on the board alone:
+        straight_outs = [c for c in unseen.tolist()
+                         if straight_high(mask | (1 << (c % 13))) > straight_high(board_mask | (1 << (c % 13)))]
+        if straight_outs:
+            ranks = {c % 13 for c in straight_outs}
+            draws["open_ended" if len(ranks) >= 2 else "gutshot"] = len(straight_outs)
+    return Outs(category=name(CATEGORIES[current]), outs=outs, draws=draws, next_card=next_card, by_river=by_river)
@@ -0,0 +1,138 @@
+"""Precomputed preflop equities.
+
+Two tables are built ahead of time by `build_package` (see `indexes`), and
+looked up in O(1):
+    - `preflop_classes`: a (169, 9) float32 array of the equity of each
+      strategically distinct starting hand against 1 <= 9 opponents holding
+      random hands.
+    - `preflop_matchups`: a (1326, 1326) float32 array of the heads-up equity
+      of every 2-card combo against every other combo (NaN where the combos
+      share a card).
+
+Starting hand classes are indexed on a 13 x 13 grid, `high * 13 + low` for
+suited hands, `low * 13 + high` for offsuit hands and `rank * 13 + rank` for
+pairs, where ranks are rank indexes (0 = 2, 12 = Ace). Combos are indexed by
+`utils.combination_index` of their card codes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .card import CARDS, card_codes
+from .hand import Hand
+from .indexes import load_table
+from .isomorphism import canonical_keys
+from .monte_carlo import monte_carlo_equity
+from .utils import combination_index, combinations_array
+
+RANK_CHARS = "23456789TJQKA"
+MAX_OPPONENTS = 9
+
+
+def _combo_class(a: int, b: int):
+    high, low = max(a % 13, b % 13), min(a % 13, b % 13)
+    return high * 13 + low if a // 13 == b // 13 else low * 13 + high
+
+
+# Every 2-card combo, and the class of each combo:
+COMBOS = combinations_array(52, 2)
+COMBO_CLASSES = np.array([_combo_class(a, b) for a, b in COMBOS.tolist()], dtype=np.uint8)
+
+
+def _codes(hand):
+    codes = card_codes(hand.cards if isinstance(hand, Hand) else hand)
+    assert len(codes) == 2, "Invalid number of cards, preflop hands must be exactly 2."
+    assert codes[0] != codes[1], "Duplicate playing cards in hand."
+    return codes
+
+
+def combo_index(hand):
+    """Index (0 <= 1325) of a hand of 2 cards, passed as a `Hand` or a
+    sequence of cards."""
+    a, b = sorted(_codes(hand))
+    return combination_index(a, b)
+
+
+def hand_class(hand):
+    """Index (0 <= 168) of the starting hand class of a hand of 2 cards."""
+    return int(COMBO_CLASSES[combo_index(hand)])
+
+
+def class_label(index: int):
+    """Label of a starting hand class, e.g. "AKs", "72o" or "TT"."""
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANK_CHARS[row] * 2
+    elif row > column:
+        return f"{RANK_CHARS[row]}{RANK_CHARS[column]}s"
+    return f"{RANK_CHARS[column]}{RANK_CHARS[row]}o"
+
+
+def class_combos(index: int):
+    """Array of the combo indexes in a starting hand class."""
+    return np.flatnonzero(COMBO_CLASSES == index)
+
+
+def preflop_equity(hand, opponents: int = 1):
+    """Equity of a hand of 2 cards against `opponents` random hands."""
+    assert 1 <= opponents <= MAX_OPPONENTS, f"Invalid number of opponents: {opponents}"
+    return float(load_table("preflop_classes")[hand_class(hand), opponents - 1])
+
+
+def preflop_matchup(hand, villain):
+    """Heads-up equity of a hand of 2 cards against a villain's hand."""
+    return float(load_table("preflop_matchups")[combo_index(hand), combo_index(villain)])
+
+
+def sample_matchups(hands: np.ndarray, samples: int, rng: np.random.Generator, chunk_size: int = 1 << 17):
+    """Estimate the heads-up equity of each row of a (P, 4) array of card codes
+    (hero, hero, villain, villain) from `samples` random boards per row."""
+    equities = np.empty(len(hands))
+    rows_per_chunk = max(1, chunk_size // samples)
+    for start in range(0, len(hands), rows_per_chunk):
+        chunk = np.repeat(hands[start:start + rows_per_chunk], samples, axis=0).astype(np.intp)
+        keys = rng.random((len(chunk), 52))
+        keys[np.arange(len(chunk))[:, None], chunk] = 2.0
+        boards = np.argpartition(keys, 5, axis=1)[:, :5]
+        hero = evaluate_batch(np.hstack([chunk[:, :2], boards]))
+        villain = evaluate_batch(np.hstack([chunk[:, 2:], boards]))
+        share = (hero > villain) + 0.5 * (hero == villain)
+        equities[start:start + rows_per_chunk] = share.reshape(-1, samples).mean(axis=1)
+    return equities
+
+
+def _class_equity(args):
+    index, opponents, samples, seed = args
+    hole = [CARDS[c] for c in COMBOS[class_combos(index)[0]]]
+    return monte_carlo_equity(hole, villains=opponents, samples=samples, seed=seed).equity
+
+
+def build_class_table(samples: int = 20000, seed: int = 0, workers: int = 1):
+    """Build the (169, 9) table of the equity of each starting hand class
+    against 1 <= 9 random opponents, with the cells sampled in parallel over
+    `workers` processes."""
+    args = [(index, opponents, samples, seed) for index in range(169) for opponents in range(1, MAX_OPPONENTS + 1)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            equities = list(executor.map(_class_equity, args, chunksize=max(1, len(args) // (4 * workers))))
+    else:
+        equities = [_class_equity(a) for a in args]
+    return np.array(equities, dtype=np.float32).reshape(169, MAX_OPPONENTS)
+
+
+def build_matchup_table(samples: int = 10000, seed: int = 0):
+    """Build the (1326, 1326) table of heads-up equities of every combo against
+    every other combo. Only one matchup of each class of suit-isomorphic
+    matchups is sampled (about 1 in 10)."""
+    rng = np.random.default_rng(seed)
+    table = np.full((1326, 1326), np.nan, dtype=np.float32)
+    i, j = np.triu_indices(1326, k=1)
+    live = np.all(COMBOS[i][:, :, None] != COMBOS[j][:, None, :], axis=(1, 2))
+    i, j = i[live], j[live]
+    keys, _ = canonical_keys(COMBOS[i], COMBOS[j])
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    equities = sample_matchups(np.hstack([COMBOS[i[first]], COMBOS[j[first]]]), samples, rng)[inverse]
+    table[i, j] = equities
+    table[j, i] = 1.0 - equities
+    return table
@@ -0,0 +1,165 @@
+"""Heads-up range-vs-range equity from per-board strength vectors.
+
+On a complete (5-card) board the strength of each of the 1326 2-card combos is
+evaluated once. Sorting the strengths, a cumulative sum of the villain's
+weights gives, for every hero combo at once, the weight of the villain combos
+that it beats or ties, in O(1326 log 1326) per board instead of evaluating
+every pair of combos. Card removal is handled by inclusion-exclusion: the
+same sums over the 51 combos containing each card are subtracted for both of
+the hero's cards, and the hero's own combo (subtracted twice) is added back.
+
+Flops and turns are enumerated over every runout, e.g. a turn aggregates the
+strength vectors of its 46 rivers.
+"""
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .card import card_codes
+from .equity import Equity, parse_villain
+from .preflop import COMBOS
+from .utils import combination_index, combinations_array
+
+# Index of the 51 combos containing each card, shape (52, 51):
+CARD_COMBOS = np.array([np.flatnonzero((COMBOS == c).any(axis=1)) for c in range(52)])
+_OFFSET = 1 << 13  # Larger than any strength, to search many sorted rows at once.
+
+
+def range_weights(r):
+    """Array of the 1326 combo weights of a `ranges.Range`, a hand of 2 cards
+    or a sequence of hands (see `equity.parse_villain`)."""
+    if hasattr(r, "weights"):
+        return np.asarray(r.weights, dtype=float)
+    weights = np.zeros(len(COMBOS))
+    for codes, w in parse_villain(r):
+        a, b = sorted(codes)
+        weights[combination_index(a, b)] = w
+    return weights
+
+
+def board_strengths(boards):
+    """Strengths of every combo on each of an (B, 5) array of boards, as a
+    (B, 1326) int16 array, 0 where the combo shares a card with the board."""
+    boards = np.atleast_2d(np.asarray(boards, dtype=np.uint8))
+    live = ~(COMBOS[None, :, :, None] == boards[:, None, None, :]).any(axis=(2, 3))
+    b, c = np.nonzero(live)
+    strengths = np.zeros(live.shape, dtype=np.int16)
+    strengths[b, c] = evaluate_batch(np.hstack([COMBOS[c], boards[b]]))
+    return strengths
+
+
+def _below_and_equal(strengths: np.ndarray, weights: np.ndarray, queries: np.ndarray, rows: np.ndarray):
+    """For each query strength, the total weight of the entries of its row
+    with a lower and an equal strength.
+
+    Args:
+        strengths (np.ndarray): (R, k) strengths.
+        weights (np.ndarray): (R, k) weights.
+        queries (np.ndarray): (Q, ) strengths.
+        rows (np.ndarray): (Q, ) row of each query.
+    """
+    n_rows, k = strengths.shape
+    order = np.argsort(strengths, axis=1, kind="stable")
+    # Sorted rows, shifted so that the flattened array is sorted as a whole:
+    keys = (np.take_along_axis(strengths, order, axis=1) + np.arange(n_rows)[:, None] * _OFFSET).ravel()
+    cumulative = np.concatenate([[0.0], np.cumsum(np.take_along_axis(weights, order, axis=1).ravel())])
+    query_keys = queries + rows * _OFFSET
+    left = np.searchsorted(keys, query_keys, side="left")
+    right = np.searchsorted(keys, query_keys, side="right")
+    return cumulative[left] - cumulative[rows * k], cumulative[right] - cumulative[left]
+
+
+def _counts(strengths: np.ndarray, villain: np.ndarray, boards: np.ndarray, combos: np.ndarray):
+    """Return (below, equal, total, count) arrays of the villain weight that
+    each queried hero combo beats, ties and faces, and the number of villain
+    combos it faces, excluding villain combos that share a card with it.
+
+    Args:
+        strengths (np.ndarray): (B, 1326) strengths on B boards.
+        villain (np.ndarray): (B, 1326) live villain weights.
+        boards (np.ndarray): (Q, ) board of each query.
+        combos (np.ndarray): (Q, ) hero combo of each query.
+    """
+    n_boards = len(strengths)
+    strengths = strengths.astype(np.int64)
+    s = strengths[boards, combos]
+    below, equal = _below_and_equal(strengths, villain, s, boards)
+    total = villain.sum(axis=1)[boards]
+    present = villain > 0
+    count = present.sum(axis=1)[boards]
+    # Per card sums, over the villain combos sharing the card:
+    card_strengths = strengths[:, CARD_COMBOS].reshape(n_boards * 52, 51)
+    card_villain = villain[:, CARD_COMBOS].reshape(n_boards * 52, 51)
+    card_totals = card_villain.sum(axis=1)
+    card_counts = (card_villain > 0).sum(axis=1)
+    for card in (0, 1):
+        rows = boards * 52 + COMBOS[combos, card]
+        card_below, card_equal = _below_and_equal(card_strengths, card_villain, s, rows)
+        below -= card_below
+        equal -= card_equal
+        total -= card_totals[rows]
+        count -= card_counts[rows]
+    # The hero's own combo was subtracted twice:
+    own = villain[boards, combos]
+    equal += own
+    total += own
+    count += present[boards, combos]
+    return below, equal, total, count
+
+
+def _sweep(strengths: np.ndarray, hero: np.ndarray, villain: np.ndarray):
+    """Return the (win, tie, total) weights of hero vs. villain combos over
+    (B, 1326) arrays of strengths and live weights on B boards, and the
+    number of showdowns."""
+    boards, combos = np.nonzero(hero)
+    below, equal, total, count = _counts(strengths, villain, boards, combos)
+    weights = hero[boards, combos]
+    return (weights * below).sum(), (weights * equal).sum(), (weights * total).sum(), int(count.sum())
+
+
+def combo_equities(strengths: np.ndarray, villain=None):
+    """Showdown equity of every combo against a villain range on each board.
+
+    Args:
+        strengths (np.ndarray): (B, 1326) strengths from `board_strengths`.
+        villain: the villain's range (see `range_weights`), or None for a
+            random hand.
+
+    Returns a (B, 1326) float array, NaN where the combo shares a card with
+    the board or no villain combo is possible.
+    """
+    live = strengths > 0
+    villain = live * (1.0 if villain is None else range_weights(villain))
+    boards, combos = np.nonzero(live)
+    below, equal, total, _ = _counts(strengths, villain, boards, combos)
+    equities = np.full(strengths.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        equities[boards, combos] = (below + equal / 2) / total
+    return equities
+
+
+def range_equity(hero, villain, board):
+    """Calculate the exact heads-up equity of one range against another.
+
+    Args:
+        hero: the hero's range, a `ranges.Range`, a hand of 2 cards or a
+            sequence of hands (see `range_weights`).
+        villain: the villain's range.
+        board (sequence): 3, 4 or 5 board cards (see `card.card_code`).
+    """
+    board = card_codes(board)
+    assert len(board) in (3, 4, 5), f"Invalid number of board cards, must be 3, 4 or 5: {len(board)}"
+    assert len(set(board)) == len(board), "Duplicate playing cards in board."
+    return _range_equity(range_weights(hero), range_weights(villain), board)
+
+
+def _range_equity(hero: np.ndarray, villain: np.ndarray, board):
+    """Heads-up equity of arrays of 1326 hero and villain combo weights on a
+    list of 3, 4 or 5 board card codes."""
+    deck = np.array([c for c in range(52) if c not in board], dtype=np.uint8)
+    runouts = deck[combinations_array(len(deck), 5 - len(board))]
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.uint8), (len(runouts), len(board))), runouts])
+    strengths = board_strengths(boards)
+    live = strengths > 0
+    win, tie, total, n = _sweep(strengths, hero * live, villain * live)
+    assert total > 0, "No combination of hero and villain hands is possible with the cards dealt."
+    return Equity(win=win / total, tie=tie / total, loss=1.0 - (win + tie) / total, share=(win + tie / 2) / total, n=n)
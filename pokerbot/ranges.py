@@ -0,0 +1,167 @@
+"""Hand ranges, as a weight (0 <= 1) for each of the 1326 2-card combos.
+
+Combos are indexed like `preflop.COMBOS` (see `utils.combination_index`).
+Ranges can be parsed from the standard notation, e.g.
+
+    >>> Range("QQ+, AKs, T9s-65s, A5o+, AsKd:0.5")
+
+where "+" extends a pair upwards (QQ+ = QQ, KK, AA) or a hand's kicker up to
+one below its top card (A5o+ = A5o, A6o, ..., AKo), "-" spans two pairs or
+hands (T9s-65s = T9s, 98s, 87s, 76s, 65s; A2s-A5s = A2s, A3s, A4s, A5s),
+hands without "s" or "o" include both, and ":w" gives the combos weight w.
+Both "T" and "10" are accepted for tens.
+"""
+import numpy as np
+
+from .card import card_codes
+from .preflop import COMBO_CLASSES, COMBOS, RANK_CHARS, combo_index
+from .variables import SUITS
+
+
+def _class_index(high: int, low: int, kind: str):
+    """Starting hand class (see `preflop`) of rank indexes and kind, where kind
+    is "s", "o" or "" for a pair."""
+    if high == low:
+        return high * 13 + high
+    high, low = max(high, low), min(high, low)
+    return high * 13 + low if kind == "s" else low * 13 + high
+
+
+def _parse_hand(token: str):
+    """Parse a hand class such as "AKs", "AK" or "QQ" into a tuple of (high
+    rank, low rank, kinds)."""
+    try:
+        high, low = RANK_CHARS.index(token[0].upper()), RANK_CHARS.index(token[1].upper())
+    except (ValueError, IndexError):
+        raise ValueError(f"Couldn't parse hand from: {token}")
+    kind = token[2:]
+    if kind not in ("", "s", "o") or (high == low and kind):
+        raise ValueError(f"Couldn't parse hand from: {token}")
+    if high < low:
+        high, low = low, high
+    kinds = ("", ) if high == low else ((kind, ) if kind else ("s", "o"))
+    return high, low, kinds
+
+
+def _parse_token(token: str):
+    """Yield the combo indexes of a single token of range notation."""
+    # Specific combo, e.g. "AsKd":
+    if len(token) == 4 and token[1].upper() in SUITS and token[3].upper() in SUITS:
+        codes = [SUITS.index(token[i + 1].upper()) * 13 + RANK_CHARS.index(token[i].upper()) for i in (0, 2)]
+        yield combo_index(codes)
+        return
+    if token.endswith("+"):
+        high, low, kinds = _parse_hand(token[:-1])
+        if high == low:
+            hands = [(r, r) for r in range(high, 13)]
+        else:
+            hands = [(high, k) for k in range(low, high)]
+    elif "-" in token:
+        first, last = token.split("-")
+        (h1, l1, kinds), (h2, l2, kinds2) = _parse_hand(first), _parse_hand(last)
+        if kinds != kinds2:
+            raise ValueError(f"Couldn't parse range from: {token}")
+        if h1 == l1 and h2 == l2:  # Pairs, e.g. 22-55.
+            hands = [(r, r) for r in range(min(h1, h2), max(h1, h2) + 1)]
+        elif h1 == h2:  # Kickers, e.g. A2s-A5s.
+            hands = [(h1, k) for k in range(min(l1, l2), max(l1, l2) + 1)]
+        elif h1 - l1 == h2 - l2:  # Connectors with the same gap, e.g. T9s-65s.
+            hands = [(h, h - (h1 - l1)) for h in range(min(h1, h2), max(h1, h2) + 1)]
+        else:
+            raise ValueError(f"Couldn't parse range from: {token}")
+    else:
+        high, low, kinds = _parse_hand(token)
+        hands = [(high, low)]
+    for high, low in hands:
+        for kind in kinds:
+            yield from np.flatnonzero(COMBO_CLASSES == _class_index(high, low, kind)).tolist()
+
+
+class Range:
+    """A weighted range of 2-card hands."""
+
+    def __init__(self, notation: str = None, weights=None):
+        """Create a range from standard notation (see module docstring), or an
+        array of 1326 combo weights."""
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            assert weights.shape == (1326, ), f"Invalid shape of range weights: {weights.shape}"
+            self.weights = weights.copy()
+        else:
+            self.weights = np.zeros(1326)
+        if notation:
+            for token in notation.replace(" ", "").split(","):
+                if not token:
+                    continue
+                token, _, weight = token.partition(":")
+                token = token.replace("10", "T")
+                weight = float(weight) if weight else 1.0
+                assert 0 <= weight <= 1, f"Invalid weight: {weight}"
+                self.weights[list(_parse_token(token))] = weight
+
+    @classmethod
+    def from_hands(cls, hands, weight: float = 1.0):
+        """Create a range from a sequence of hands of 2 cards."""
+        r = cls()
+        for hand in hands:
+            r.weights[combo_index(hand)] = weight
+        return r
+
+    @property
+    def mask(self):
+        """Boolean array of the combos in the range."""
+        return self.weights > 0
+
+    def __len__(self):
+        """Number of combos in the range."""
+        return int(np.count_nonzero(self.weights))
+
+    def __contains__(self, hand):
+        return bool(self.weights[combo_index(hand)] > 0)
+
+    def __iter__(self):
+        """Iterate over (card codes, weight) tuples of the combos in the range."""
+        _, codes, weights = self.live_combos()
+        return zip(map(tuple, codes.tolist()), weights.tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, Range):
+            return NotImplemented
+        return bool(np.array_equal(self.weights, other.weights))
+
+    def __or__(self, other):
+        """Union, taking the larger weight of each combo."""
+        return Range(weights=np.maximum(self.weights, other.weights))
+
+    def __and__(self, other):
+        """Intersection, taking the smaller weight of each combo."""
+        return Range(weights=np.minimum(self.weights, other.weights))
+
+    def __sub__(self, other):
+        """Combos in this range which aren't in the other range."""
+        return Range(weights=np.where(other.weights > 0, 0.0, self.weights))
+
+    def __invert__(self):
+        """Complement, i.e. every combo with its weight subtracted from 1."""
+        return Range(weights=1.0 - self.weights)
+
+    def __repr__(self):
+        return f"Range({len(self)} combos)"
+
+    def without(self, cards):
+        """Copy of the range without the combos blocked by any of the cards
+        (e.g. the board or the hero's hole cards)."""
+        codes = card_codes(cards)
+        blocked = np.isin(COMBOS, codes).any(axis=1)
+        return Range(weights=np.where(blocked, 0.0, self.weights))
+
+    def live_combos(self):
+        """Tuple of arrays of the (combo indexes, (M, 2) card codes, weights) of
+        the combos in the range."""
+        indexes = np.flatnonzero(self.weights)
+        return indexes, COMBOS[indexes], self.weights[indexes]
+
+    def combos(self):
+        """List of (card codes, weight) tuples of the combos in the range, the
+        format used by the equity APIs (see `equity.parse_villain`)."""
+        return list(self)
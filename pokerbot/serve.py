@@ -0,0 +1,329 @@
+"""Asyncio equity and hand evaluation server, which gathers concurrent requests
+into micro-batches.
+
+Run on a Unix or TCP socket with e.g.
+
+    python -m pokerbot.serve --unix /tmp/pokerbot.sock
+    python -m pokerbot.serve --host 127.0.0.1 --port 8765 --workers 4
+
+Requests and responses are JSON objects, one per line (or with `--format
+msgpack`, if msgpack is installed, msgpack objects each prefixed by its 4-byte
+big-endian length):
+
+    {"id": 1, "method": "evaluate", "params": {"cards": ["as", "ks", "qs", "js", "10s"]}}
+    {"id": 1, "result": {"strength": 7462, "category": "RF"}}
+
+Methods and their params:
+    evaluate:     cards (5 <= 7 cards).
+    equity:       hole, board, villains, game (see `equity.exact_equity`).
+    monte_carlo:  hole, board, villains, samples, seed, game (see
+                  `monte_carlo.monte_carlo_equity`).
+    range_equity: hero, villain (ranges in notation, see `ranges`), board.
+    stats:        no params, returns latency percentiles and batch sizes.
+Errors are returned as {"id": ..., "error": message}.
+
+Evaluation requests arriving within `window` seconds of each other (up to
+`max_batch`) are dispatched together, as one call of the batch evaluator.
+Equity requests have no batched implementation, so each is dispatched to the
+executor on its own as soon as it arrives, and a cheap request isn't held back
+by expensive ones received at the same time.
+"""
+import argparse
+import asyncio
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import struct
+import time
+
+import numpy as np
+
+from .batch_evaluator import category_labels, evaluate_batch
+from .card import card_codes
+from .equity import exact_equity
+from .monte_carlo import monte_carlo_equity
+from .range_equity import range_equity
+from .ranges import Range
+from .shared import SharedTables
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+LATENCY_HISTORY = 10000  # Number of latencies kept per method for percentiles.
+PERCENTILES = (50, 90, 99)
+
+
+def _equity_result(e):
+    return dict(win=e.win, tie=e.tie, loss=e.loss, equity=e.equity, n=e.n, se=e.se)
+
+
+def _run_equity(method: str, params: dict):
+    if method == "equity":
+        return _equity_result(exact_equity(params["hole"], params.get("board", ()), params["villains"],
+                                           game=params.get("game", "holdem")))
+    elif method == "monte_carlo":
+        return _equity_result(monte_carlo_equity(params["hole"], params.get("board", ()),
+                                                 villains=params.get("villains", 1),
+                                                 samples=params.get("samples", 100000), seed=params.get("seed"),
+                                                 game=params.get("game", "holdem")))
+    elif method == "range_equity":
+        return _equity_result(range_equity(Range(params["hero"]), Range(params["villain"]), params["board"]))
+    raise ValueError(f"Unknown method: {method}")
+
+
+def equity_request(method: str, params: dict):
+    """Run an equity request, returning a ("result", value) or ("error",
+    message) tuple."""
+    try:
+        return "result", _run_equity(method, params)
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+
+
+def evaluate_requests(batch):
+    """Run a batch of hand evaluation requests with one batch evaluator call
+    per number of cards, returning a ("result", value) or ("error", message)
+    tuple per request."""
+    results = [None] * len(batch)
+    by_size = defaultdict(list)
+    for i, params in enumerate(batch):
+        try:
+            codes = card_codes(params["cards"])
+            assert 5 <= len(codes) <= 7, f"Invalid number of cards to evaluate, must be 5 <= 7: {len(codes)}"
+            assert len(set(codes)) == len(codes), "Duplicate playing cards in hand."
+            by_size[len(codes)].append((i, codes))
+        except Exception as e:
+            results[i] = ("error", f"{type(e).__name__}: {e}")
+    for hands in by_size.values():
+        strengths = evaluate_batch(np.array([codes for _, codes in hands], dtype=np.uint8))
+        for (i, _), strength, label in zip(hands, strengths.tolist(), category_labels(strengths).tolist()):
+            results[i] = ("result", dict(strength=strength, category=label))
+    return results
+
+
+class JSONCodec:
+    """Newline-delimited JSON messages."""
+
+    @staticmethod
+    async def read(reader: asyncio.StreamReader):
+        line = await reader.readline()
+        return json.loads(line) if line else None
+
+    @staticmethod
+    def encode(message):
+        return json.dumps(message).encode() + b"\n"
+
+
+class MsgpackCodec:
+    """msgpack messages, each prefixed by its 4-byte big-endian length."""
+
+    @staticmethod
+    async def read(reader: asyncio.StreamReader):
+        try:
+            size, = struct.unpack(">I", await reader.readexactly(4))
+            return msgpack.unpackb(await reader.readexactly(size))
+        except asyncio.IncompleteReadError:
+            return None
+
+    @staticmethod
+    def encode(message):
+        data = msgpack.packb(message)
+        return struct.pack(">I", len(data)) + data
+
+
+CODECS = {"json": JSONCodec, "msgpack": MsgpackCodec}
+
+
+class Batcher:
+    """Queue of the requests of one method, dispatched in micro-batches."""
+
+    def __init__(self, run, window: float, max_batch: int):
+        """
+        Args:
+            run: coroutine function called with a list of request params,
+                returning a ("result", value) or ("error", message) per request.
+            window (float): seconds to wait for more requests after the first
+                of a batch.
+            max_batch (int): maximum number of requests per batch.
+        """
+        self.run = run
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.batch_sizes = deque(maxlen=LATENCY_HISTORY)
+        self.task = asyncio.ensure_future(self._loop())
+
+    async def submit(self, params):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((params, future))
+        return await future
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batch_sizes.append(len(batch))
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        try:
+            results = await self.run([params for params, _ in batch])
+        except Exception as e:
+            results = [("error", f"{type(e).__name__}: {e}")] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class EquityServer:
+    """Server of equity and hand evaluation requests."""
+
+    def __init__(self, window: float = 0.002, max_batch: int = 1024, workers: int = 1, format: str = "json"):
+        """
+        Args:
+            window (float): seconds to gather requests into a batch.
+            max_batch (int): maximum number of requests per batch.
+            workers (int): number of processes to run equity requests in, or 1
+                to run them in a pool of threads of the server's process.
+                Worker processes share the lookup tables (see `shared`).
+            format (str): message format, one of `CODECS`.
+        """
+        assert format in CODECS, f"Invalid format, must be one of {tuple(CODECS)}: {format}"
+        assert format != "msgpack" or msgpack is not None, "The msgpack format requires msgpack to be installed."
+        self.window, self.max_batch, self.workers = window, max_batch, workers
+        self.codec = CODECS[format]
+        self.tables = SharedTables() if workers > 1 else None
+        self.executor = self.tables.executor(workers) if workers > 1 else ThreadPoolExecutor()
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_HISTORY))
+        self.batchers = dict()
+        self.server = None
+
+    def _batcher(self, method: str):
+        if method not in self.batchers:
+            loop = asyncio.get_running_loop()
+
+            async def run(batch):
+                return await loop.run_in_executor(None, evaluate_requests, batch)
+
+            self.batchers[method] = Batcher(run, self.window, self.max_batch)
+        return self.batchers[method]
+
+    def stats(self):
+        """Dict of method -> dict of request count, latency percentiles (in
+        milliseconds) and mean batch size, over the recent requests."""
+        stats = dict()
+        for method, latencies in self.latencies.items():
+            ms = np.array(latencies) * 1e3
+            stats[method] = dict(requests=len(ms), **{f"p{p}": float(np.percentile(ms, p)) for p in PERCENTILES})
+            if method in self.batchers and self.batchers[method].batch_sizes:
+                stats[method]["mean_batch"] = float(np.mean(self.batchers[method].batch_sizes))
+        return stats
+
+    async def handle(self, request):
+        """Response to a request."""
+        start = time.perf_counter()
+        response = dict(id=request.get("id")) if isinstance(request, dict) else dict(id=None)
+        try:
+            method = request["method"]
+            if method == "stats":
+                response["result"] = self.stats()
+                return response
+            if method not in ("evaluate", "equity", "monte_carlo", "range_equity"):
+                raise ValueError(f"Unknown method: {method}")
+            params = request.get("params", dict())
+            if method == "evaluate":
+                kind, value = await self._batcher(method).submit(params)
+            else:
+                kind, value = await asyncio.get_running_loop().run_in_executor(self.executor, equity_request,
+                                                                                method, params)
+            response[kind] = value
+            self.latencies[method].append(time.perf_counter() - start)
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        return response
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def respond(request):
+            writer.write(self.codec.encode(await self.handle(request)))
+
+        tasks = set()
+        try:
+            while True:
+                try:
+                    request = await self.codec.read(reader)
+                except ValueError as e:
+                    writer.write(self.codec.encode(dict(id=None, error=f"Invalid message: {e}")))
+                    continue
+                if request is None:
+                    break
+                task = asyncio.ensure_future(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, path: str = None):
+        """Start listening on a Unix socket at `path`, or else a TCP socket."""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._client, path=path)
+        else:
+            self.server = await asyncio.start_server(self._client, host=host, port=port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            batcher.task.cancel()
+        self.executor.shutdown(wait=False)
+        if self.tables is not None:
+            self.tables.close()
+
+
+async def _serve(args):
+    server = EquityServer(window=args.window_ms / 1e3, max_batch=args.max_batch, workers=args.workers,
+                          format=args.format)
+    await server.start(host=args.host, port=args.port, path=args.unix)
+    print(f"Serving on {args.unix or f'{args.host}:{args.port}'}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(args.report_every or 3600)
+            if args.report_every:
+                print(json.dumps(server.stats()), flush=True)
+    finally:
+        await server.close()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--unix", help="path of a Unix socket to listen on, instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="milliseconds to gather a batch")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=1, help="processes for equity requests")
+    parser.add_argument("--format", choices=tuple(CODECS), default="json")
+    parser.add_argument("--report-every", type=float, help="seconds between printing latency stats")
+    try:
+        asyncio.run(_serve(parser.parse_args(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
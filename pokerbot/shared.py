@@ -0,0 +1,111 @@
+"""Lookup tables shared between worker processes.
+
+`SharedTables` publishes the package's NumPy lookup tables once, as `.npy`
+files in shared memory (`/dev/shm` where available), and worker processes
+`attach` to them: each table is memory-mapped read-only and installed in the
+cache its module looks it up in, so every worker reads the same physical pages
+instead of building or loading its own copy. The published tables are:
+    - the flop, turn and river indexes (see `indexes`);
+    - the preflop tables, if they've been built (see `preflop`);
+    - the sorted prime products and strengths of the batch evaluator for 5, 6
+      and 7 cards (see `batch_evaluator.unsuited_arrays`).
+The scalar evaluator's tables are Python dicts, so can't be shared.
+
+    >>> with SharedTables() as tables, tables.executor(64) as executor:
+    ...     executor.map(...)
+
+The files are removed when the publisher is closed (or garbage collected).
+Workers that are still attached keep their mappings until they exit.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+from . import batch_evaluator, indexes
+
+SHM_DIR = "/dev/shm"
+
+_ATTACHED = list()  # Keys installed in this process by `attach`.
+
+
+def default_tables():
+    """Dict of key -> array of the tables to publish (see module docstring)."""
+    tables = {("index", name): indexes.load_index(name) for name in indexes.INDEXES}
+    for name in indexes.TABLES:
+        if os.path.exists(indexes.table_path(name)):
+            tables[("table", name)] = indexes.load_table(name)
+    for n in (5, 6, 7):
+        keys, strengths = batch_evaluator.unsuited_arrays(n)
+        tables[("unsuited_keys", n)] = keys
+        tables[("unsuited_strengths", n)] = strengths
+    return tables
+
+
+class SharedTables:
+    """Publisher of lookup tables in shared memory."""
+
+    def __init__(self, tables: dict = None):
+        """
+        Args:
+            tables (dict): key -> array of the tables to publish, by default
+                `default_tables()`.
+        """
+        tables = default_tables() if tables is None else tables
+        self.dir = tempfile.mkdtemp(prefix="pokerbot-", dir=SHM_DIR if os.path.isdir(SHM_DIR) else None)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.dir, ignore_errors=True)
+        self.manifest = dict()  # Key -> file path, to pass to `attach`.
+        for i, (key, array) in enumerate(tables.items()):
+            fp = os.path.join(self.dir, f"{i}.npy")
+            np.save(fp, np.ascontiguousarray(array))
+            self.manifest[key] = fp
+
+    def executor(self, workers: int):
+        """Process pool whose workers attach to the tables on start-up."""
+        return ProcessPoolExecutor(workers, initializer=attach, initargs=(self.manifest, ))
+
+    def close(self):
+        """Remove the published tables."""
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(manifest: dict):
+    """Memory-map the tables of a manifest (see `SharedTables.manifest`)
+    read-only and install them in their modules' caches, replacing any copies
+    already loaded by this process."""
+    arrays = {key: np.load(fp, mmap_mode="r") for key, fp in manifest.items()}
+    for key, array in arrays.items():
+        kind, name = key
+        if kind == "index":
+            indexes._LOADED[name] = array
+        elif kind == "table":
+            indexes._LOADED[key] = array
+        elif kind == "unsuited_keys":
+            batch_evaluator._UNSUITED[name] = array, arrays[("unsuited_strengths", name)]
+        _ATTACHED.append(key)
+
+
+def detach():
+    """Drop the tables installed by `attach`, so they're loaded or built
+    privately again on next use."""
+    while _ATTACHED:
+        kind, name = _ATTACHED.pop()
+        if kind == "index":
+            indexes._LOADED.pop(name, None)
+        elif kind == "table":
+            indexes._LOADED.pop((kind, name), None)
+        elif kind == "unsuited_keys":
+            batch_evaluator._UNSUITED.pop(name, None)
@@ -0,0 +1,336 @@
+"""No-limit Texas Hold 'Em table simulator for bot self-play.
+
+`TableBatch` plays hands at many independent tables in lockstep: the state of
+every table is held in (tables, seats) NumPy arrays, each step applies one
+action at every unfinished table, and all the showdowns of a hand are
+evaluated with a single call of the batch evaluator. `Table` is a single table
+with scalar policies.
+
+A vectorized policy is a callable `policy(batch, tables, seat)`, called with
+the `TableBatch`, an array of the indexes of the tables where `seat` is to act
+and the seat, which returns a tuple of (actions, amounts) arrays: one of
+`FOLD`, `CALL` (which checks if there's nothing to call) or `RAISE` per table,
+and for raises the total street bet to raise to (clipped to a legal size, and
+raising all-in when short). A raise by a seat that can't raise (see
+`TableBatch.can_raise`) is a call.
+"""
+import numpy as np
+
+from .batch_evaluator import evaluate_batch
+from .card import CARDS
+from .deck import Deck
+
+FOLD, CALL, RAISE = 0, 1, 2
+PREFLOP, FLOP, TURN, RIVER = 0, 1, 2, 3
+BOARD_SIZES = (0, 3, 4, 5)  # Number of visible board cards on each street.
+MAX_SEATS = 10
+
+
+def first_seat(mask: np.ndarray, start: np.ndarray):
+    """Index of the first seat at or after `start` (wrapping around the table)
+    where an (T, P) `mask` is True, for each of T tables, or -1 if none."""
+    n_tables, n_seats = mask.shape
+    rows = np.arange(n_tables)
+    seats = (np.asarray(start)[:, None] + np.arange(n_seats)) % n_seats
+    found = mask[rows[:, None], seats]
+    first = seats[rows, np.argmax(found, axis=1)]
+    return np.where(found.any(axis=1), first, -1)
+
+
+class TableBatch:
+    """Independent tables of the same seats and policies, played in lockstep.
+
+    State arrays (T tables, P seats), valid during a hand:
+        stacks:      (T, P) chips behind.
+        hole:        (T, P, 2) hole card codes.
+        board:       (T, 5) board card codes, of which the first
+                     `BOARD_SIZES[street]` are visible.
+        committed:   (T, P) chips put in the pot this hand.
+        street_bet:  (T, P) chips put in the pot this street.
+        folded:      (T, P) folded, or not dealt in (no chips).
+        street:      (T, ) current street (`PREFLOP` -> `RIVER`).
+        current_bet: (T, ) largest street bet.
+        min_raise:   (T, ) minimum raise increment.
+        to_act:      (T, ) seat to act.
+        button:      (T, ) dealer seat.
+        done:        (T, ) hand finished (or not played).
+    """
+
+    def __init__(self, n_tables: int, policies, stack: int = 200, small_blind: int = 1, big_blind: int = 2,
+                 seed=None, rebuy: bool = True):
+        """
+        Args:
+            n_tables (int): number of tables.
+            policies (sequence): vectorized policy of each seat (see module
+                docstring), 2 <= 10 seats.
+            stack (int): starting stack of every seat.
+            small_blind (int): small blind.
+            big_blind (int): big blind.
+            seed: seed of the deck's random number generator (see `Deck`).
+            rebuy (bool): reset every stack before each hand, else stacks
+                carry over and seats without chips sit out.
+        """
+        assert 2 <= len(policies) <= MAX_SEATS, f"Invalid number of seats, must be 2 <= {MAX_SEATS}: {len(policies)}"
+        self.policies = list(policies)
+        self.n_tables, self.n_seats = n_tables, len(policies)
+        self.stack, self.small_blind, self.big_blind, self.rebuy = stack, small_blind, big_blind, rebuy
+        self.deck = Deck(seed)
+        shape = (n_tables, self.n_seats)
+        self.stacks = np.full(shape, stack, dtype=np.int64)
+        self.winnings = np.zeros(shape, dtype=np.int64)
+        self.button = np.zeros(n_tables, dtype=np.intp)
+        self.hands_played = 0
+
+    def can_act(self):
+        """(T, P) seats still in the hand with chips behind."""
+        return ~self.folded & (self.stacks > 0)
+
+    def needs_action(self):
+        """(T, P) seats which have to act before the street ends."""
+        return self.can_act() & (~self.acted | (self.street_bet < self.current_bet[:, None]))
+
+    def can_raise(self, tables: np.ndarray, seat: int):
+        """Whether the seat may raise at each of the tables: it has more chips
+        than it has to call, and hasn't acted since the last full raise (an
+        all-in raise smaller than a full raise doesn't reopen the betting)."""
+        return ~self.acted[tables, seat] & (self.stacks[tables, seat] > self.current_bet[tables]
+                                            - self.street_bet[tables, seat])
+
+    def to_call(self, tables: np.ndarray, seat: int):
+        """Chips the seat has to put in to call at each of the tables."""
+        return np.minimum(self.current_bet[tables] - self.street_bet[tables, seat], self.stacks[tables, seat])
+
+    def min_raise_to(self, tables: np.ndarray, seat: int):
+        """Smallest legal total street bet of a raise by the seat."""
+        return np.minimum(self.current_bet[tables] + self.min_raise[tables], self.max_raise_to(tables, seat))
+
+    def max_raise_to(self, tables: np.ndarray, seat: int):
+        """Total street bet of the seat going all-in."""
+        return self.street_bet[tables, seat] + self.stacks[tables, seat]
+
+    def pot(self, tables: np.ndarray):
+        return self.committed[tables].sum(axis=1)
+
+    def visible_board(self, table: int):
+        """Card codes of the visible board at a table."""
+        return self.board[table, :BOARD_SIZES[self.street[table]]]
+
+    def observation(self, table: int, seat: int):
+        """Dict of everything the seat can see at a table, for scalar policies."""
+        tables = np.array([table])
+        return dict(
+            seat=seat,
+            hole=[CARDS[c] for c in self.hole[table, seat]],
+            board=[CARDS[c] for c in self.visible_board(table)],
+            street=int(self.street[table]),
+            button=int(self.button[table]),
+            pot=int(self.pot(tables)[0]),
+            to_call=int(self.to_call(tables, seat)[0]),
+            can_raise=bool(self.can_raise(tables, seat)[0]),
+            min_raise_to=int(self.min_raise_to(tables, seat)[0]),
+            max_raise_to=int(self.max_raise_to(tables, seat)[0]),
+            stacks=self.stacks[table].tolist(),
+            street_bets=self.street_bet[table].tolist(),
+            folded=self.folded[table].tolist(),
+        )
+
+    def _post(self, tables: np.ndarray, seats: np.ndarray, amount: int):
+        paid = np.minimum(amount, self.stacks[tables, seats])
+        self.stacks[tables, seats] -= paid
+        self.street_bet[tables, seats] += paid
+        self.committed[tables, seats] += paid
+
+    def start_hand(self):
+        """Shuffle, deal and post the blinds at every table."""
+        if self.rebuy:
+            self.stacks[:] = self.stack
+        self.start_stacks = self.stacks.copy()
+        seated = self.stacks > 0
+        self.done = seated.sum(axis=1) < 2
+        cards = self.deck.shuffles(self.n_tables)
+        self.hole = cards[:, :2 * self.n_seats].reshape(self.n_tables, self.n_seats, 2)
+        self.board = cards[:, 2 * self.n_seats:2 * self.n_seats + 5]
+        shape = (self.n_tables, self.n_seats)
+        self.committed = np.zeros(shape, dtype=np.int64)
+        self.street_bet = np.zeros(shape, dtype=np.int64)
+        self.folded = ~seated
+        self.acted = np.zeros(shape, dtype=bool)
+        self.street = np.zeros(self.n_tables, dtype=np.intp)
+        self.min_raise = np.full(self.n_tables, self.big_blind, dtype=np.int64)
+
+        tables = np.flatnonzero(~self.done)
+        seated = seated[tables]
+        self.button[tables] = first_seat(seated, self.button[tables])
+        # Heads-up, the button posts the small blind:
+        heads_up = seated.sum(axis=1) == 2
+        small = np.where(heads_up, self.button[tables], first_seat(seated, self.button[tables] + 1))
+        big = first_seat(seated, small + 1)
+        self._post(tables, small, self.small_blind)
+        self._post(tables, big, self.big_blind)
+        self.current_bet = self.street_bet.max(axis=1)
+        self.to_act = np.full(self.n_tables, -1, dtype=np.intp)
+        self.to_act[tables] = first_seat(self.needs_action()[tables], big + 1)
+        # Everyone is all-in from the blinds:
+        self._showdown(tables[self.to_act[tables] < 0])
+
+    def step(self):
+        """Apply one action at every unfinished table."""
+        active = ~self.done
+        for seat, policy in enumerate(self.policies):
+            tables = np.flatnonzero(active & (self.to_act == seat))
+            if len(tables):
+                actions, amounts = policy(self, tables, seat)
+                self._act(tables, seat, np.asarray(actions), np.asarray(amounts, dtype=np.int64))
+        self._advance(np.flatnonzero(active))
+
+    def _act(self, tables: np.ndarray, seat: int, actions: np.ndarray, amounts: np.ndarray):
+        to_call = self.current_bet[tables] - self.street_bet[tables, seat]
+        stack = self.stacks[tables, seat]
+        fold = (actions == FOLD) & (to_call > 0)
+        raises = (actions == RAISE) & self.can_raise(tables, seat)
+        raise_to = np.clip(amounts, self.min_raise_to(tables, seat), self.max_raise_to(tables, seat))
+        paid = np.where(fold, 0, np.where(raises, raise_to - self.street_bet[tables, seat], np.minimum(to_call, stack)))
+        self.folded[tables[fold], seat] = True
+        self.stacks[tables, seat] -= paid
+        self.street_bet[tables, seat] += paid
+        self.committed[tables, seat] += paid
+        raised = tables[raises]
+        increase = self.street_bet[raised, seat] - self.current_bet[raised]
+        # Only a full raise reopens the action for seats that have already acted:
+        reopened = raised[increase >= self.min_raise[raised]]
+        self.min_raise[raised] = np.maximum(self.min_raise[raised], increase)
+        self.current_bet[raised] = self.street_bet[raised, seat]
+        self.acted[reopened] = False
+        self.acted[tables, seat] = True
+
+    def _advance(self, tables: np.ndarray):
+        """Move the action on at tables where a seat just acted."""
+        remaining = (~self.folded[tables]).sum(axis=1)
+        uncontested = tables[remaining == 1]
+        payouts = np.zeros((len(uncontested), self.n_seats), dtype=np.int64)
+        payouts[np.arange(len(uncontested)), np.argmin(self.folded[uncontested], axis=1)] = self.pot(uncontested)
+        self._award(uncontested, payouts)
+
+        tables = tables[remaining > 1]
+        next_seat = first_seat(self.needs_action()[tables], self.to_act[tables] + 1)
+        self.to_act[tables] = next_seat
+        ended = tables[next_seat < 0]
+        # Showdown after the river, or when at most one seat can still bet:
+        showdown = (self.street[ended] == RIVER) | (self.can_act()[ended].sum(axis=1) <= 1)
+        self._showdown(ended[showdown])
+        ended = ended[~showdown]
+        self.street[ended] += 1
+        self.street_bet[ended] = 0
+        self.current_bet[ended] = 0
+        self.min_raise[ended] = self.big_blind
+        self.acted[ended] = False
+        self.to_act[ended] = first_seat(self.needs_action()[ended], self.button[ended] + 1)
+
+    def _award(self, tables: np.ndarray, payouts: np.ndarray):
+        self.stacks[tables] += payouts
+        self.done[tables] = True
+
+    def _showdown(self, tables: np.ndarray):
+        """Split the pots, including side pots, of tables at showdown."""
+        if not len(tables):
+            return
+        n = len(tables)
+        rows = np.arange(n)
+        board = np.broadcast_to(self.board[tables, None, :], (n, self.n_seats, 5))
+        codes = np.concatenate([self.hole[tables], board], axis=2).reshape(n * self.n_seats, 7)
+        folded = self.folded[tables]
+        strengths = np.where(folded, -1, evaluate_batch(codes).reshape(n, self.n_seats))
+        committed = self.committed[tables]
+        levels = np.sort(committed, axis=1)
+        payouts = np.zeros((n, self.n_seats), dtype=np.int64)
+        previous = np.zeros(n, dtype=np.int64)
+        # Each distinct commitment level closes a (side) pot, contested by the
+        # seats that committed at least that much and haven't folded:
+        for k in range(self.n_seats):
+            level = levels[:, k]
+            contributors = committed >= level[:, None]
+            amount = (level - previous) * contributors.sum(axis=1)
+            eligible = contributors & ~folded
+            eligible |= ~eligible.any(axis=1)[:, None] & ~folded
+            best = np.where(eligible, strengths, -1).max(axis=1)
+            winners = eligible & (strengths == best[:, None])
+            n_winners = winners.sum(axis=1)
+            share = amount // n_winners
+            payouts += winners * share[:, None]
+            # Odd chips go to the first winner after the button:
+            payouts[rows, first_seat(winners, self.button[tables] + 1)] += amount - share * n_winners
+            previous = level
+        self._award(tables, payouts)
+
+    def play_hand(self):
+        """Play one hand at every table, and return the (T, P) chips won."""
+        self.start_hand()
+        while not self.done.all():
+            self.step()
+        won = self.stacks - self.start_stacks
+        self.winnings += won
+        self.button = (self.button + 1) % self.n_seats
+        self.hands_played += 1
+        return won
+
+    def play(self, hands: int):
+        """Play a number of hands at every table, and return the (T, P) total
+        chips won since the tables were created."""
+        for _ in range(hands):
+            self.play_hand()
+        return self.winnings
+
+
+def call_policy(batch: TableBatch, tables: np.ndarray, seat: int):
+    """Vectorized policy that always checks or calls."""
+    return np.full(len(tables), CALL), np.zeros(len(tables), dtype=np.int64)
+
+
+def random_policy(fold: float = 0.2, raise_: float = 0.2, seed=None):
+    """Vectorized policy that folds, calls or raises (to between the minimum
+    raise and 3 times it) at random."""
+    rng = np.random.default_rng(seed)
+
+    def policy(batch: TableBatch, tables: np.ndarray, seat: int):
+        actions = rng.choice((FOLD, CALL, RAISE), size=len(tables), p=(fold, 1.0 - fold - raise_, raise_))
+        amounts = (batch.min_raise_to(tables, seat) * rng.uniform(1.0, 3.0, size=len(tables))).astype(np.int64)
+        return actions, amounts
+
+    return policy
+
+
+def scalar_policy(policy):
+    """Vectorize a policy which is called with one `TableBatch.observation` and
+    returns one (action, amount) tuple."""
+    def vectorized(batch: TableBatch, tables: np.ndarray, seat: int):
+        decisions = [policy(batch.observation(t, seat)) for t in tables.tolist()]
+        return np.array([a for a, _ in decisions]), np.array([int(x or 0) for _, x in decisions], dtype=np.int64)
+
+    return vectorized
+
+
+class Table:
+    """A single table whose seats are played by scalar policies, each called
+    with an observation dict (see `TableBatch.observation`) and returning an
+    (action, amount) tuple."""
+
+    def __init__(self, policies, stack: int = 200, small_blind: int = 1, big_blind: int = 2, seed=None,
+                 rebuy: bool = True):
+        self.batch = TableBatch(1, [scalar_policy(p) for p in policies], stack=stack, small_blind=small_blind,
+                                big_blind=big_blind, seed=seed, rebuy=rebuy)
+
+    @property
+    def stacks(self):
+        return self.batch.stacks[0]
+
+    @property
+    def winnings(self):
+        return self.batch.winnings[0]
+
+    def play_hand(self):
+        """Play one hand, and return the chips won by each seat."""
+        return self.batch.play_hand()[0]
+
+    def play(self, hands: int):
+        """Play a number of hands, and return the total chips won by each seat."""
+        return self.batch.play(hands)[0]
@@ -1,3 +1,4 @@
+import numpy as np
 
 
 def factorial(n: int):
@@ -17,3 +18,31 @@ def permutations_without_replacement(n: int, r: int):
 
 def combinations_without_replacement(n: int, r: int):
     return int(factorial(n) / (factorial(r) * factorial(n-r)))
+
+
+def combinations_array(n: int, r: int, dtype=np.uint8):
+    """Return a (`n` choose `r`, `r`) array of every combination of `r` items
+    from range(`n`), in the same (lexicographic) order as
+    `itertools.combinations`, built without any per-combination Python loop."""
+    combos = np.zeros((1, 0), dtype=np.int64)
+    for i in range(r):
+        first = combos[:, -1] + 1 if i else np.zeros(1, dtype=np.int64)
+        counts = np.maximum(n - (r - 1 - i) - first, 0)  # Leave room for the remaining items.
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        combos = np.hstack([np.repeat(combos, counts, axis=0), (np.repeat(first, counts) + offsets)[:, None]])
+    return combos.astype(dtype)
+
+
+def combination_index(a: int, b: int, n: int = 52):
+    """Index of the pair of items `a` < `b` in the rows of
+    `combinations_array(n, 2)`."""
+    return a * (2 * n - a - 1) // 2 + b - a - 1
+
+
+def combo_weights(combos):
+    """(1326, ) array of the total weight of each 2-card combo (a row of
+    `combinations_array(52, 2)`) in a list of (card codes, weight) tuples."""
+    codes = np.sort(np.array([c for c, _ in combos], dtype=np.intp).reshape(-1, 2), axis=1)
+    weights = np.zeros(52 * 51 // 2)
+    np.add.at(weights, combination_index(codes[:, 0], codes[:, 1]), [w for _, w in combos])
+    return weights
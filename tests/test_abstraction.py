@@ -0,0 +1,92 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pokerbot import indexes
+from pokerbot.abstraction import bucket, build_buckets, equity_histograms, hand_potential, kmeans
+from pokerbot.card import card_codes
+from pokerbot.equity import exact_equity
+from pokerbot.evaluator import evaluate
+from pokerbot.preflop import combo_index
+from pokerbot.ranges import Range
+
+
+def _brute_force_potential(hole, board):
+    """HS, PPot and NPot by scalar enumeration (Billings et al.)."""
+    hole, board = card_codes(hole), card_codes(board)
+    deck = [c for c in range(52) if c not in hole + board]
+    hp = np.zeros((3, 3))
+    now_counts = np.zeros(3)
+    for villain in itertools.combinations(deck, 2):
+        now = int(np.sign(evaluate(hole + board) - evaluate(list(villain) + board))) + 1
+        now_counts[now] += 1
+        for river in itertools.combinations([c for c in deck if c not in villain], 5 - len(board)):
+            later = int(np.sign(evaluate(hole + board + list(river)) - evaluate(list(villain) + board + list(river))))
+            hp[now, later + 1] += 1
+    totals = hp.sum(axis=1)
+    hs = (now_counts[2] + now_counts[1] / 2) / now_counts.sum()
+    ppot = (hp[0, 2] + hp[0, 1] / 2 + hp[1, 2] / 2) / (totals[0] + totals[1] / 2)
+    npot = (hp[2, 0] + hp[1, 0] / 2 + hp[2, 1] / 2) / (totals[2] + totals[1] / 2)
+    return hs, ppot, npot
+
+
+def test_hand_potential_matches_brute_force():
+    hole, board = ["as", "5s"], ["ks", "9s", "2d", "7c"]
+    result = hand_potential(hole, board)
+    hs, ppot, npot = _brute_force_potential(hole, board)
+    assert result.hs == pytest.approx(hs)
+    assert result.ppot == pytest.approx(ppot)
+    assert result.npot == pytest.approx(npot)
+    assert result.ehs == pytest.approx(hs * (1 - npot) + (1 - hs) * ppot)
+    assert result.n == 1035 * 44
+    assert result.histogram.sum() == pytest.approx(1.0)
+
+
+def test_hand_potential_of_the_nuts():
+    result = hand_potential(["as", "ks"], ["qs", "js", "10s"])
+    assert result.hs == 1.0
+    assert result.npot == 0.0
+    assert result.ehs == 1.0
+    assert result.histogram[-1] == 1.0
+
+
+def test_equity_histograms():
+    board = ["qs", "js", "2d", "3c"]
+    histograms = equity_histograms(board, bins=10)
+    assert histograms.shape == (1326, 10)
+    assert not histograms[combo_index(["qs", "as"])].any()
+    live = histograms.sum(axis=1) > 0
+    assert np.count_nonzero(live) == 48 * 47 // 2
+    assert histograms[live].sum(axis=1) == pytest.approx(1.0)
+    # The mean of the river equities lies within the bin width of the equity:
+    hand = ["as", "ks"]
+    mean = histograms[combo_index(hand)] @ (np.arange(10) + 0.5) / 10
+    assert mean == pytest.approx(exact_equity(hand, board, [~Range()]).equity, abs=0.05)
+
+
+def test_kmeans_separates_clusters():
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    features = np.concatenate([c + rng.normal(size=(100, 2)) for c in centers])
+    found, labels = kmeans(features, 3, seed=1, workers=2)
+    assert len(np.unique(labels)) == 3
+    for i in range(3):
+        assert len(np.unique(labels[i * 100:(i + 1) * 100])) == 1
+    assert np.abs(np.sort(found, axis=0) - np.sort(centers, axis=0)).max() < 0.5
+
+
+def test_build_buckets_and_lookup(monkeypatch):
+    boards = np.array([card_codes(["qs", "js", "2d", "3c"]), card_codes(["ah", "kh", "7c", "7d"])])
+    table = build_buckets("turn", k=8, bins=10, boards=boards)
+    assert table.dtype == np.int64 and table.shape[1] == 2
+    assert np.all(np.diff(table[:, 0]) > 0)
+    assert set(np.unique(table[:, 1])) == set(range(8))
+
+    monkeypatch.setitem(indexes._LOADED, ("table", "buckets_turn"), table)
+    board = ["qs", "js", "2d", "3c"]
+    # Isomorphic situations share a bucket, and stronger hands get higher ones:
+    assert bucket(["as", "ks"], board) == bucket(["ah", "kh"], ["qh", "jh", "2c", "3d"])
+    assert bucket(["as", "ks"], board) > bucket(["7h", "4d"], board)
+    with pytest.raises(KeyError):
+        bucket(["as", "ks"], ["qs", "js", "2d", "4c"])
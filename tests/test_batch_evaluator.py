@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pokerbot.batch_evaluator import categories, category_labels, evaluate_batch
+from pokerbot import evaluator
+
+
+@pytest.mark.parametrize("n", [5, 6, 7])
+def test_batch_matches_scalar(n):
+    rng = np.random.default_rng(n)
+    codes = np.argsort(rng.random((2000, 52)), axis=1)[:, :n].astype(np.uint8)
+    strengths = evaluate_batch(codes, chunk_size=300)
+    assert strengths.shape == (2000, )
+    assert strengths.tolist() == [evaluator.evaluate(row.tolist()) for row in codes]
+    assert categories(strengths).tolist() == [evaluator.CATEGORIES.index(evaluator.category(s)) for s in strengths]
+
+
+def test_category_labels():
+    codes = np.array([[8, 9, 10, 11, 12], [0, 13, 26, 1, 14]])  # Clubs royal flush, 2s full of 3s.
+    assert category_labels(evaluate_batch(codes)).tolist() == ["RF", "FH"]
+
+
+def test_tables_built_on_first_evaluation():
+    code = (
+        "from pokerbot import batch_evaluator, evaluator\n"
+        "assert not evaluator.FLUSH_TABLE, 'Tables built on import.'\n"
+        "assert batch_evaluator.evaluate_batch([[8, 9, 10, 11, 12]]).tolist() == [7462]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
@@ -0,0 +1,34 @@
+import json
+
+from pokerbot.batch_evaluator import evaluate_batch
+from pokerbot.benchmark import BENCHMARKS, best_subset_strengths, check_category_counts, compare, main, measure
+from pokerbot.deck import Deck
+
+
+def test_category_counts():
+    assert check_category_counts(seven_cards=False, samples=5000) == []
+
+
+def test_compare():
+    regressions = compare({"a": 1.3, "b": 1.1, "c": 5.0}, {"a": 1.0, "b": 1.0})
+    assert regressions == [("a", 1.3, 1.0)]
+
+
+def test_benchmarks_run():
+    for name in ("card_construction", "deck_shuffle_deal", "exact_equity_flop"):
+        assert measure(BENCHMARKS[name](), repeat=1, min_time=0.0) > 0
+
+
+def test_main_detects_regressions(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert main(["card_construction", "--skip-oracle", "--repeat", "1", "--save-baseline", str(baseline)]) == 0
+    report = json.loads(baseline.read_text())
+    assert report["results"]["card_construction"] > 0
+    report["results"]["card_construction"] = 1e-12
+    baseline.write_text(json.dumps(report))
+    assert main(["card_construction", "--skip-oracle", "--repeat", "1", "--baseline", str(baseline)]) == 1
+
+
+def test_best_subset_strengths():
+    hands = Deck(1).shuffles(1000)[:, :7]
+    assert best_subset_strengths(hands).tolist() == evaluate_batch(hands).tolist()
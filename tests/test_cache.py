@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from pokerbot.cache import LRUCache, SQLiteCache, TieredCache, equity_key
+from pokerbot.card import card_codes
+from pokerbot.equity import exact_equity, parse_villain
+from pokerbot.ranges import Range
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_lru_byte_bound():
+    cache = LRUCache(max_bytes=500)
+    for i in range(20):
+        cache.set(i, "x" * 50)
+    assert cache.bytes <= 500
+    assert 0 < len(cache) < 20
+    cache.set("huge", "x" * 1000)
+    assert "huge" not in cache
+
+
+def test_sqlite_shared_between_instances(tmp_path):
+    path = os.path.join(tmp_path, "cache.sqlite")
+    writer = SQLiteCache(path, max_items=2)
+    writer.set(("k", 1), {"equity": 0.5})
+    writer.set(("k", 2), 2)
+    writer.set(("k", 3), 3)
+    reader = SQLiteCache(path)
+    assert reader.get(("k", 1)) is None
+    assert reader.get(("k", 3)) == 3
+    assert len(reader) == 2
+    assert writer.stats()["evictions"] == 1
+
+
+def test_tiered_cache_promotes_hits(tmp_path):
+    memory, disk = LRUCache(), SQLiteCache(os.path.join(tmp_path, "cache.sqlite"))
+    disk.set("k", 1)
+    cache = TieredCache(memory, disk)
+    assert cache.get("k") == 1
+    assert memory.get("k") == 1
+
+
+def test_equity_key_is_suit_and_villain_order_invariant():
+    a = equity_key("exact", card_codes(["as", "ks"]), card_codes(["qs", "2d", "3h"]),
+                   [parse_villain(["qh", "qd"]), None])
+    b = equity_key("exact", card_codes(["kh", "ah"]), card_codes(["2c", "qh", "3s"]),
+                   [None, parse_villain(["qs", "qc"])])
+    assert a == b
+
+
+def test_exact_equity_cached():
+    cache = LRUCache()
+    first = exact_equity(["as", "ks"], ["qs", "js", "2d", "3c"], [["qh", "qd"]], cache=cache)
+    second = exact_equity(["ah", "kh"], ["qh", "jh", "2c", "3d"], [["qs", "qc"]], cache=cache)
+    assert second is first
+    assert cache.stats()["hits"] == 1
+
+
+def test_range_key_is_permuted_weights_and_isomorphic():
+    villain = Range("22+, A2+, K2+, Q2+, J2+, T2+")
+    board = card_codes(["qs", "js", "2d", "3c", "9h"])
+    key = equity_key("exact", card_codes(["as", "ah"]), board, [villain.combos()])
+    # Swapping spades and hearts maps the situation onto itself:
+    assert equity_key("exact", card_codes(["ah", "as"]), card_codes(["qh", "jh", "2d", "3c", "9s"]),
+                      [villain.combos()]) == key
+    assert equity_key("exact", card_codes(["as", "ah"]), board, [Range("22+").combos()]) != key
+    # The range is keyed by the bytes of its 1326 (permuted) combo weights:
+    (weights, ) = key[3]
+    assert np.frombuffer(weights).shape == (1326, )
+    assert np.frombuffer(weights).sum() == len(villain.combos())
+
+    cache = LRUCache()
+    exact_equity(["as", "ah"], board, [villain], cache=cache)
+    exact_equity(["ah", "as"], card_codes(["qh", "jh", "2d", "3c", "9s"]), [villain], cache=cache)
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,62 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from pokerbot.card import Card, CARDS
+from pokerbot.deck import Deck
+
+
+def test_constructors_return_shared_instance():
+    card = Card("AS")
+    assert card is Card("as") is Card("sa") is Card("S", "A") is Card(1, "s")
+    assert Card("10d") is Card("d10") is Card(10, "D")
+    assert card is CARDS[card.code]
+
+
+def test_precomputed_fields():
+    card = Card("QH")
+    assert (card.rank, card.suit) == ("Q", "H")
+    assert (card.rank_index, card.suit_index, card.int_rank) == (10, 2, 12)
+    assert card.code == 2 * 13 + 10
+    assert card.prime == 31
+    assert card.bit == 1 << 10
+    assert card.mask == 1 << card.code
+    assert int(card) == 12
+    assert str(card) == "Queen of Hearts"
+    assert repr(card) == "QH"
+
+
+def test_codes_match_deck_order():
+    assert [c.code for c in Deck.cards] == sorted(c.code for c in Deck.cards)
+    assert len(set(CARDS)) == 52
+
+
+def test_bulk_constructors():
+    codes = np.array([0, 12, 51], dtype=np.uint8)
+    cards = Card.from_ints(codes)
+    assert cards == [Card("2C"), Card("AC"), Card("AS")]
+    assert Card.to_ints(cards) == [0, 12, 51]
+    assert Card.from_int(51) is Card("AS")
+
+
+def test_comparisons():
+    assert Card("2S") < Card("3C") <= Card("3D")
+    assert Card("AS") > Card("KS") >= Card("KD")
+    assert Card("AS") == Card("AS")
+    assert Card("AS") != Card("AH")
+
+
+def test_immutable_and_interned_through_copies():
+    card = Card("7C")
+    with pytest.raises(AttributeError):
+        card.rank = "8"
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert copy.deepcopy(card) is card
+
+
+@pytest.mark.parametrize("args", [("XS", ), ("7", "X"), ("1", "2", "3")])
+def test_invalid(args):
+    with pytest.raises((ValueError, AssertionError)):
+        Card(*args)
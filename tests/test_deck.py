@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from pokerbot.card import Card
+from pokerbot.deck import Deck
+
+
+def test_deal():
+    deck = Deck(seed=0)
+    card = deck.deal()
+    assert isinstance(card, Card)
+    hand = deck.deal(5)
+    assert len(hand) == 5 and len(deck) == 46
+    assert deck.dealt == [card] + hand
+    assert sorted(c.code for c in deck.dealt + deck.not_dealt) == list(range(52))
+    deck.deal(46)
+    with pytest.raises(IndexError):
+        deck.deal()
+
+
+def test_state_is_per_instance():
+    cards = list(Deck.cards)
+    a, b = Deck(seed=1), Deck(seed=1)
+    assert a.deal(52) == b.deal(52)
+    assert list(Deck.cards) == cards
+    assert Deck(seed=2).not_dealt != Deck(seed=3).not_dealt
+
+
+def test_dead_cards_and_reset():
+    deck = Deck(seed=0, dead=["as", "kd"])
+    assert len(deck) == 50
+    assert Card("as") not in deck.not_dealt
+    deck.deal(10)
+    with pytest.raises(AssertionError):
+        deck.shuffle()
+    deck.reset()
+    assert len(deck) == 50 and not deck.dealt
+
+
+def test_shuffles():
+    deck = Deck(seed=np.random.default_rng(0), dead=["2c"])
+    shuffles = deck.shuffles(1000)
+    assert shuffles.shape == (1000, 51) and shuffles.dtype == np.uint8
+    assert (np.sort(shuffles, axis=1) == np.arange(1, 52)).all()
+    assert len(np.unique(shuffles[:, 0])) == 51
@@ -0,0 +1,63 @@
+from importlib import import_module
+from itertools import combinations
+
+import pytest
+
+from pokerbot import equity
+from pokerbot.card import card_codes
+from pokerbot.equity import _exact_equity, exact_equity, parse_villain
+from pokerbot.evaluator import evaluate
+from pokerbot.ranges import Range
+
+
+def brute_force(hole, board, villain):
+    hole, board, villain = card_codes(hole), card_codes(board), card_codes(villain)
+    deck = [c for c in range(52) if c not in hole + board + villain]
+    results = list()
+    for runout in combinations(deck, 5 - len(board)):
+        hero, other = evaluate(hole + board + list(runout)), evaluate(villain + board + list(runout))
+        results.append(1.0 if hero > other else 0.5 if hero == other else 0.0)
+    return sum(results) / len(results)
+
+
+@pytest.mark.parametrize("board", [["qs", "js", "2d"], ["qs", "js", "2d", "3c"]])
+def test_matches_brute_force(board):
+    result = exact_equity(["as", "ks"], board, [["qh", "qd"]])
+    assert result.equity == pytest.approx(brute_force(["as", "ks"], board, ["qh", "qd"]))
+    assert result.win + result.tie + result.loss == pytest.approx(1.0)
+
+
+def test_river_split():
+    result = exact_equity(["as", "ks"], ["qs", "js", "10d", "3c", "4c"], [["ah", "kh"]])
+    assert (result.win, result.tie, result.equity) == (0.0, 1.0, 0.5)
+
+
+def test_range_with_card_removal():
+    board = ["qs", "js", "2d", "3c"]
+    # AS is held by the hero, so ("as", "8s") is removed from the villain's range:
+    result = exact_equity(["as", "ks"], board, [[("qh", "qd"), ("2h", "2c"), ("as", "8s")]])
+    expected = (brute_force(["as", "ks"], board, ["qh", "qd"]) + brute_force(["as", "ks"], board, ["2h", "2c"])) / 2
+    assert result.equity == pytest.approx(expected)
+
+
+def test_multiway_three_way_split():
+    result = exact_equity(["2c", "3c"], ["as", "ks", "qs", "js", "10s"], [["2d", "3d"], ["2h", "3h"]])
+    assert result.tie == 1.0
+    assert result.equity == pytest.approx(1 / 3)
+
+
+@pytest.mark.parametrize("board", [["qs", "js", "2d", "3c", "9h"], ["qs", "js", "2d", "3c"]])
+def test_range_villain_uses_sweep(board, monkeypatch):
+    villain = Range("22+, A2+, K2+, Q2+, J2+, T2+, 98s:0.5")
+    expected = _exact_equity(card_codes(["as", "ah"]), card_codes(board), [parse_villain(villain)])
+    calls = list()
+    module = import_module("pokerbot.range_equity")  # `pokerbot.range_equity` is the function.
+    sweep = module._range_equity
+    monkeypatch.setattr(module, "_range_equity", lambda *args: calls.append(args) or sweep(*args))
+    monkeypatch.setattr(equity, "_exact_equity", lambda *args: pytest.fail("Evaluated each villain combo."))
+    result = exact_equity(["as", "ah"], board, [villain])
+    assert len(calls) == 1
+    assert result.equity == pytest.approx(expected.equity)
+    assert result.win == pytest.approx(expected.win)
+    assert result.tie == pytest.approx(expected.tie)
+    assert result.n == expected.n
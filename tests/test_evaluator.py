@@ -0,0 +1,75 @@
+from itertools import combinations
+import random
+
+import pytest
+
+from pokerbot.card import Card
+from pokerbot import evaluator
+from pokerbot.hand import TexasHoldem5Hand
+
+
+def codes(*cards):
+    return [Card(c).code for c in cards]
+
+
+def test_strength_bounds():
+    assert evaluator.evaluate(codes("7h", "5d", "4c", "3s", "2h")) == 1
+    assert evaluator.evaluate(codes("as", "ks", "qs", "js", "10s")) == evaluator.MAX_STRENGTH
+
+
+@pytest.mark.parametrize("cards, category", [
+    (("as", "ks", "qs", "js", "10s"), "RF"),
+    (("as", "2s", "3s", "4s", "5s"), "SF"),
+    (("9c", "9d", "9h", "9s", "2c"), "4"),
+    (("9c", "9d", "9h", "2s", "2c"), "FH"),
+    (("9c", "jc", "2c", "4c", "kc"), "F"),
+    (("ac", "2d", "3h", "4s", "5c"), "S"),
+    (("9c", "9d", "9h", "2s", "3c"), "3"),
+    (("9c", "9d", "2h", "2s", "3c"), "2P"),
+    (("9c", "9d", "2h", "4s", "3c"), "P"),
+    (("9c", "jd", "2h", "4s", "3c"), "HC"),
+])
+def test_category(cards, category):
+    strength = evaluator.evaluate(codes(*cards))
+    assert evaluator.category(strength) == category
+    low, high = evaluator.category_range(category)
+    assert low <= strength <= high
+
+
+def test_ordering_within_categories():
+    wheel = evaluator.evaluate(codes("ac", "2d", "3h", "4s", "5c"))
+    six_high = evaluator.evaluate(codes("6c", "2d", "3h", "4s", "5c"))
+    assert wheel < six_high
+    pair_low_kicker = evaluator.evaluate(codes("9c", "9d", "ah", "4s", "2c"))
+    pair_high_kicker = evaluator.evaluate(codes("9c", "9d", "ah", "4s", "3c"))
+    assert pair_low_kicker < pair_high_kicker
+    assert evaluator.evaluate(codes("ac", "ad", "2h", "2s", "3c")) > evaluator.evaluate(codes("kc", "kd", "qh", "qs", "ac"))
+
+
+def test_describe_and_kickers():
+    strength = evaluator.evaluate(codes("kc", "kd", "kh", "4s", "4c"))
+    assert evaluator.describe(strength) == ("FH", (13, 13, 13, 4, 4))
+    strength = evaluator.evaluate(codes("9c", "9d", "2h", "4s", "3c"))
+    assert evaluator.kickers(strength) == (4, 3, 2)
+
+
+def test_strengths_are_unique_per_class():
+    seen = dict()
+    for strength in range(1, evaluator.MAX_STRENGTH + 1):
+        category, ranks = evaluator.describe(strength)
+        assert (category, ranks) not in seen
+        seen[(category, ranks)] = strength
+
+
+def test_seven_cards_match_best_subset():
+    rng = random.Random(0)
+    for _ in range(500):
+        for n in (6, 7):
+            cards = rng.sample(range(52), n)
+            best = max(evaluator.evaluate5(*c) for c in combinations(cards, 5))
+            assert evaluator.evaluate(cards) == best
+
+
+def test_texas_holdem_5_hand_strength():
+    hand = TexasHoldem5Hand("9c", "9d", "9h", "2s", "2c")
+    assert evaluator.category(hand.strength) == hand.best_hand == "FH"
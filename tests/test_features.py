@@ -0,0 +1,41 @@
+import numpy as np
+
+from pokerbot.card import Card
+from pokerbot import evaluator
+from pokerbot.features import flop_features
+from pokerbot.odds_calculators import HoldemFlopOdds
+
+
+def test_flop_features():
+    features = flop_features(Card("as"), Card("ah"))
+    assert features["cards"].shape == (19600, 5)
+    assert features["rank_counts"].sum(axis=1).tolist() == [5] * 19600
+    assert features["suit_counts"].sum(axis=1).tolist() == [5] * 19600
+    # Every flop contains the 2 aces, so the hand is at least a pair:
+    assert (features["rank_counts"][:, 12] >= 2).all()
+    assert (features["highest_rank"] == 12).all()
+    # Full houses are aces full (1 of 2 aces plus a pair) or trips with the aces:
+    assert int(features["full_house"].sum()) == 2 * 12 * 6 + 12 * 4
+    for i in np.random.default_rng(0).choice(19600, 50):
+        strength = evaluator.evaluate(features["cards"][i].tolist())
+        assert features["strength"][i] == strength
+        assert evaluator.CATEGORIES[features["category"][i]] == evaluator.category(strength)
+        assert features["straight"][i] == (evaluator.category(strength) == "S")
+
+
+def test_flop_features_frame():
+    df = flop_features(Card("10s"), Card("9s"), as_frame=True)
+    assert len(df) == 19600
+    assert {"A", "C", "flush", "straight", "strength"}.issubset(df.columns)
+    assert df["flush"].sum() == 165  # 11 spades choose 3.
+
+
+def test_create_hands_df():
+    odds = HoldemFlopOdds()
+    odds.create_hands_df(Card("as"), Card("ah"))
+    df = odds.odds_df
+    assert df.shape == (19600, 116)
+    assert (df[Card("as")] == 1.0).all()
+    assert (df[[c for c in df.columns if isinstance(c, Card)]].sum(axis=1) == 5).all()
+    assert (df["highest_rank"] == "A").all()
+    assert (df["pair_count"] + df["three_count"] + df["four_count"] >= 1).all()
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+from itertools import combinations
+import random
+
+import numpy as np
+import pytest
+
+from pokerbot.card import CARDS
+from pokerbot import evaluator
+from pokerbot.hand import Hand, HandState, TexasHoldem5Hand
+
+
+def test_strength_matches_best_5_card_subset():
+    rng = random.Random(1)
+    for n in (5, 6, 7):
+        for _ in range(200):
+            cards = rng.sample(CARDS, n)
+            best = max(TexasHoldem5Hand(*c).strength for c in combinations(cards, 5))
+            assert Hand(*cards).strength == best
+
+
+def test_strength_category_agrees_with_best_hand():
+    hand = Hand("as", "ks", "qs", "js", "10s", "2d", "2c")
+    assert hand.best_hand == evaluator.category(hand.strength) == "RF"
+    hand = Hand("9c", "9d", "9h", "2s", "2c", "2d", "kc")
+    assert hand.best_hand == evaluator.category(hand.strength) == "FH"
+    assert evaluator.describe(hand.strength)[1] == (9, 9, 9, 2, 2)
+
+
+def test_hand_state_matches_evaluator():
+    rng = np.random.default_rng(0)
+    for codes in np.argsort(rng.random((200, 52)), axis=1)[:, :9].tolist():
+        state = HandState(*codes[:5])
+        assert state.strength == evaluator.evaluate(codes[:5])
+        for n in range(6, 10):
+            state.add(codes[n - 1])
+            assert state.strength == evaluator.evaluate(codes[:n])
+        for n in range(8, 4, -1):
+            state.remove(codes[n])
+            assert state.strength == evaluator.evaluate(codes[:n])
+
+
+def test_hand_state_branching():
+    state = HandState("as", "ks", "qs", "js", "2d")
+    assert state.category == "HC" and len(state) == 5
+    river = state.copy().add("10s")
+    assert river.category == "RF" and "10s" in river
+    assert "10s" not in state and state.category == "HC"
+    assert river.cards == sorted(river.cards, key=lambda c: c.code)
+    with pytest.raises(AssertionError):
+        state.add("as")
+
+
+def test_hand_state_category_before_five_cards():
+    state = HandState("as", "ad")
+    assert state.category == Hand("as", "ad").best_hand == "P"
+    assert state.add("ks").category == "P" and state.add("kd").category == "2P"
+    assert HandState("as", "ad", "ah", "ac").category == "4"
+    assert HandState("as", "ad", "ah", "kc").category == "3"
+    assert HandState("as", "kd").category == HandState().category == "HC"
+    with pytest.raises(AssertionError):
+        state.strength
+
+
+def test_tables_built_on_first_evaluation():
+    code = (
+        "from pokerbot import evaluator\n"
+        "from pokerbot.hand import Hand, HandState\n"
+        "assert Hand('as', 'ks', 'qs', 'js', '10s').best_hand == 'RF'\n"
+        "assert not evaluator.FLUSH_TABLE, 'Tables built on import.'\n"
+        "assert HandState(0, 1, 2, 3, 4, 20).strength == evaluator.evaluate([0, 1, 2, 3, 4, 20])\n"
+        "assert evaluator.FLUSH_TABLE\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
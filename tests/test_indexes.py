@@ -0,0 +1,50 @@
+from itertools import combinations
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pokerbot import indexes
+from pokerbot.utils import combinations_array
+
+
+def test_combinations_array_matches_itertools():
+    for n, r in [(50, 3), (47, 1), (6, 6), (4, 0)]:
+        assert combinations_array(n, r).tolist() == [list(c) for c in combinations(range(n), r)]
+
+
+def test_load_index_is_cached_and_read_only():
+    flop = indexes.load_index("flop")
+    assert flop.shape == (19600, 3) and flop.dtype == np.uint8
+    assert indexes.load_index("flop") is flop
+    assert not flop.flags.writeable
+
+
+def test_index_built_and_saved_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(indexes, "DIR", str(tmp_path))
+    monkeypatch.setattr(indexes, "_LOADED", dict())
+    river = indexes.load_index("river")
+    assert (tmp_path / "indexes" / "river_index.npy").exists()
+    assert isinstance(river, np.memmap) and river.shape == (46, 1)
+    # An existing file isn't rebuilt:
+    indexes.save_array(indexes.index_path("river"), lambda: 1 / 0)
+
+
+def test_lazy_package_import():
+    code = ("import sys, pokerbot; assert 'pandas' not in sys.modules and 'pokerbot.card' not in sys.modules; "
+            "assert pokerbot.Card('AS').code == 51; assert 'pandas' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+def test_missing_table_not_built_on_lookup(tmp_path, monkeypatch):
+    monkeypatch.setattr(indexes, "DIR", str(tmp_path))
+    monkeypatch.setattr(indexes, "_LOADED", dict())
+    monkeypatch.setitem(indexes.TABLES, "tiny", ("utils", "combinations_array", dict(n=4, r=2)))
+    with pytest.raises(FileNotFoundError, match="build_package"):
+        indexes.load_table("tiny")
+    assert not (tmp_path / "indexes" / "tiny.npy").exists()
+    # Unless the caller opts in:
+    assert indexes.load_table("tiny", build=True).shape == (6, 2)
+    assert (tmp_path / "indexes" / "tiny.npy").exists()
@@ -0,0 +1,37 @@
+import pstats
+
+from pokerbot import evaluator
+from pokerbot import hand
+from pokerbot import instrument
+from pokerbot.cache import LRUCache
+from pokerbot import equity
+
+
+def test_counts_and_restores():
+    original = hand.evaluate
+    instrument.reset()
+    with instrument.instrumented():
+        assert hand.evaluate is not original
+        hand.Hand("as", "ks", "qs", "js", "10s", "2d", "3c").strength
+        equity.exact_equity(["as", "ks"], ["qs", "js", "2d", "3c", "4h"], [["qh", "qd"]])
+        stats = instrument.snapshot()
+    assert hand.evaluate is original and evaluator.evaluate is original
+    assert not instrument.is_enabled()
+    assert stats["hand.Hand.strength"]["calls"] == 1
+    assert stats["evaluator.evaluate"]["calls"] == 1
+    assert stats["equity.exact_equity"]["calls"] == 1
+    assert stats["equity._exact_equity"]["seconds"] <= stats["equity.exact_equity"]["seconds"]
+    assert stats["batch_evaluator.evaluate_batch"]["calls"] == 2
+    instrument.reset()
+    assert "equity.exact_equity" not in instrument.snapshot()
+
+
+def test_caches_and_profile(tmp_path):
+    cache = LRUCache()
+    instrument.register_cache("equity", cache)
+    with instrument.instrumented(profile=True):
+        for _ in range(2):
+            equity.exact_equity(["as", "ks"], ["qs", "js", "2d", "3c", "4h"], [["qh", "qd"]], cache=cache)
+        instrument.dump_stats(str(tmp_path / "out.pstats"))
+    assert instrument.snapshot()["caches"]["equity"]["hit_rate"] == 0.5
+    assert pstats.Stats(str(tmp_path / "out.pstats")).total_calls > 0
@@ -0,0 +1,36 @@
+import numpy as np
+
+from pokerbot.card import card_codes
+from pokerbot.isomorphism import canonical_boards, canonical_form, canonical_keys, canonicalize, permute
+
+
+def test_canonical_flops():
+    boards, multiplicities = canonical_boards(3)
+    assert len(boards) == 1755
+    assert multiplicities.sum() == 22100
+
+
+def test_isomorphic_situations_share_canonical_form():
+    a = canonicalize(["as", "ks"], ["qs", "2d", "3h"])
+    b = canonicalize(["ah", "kh"], ["qh", "2c", "3s"])
+    assert a == b
+    assert a[2] == 24
+    assert canonicalize(["as", "ah"])[2] == 6
+
+
+def test_vectorized_keys_agree_with_canonical_form():
+    rng = np.random.default_rng(0)
+    codes = np.argsort(rng.random((200, 52)), axis=1)[:, :5]
+    keys, perms = canonical_keys(codes[:, :2], codes[:, 2:])
+    for row, key, perm in zip(codes.tolist(), keys.tolist(), perms.tolist()):
+        (hole, board), _ = canonical_form(row[:2], row[2:])
+        digits = list(hole) + list(board)
+        assert key == sum(d * 52 ** (4 - i) for i, d in enumerate(digits))
+        image = permute(row, perm).tolist()
+        assert (tuple(sorted(image[:2])), tuple(sorted(image[2:]))) == (hole, board)
+
+
+def test_group_order_matters():
+    (hero, villain), _ = canonical_form(card_codes(["as", "ah"]), card_codes(["kd", "kc"]))
+    (villain2, hero2), _ = canonical_form(card_codes(["kd", "kc"]), card_codes(["as", "ah"]))
+    assert (hero, villain) != (hero2, villain2)
@@ -0,0 +1,41 @@
+import pytest
+
+from pokerbot.equity import exact_equity
+from pokerbot.monte_carlo import monte_carlo_equity
+
+
+def test_converges_to_exact_equity():
+    board = ["qs", "js", "2d"]
+    exact = exact_equity(["as", "ks"], board, [["qh", "qd"]])
+    estimate = monte_carlo_equity(["as", "ks"], board, [["qh", "qd"]], samples=40000, seed=0)
+    assert estimate.n == 40000
+    assert abs(estimate.equity - exact.equity) < 4 * estimate.se
+
+
+def test_reproducible_regardless_of_workers():
+    kwargs = dict(hole=["as", "ah"], villains=[None, [("kd", "kc"), ("qd", "qc")]], samples=20000,
+                  batch_size=2000, seed=3)
+    single = monte_carlo_equity(workers=1, **kwargs)
+    multi = monte_carlo_equity(workers=2, **kwargs)
+    assert single.__dict__ == multi.__dict__
+
+
+def test_early_stopping():
+    result = monte_carlo_equity(["as", "ah"], villains=2, samples=1000000, batch_size=1000, target_se=0.01, seed=1)
+    assert result.se <= 0.01
+    assert result.n < 1000000
+
+
+def test_range_removes_dead_cards():
+    with pytest.raises(AssertionError):
+        monte_carlo_equity(["as", "ah"], villains=[[("as", "kd")]], samples=100)
+
+
+def test_samples_is_a_maximum():
+    assert monte_carlo_equity(["as", "ah"], villains=1, samples=100, seed=1).n == 100
+    assert monte_carlo_equity(["as", "ah"], villains=1, samples=15000, seed=1).n == 15000
+
+
+def test_impossible_villains():
+    with pytest.raises(AssertionError, match="No combination of villain hands"):
+        monte_carlo_equity(["ks", "kh"], villains=[["as", "ah"], ["as", "ad"]], samples=100, seed=0)
@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pokerbot.card import card_codes
+from pokerbot.deck import Deck
+from pokerbot.equity import exact_equity
+from pokerbot.evaluator import evaluate5
+from pokerbot.monte_carlo import monte_carlo_equity
+from pokerbot.omaha import OmahaHand, evaluate_omaha, evaluate_omaha_batch
+
+
+def _brute_force(hole, board):
+    return max(evaluate5(*pair, *triple)
+               for pair in itertools.combinations(hole, 2) for triple in itertools.combinations(board, 3))
+
+
+@pytest.mark.parametrize("hole_size, board_size", [(4, 5), (5, 5), (4, 3), (5, 4)])
+def test_matches_brute_force(hole_size, board_size):
+    codes = Deck(0).shuffles(300)
+    holes, boards = codes[:, :hole_size], codes[:, hole_size:hole_size + board_size]
+    strengths = evaluate_omaha_batch(holes, boards, chunk_size=1000)
+    assert strengths.tolist() == [_brute_force(h, b) for h, b in zip(holes.tolist(), boards.tolist())]
+
+
+def test_exactly_two_hole_cards():
+    # One spade in the hand is no flush, and four to a straight on the board needs 2 hole cards:
+    assert OmahaHand(["as", "2d", "3c", "4h"], ["ks", "qs", "js", "9s", "8s"]).best_hand != "F"
+    assert OmahaHand(["as", "2s", "3c", "4h"], ["ks", "qs", "js", "9d", "8d"]).best_hand == "F"
+    # Quads on the board don't play:
+    assert OmahaHand(["2c", "3d", "4h", "6s"], ["ks", "kh", "kd", "kc", "9s"]).best_hand == "3"
+
+
+def test_omaha_hand():
+    hand = OmahaHand(["as", "ah", "ks", "kh"], ["ad", "2c", "7h", "8s", "9s"])
+    assert hand.strength == evaluate_omaha(["as", "ah", "ks", "kh"], ["ad", "2c", "7h", "8s", "9s"])
+    assert hand.best_hand == "3"
+    assert sorted(c.code for c in hand.best_cards[:2]) == sorted(card_codes(["as", "ah"]))
+    with pytest.raises(AssertionError):
+        OmahaHand(["as", "ah", "ks"], ["ad", "2c", "7h"])
+
+
+def test_exact_equity():
+    hole, villain, board = ["as", "ah", "ks", "kh"], ["qd", "qc", "jd", "10c"], ["2c", "7d", "8h", "3s"]
+    result = exact_equity(hole, board, [villain], game="omaha")
+    wins = ties = 0
+    deck = [c for c in range(52) if c not in card_codes(hole + villain + board)]
+    for river in deck:
+        full = card_codes(board) + [river]
+        a, b = _brute_force(card_codes(hole), full), _brute_force(card_codes(villain), full)
+        wins += a > b
+        ties += a == b
+    assert result.n == len(deck)
+    assert result.win == pytest.approx(wins / len(deck))
+    assert result.tie == pytest.approx(ties / len(deck))
+    with pytest.raises(AssertionError):
+        exact_equity(hole, board, [villain])
+
+
+def test_monte_carlo_equity():
+    hole, villain, board = ["as", "ah", "ks", "kh", "2d"], ["qd", "qc", "jd", "10c", "9h"], ["2c", "7d", "8h"]
+    expected = exact_equity(hole, board, [villain], game="omaha5")
+    result = monte_carlo_equity(hole, board, [villain], samples=20000, seed=0, game="omaha5")
+    assert abs(result.equity - expected.equity) < 4 * result.se
+    # Random villain hands are dealt 4 cards:
+    result = monte_carlo_equity(["as", "ah", "ks", "kh"], villains=2, samples=2000, seed=0, game="omaha")
+    assert 0.4 < result.equity < 0.8
+    assert np.isfinite(result.se)
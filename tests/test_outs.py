@@ -0,0 +1,61 @@
+import pytest
+
+from pokerbot.card import Card
+from pokerbot.odds_calculators import base_out_probability
+from pokerbot.outs import analyze_outs
+
+
+def test_open_ended_straight_draw():
+    result = analyze_outs(["9h", "8h"], ["7c", "6d", "2s"])
+    assert result.category == "high_card"
+    assert result.draws == {"open_ended": 8}
+    assert len(result.outs["straight"]) == 8
+    assert result.by_river["straight"] == pytest.approx(base_out_probability(8, 2, on_table=3))
+    assert result.next_card["straight"] == pytest.approx(8 / 47)
+
+
+def test_flush_draw_with_gutshot():
+    result = analyze_outs(["as", "ks"], ["qs", "js", "2d"])
+    assert result.draws == {"flush_draw": 9, "gutshot": 4}
+    assert result.outs["royal_flush"] == [Card("10s")]
+    assert len(result.outs["flush"]) == 8  # 9 spades, except the royal flush.
+
+
+def test_set_outs_on_the_turn():
+    result = analyze_outs(["5h", "5d"], ["kc", "9d", "2s", "3h"])
+    assert result.category == "pair"
+    assert sorted(map(repr, result.outs["set"])) == ["5C", "5S"]
+    assert result.next_card["set"] == result.by_river["set"] == pytest.approx(2 / 46)
+
+
+def test_full_house_outs():
+    result = analyze_outs(["kh", "kd"], ["kc", "9d", "2s"])
+    assert result.category == "set"
+    assert len(result.outs["full_house"]) == 6  # Pairing the 9 or the 2.
+    assert len(result.outs["quads"]) == 1
+
+
+def test_straight_on_the_board_not_a_draw():
+    result = analyze_outs(["as", "2d"], ["9c", "8d", "7h", "6s"])
+    assert "open_ended" not in result.draws and "gutshot" not in result.draws
+    # A card that makes a higher straight with a hole card still counts:
+    assert analyze_outs(["10s", "2d"], ["9c", "8d", "7h", "3s"]).draws == {"open_ended": 8}
+
+
+def test_four_flush_board():
+    result = analyze_outs(["jc", "10c"], ["9h", "8h", "2h", "3h"])
+    assert "flush" not in result.outs
+    assert result.next_card["flush"] == 0.0
+    assert len(result.outs["straight"]) == 6  # Queens and sevens, but not the hearts.
+    # The ace of hearts beats the flush on the board:
+    result = analyze_outs(["ah", "10c"], ["9h", "8h", "2h", "3h"])
+    assert result.category == "flush" and "flush" not in result.outs
+
+
+def test_four_straight_board():
+    result = analyze_outs(["as", "2d"], ["9c", "8d", "7h", "6s"])
+    assert "straight" not in result.outs
+    assert result.by_river["straight"] == 0.0
+    # A ten makes a higher straight than the board's:
+    result = analyze_outs(["js", "2d"], ["9c", "8d", "7h", "6s"])
+    assert len(result.outs["straight"]) == 4
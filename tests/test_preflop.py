@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pokerbot.hand import Hand
+from pokerbot import preflop
+
+
+def test_classes():
+    assert len(set(preflop.COMBO_CLASSES.tolist())) == 169
+    sizes = {preflop.class_label(i): len(preflop.class_combos(i)) for i in range(169)}
+    assert (sizes["AA"], sizes["AKs"], sizes["AKo"], sizes["72o"]) == (6, 4, 12, 12)
+    assert preflop.class_label(preflop.hand_class(Hand("10s", "9s"))) == "T9s"
+    assert preflop.hand_class(["as", "kd"]) == preflop.hand_class(["kh", "ac"])
+
+
+def test_combo_index():
+    indexes = {preflop.combo_index(preflop.COMBOS[i].tolist()) for i in range(1326)}
+    assert indexes == set(range(1326))
+    assert preflop.combo_index(["as", "kd"]) == preflop.combo_index(Hand("kd", "as"))
+
+
+def test_lookups(monkeypatch):
+    classes = np.zeros((169, 9), dtype=np.float32)
+    classes[preflop.hand_class(["as", "ah"]), 2] = 0.64
+    matchups = np.full((1326, 1326), np.nan, dtype=np.float32)
+    matchups[preflop.combo_index(["as", "ah"]), preflop.combo_index(["kd", "kc"])] = 0.81
+    tables = {"preflop_classes": classes, "preflop_matchups": matchups}
+    monkeypatch.setattr(preflop, "load_table", tables.__getitem__)
+    assert preflop.preflop_equity(Hand("ad", "ac"), opponents=3) == pytest.approx(0.64)
+    assert preflop.preflop_matchup(Hand("ah", "as"), ["kc", "kd"]) == pytest.approx(0.81)
+
+
+def test_sample_matchups():
+    rng = np.random.default_rng(0)
+    aces_vs_kings = np.array([[51, 38, 24, 11]])  # AS AH vs KD KC.
+    assert preflop.sample_matchups(aces_vs_kings, 20000, rng)[0] == pytest.approx(0.8126, abs=0.015)
+
+
+def test_class_table_parallel_matches_serial():
+    table = preflop.build_class_table(samples=20, workers=2)
+    assert table.shape == (169, preflop.MAX_OPPONENTS)
+    assert np.array_equal(table, preflop.build_class_table(samples=20))
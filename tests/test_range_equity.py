@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pokerbot.card import card_codes
+from pokerbot.equity import _exact_equity, exact_equity, parse_villain
+from pokerbot.preflop import combo_index
+from pokerbot.range_equity import board_strengths, combo_equities, range_equity
+from pokerbot.ranges import Range
+
+
+@pytest.mark.parametrize("board", [["qs", "js", "2d", "3c", "9h"], ["qs", "js", "2d", "3c"], ["qs", "js", "2d"]])
+def test_matches_exact_equity(board):
+    villain = Range("TT+, AQs+, KJs, 98s:0.5, 32o").without(["as", "ks"])
+    result = range_equity(["as", "ks"], villain, board)
+    # Enumerating every villain combo, rather than the sweep that exact_equity also uses on the river:
+    expected = _exact_equity(card_codes(["as", "ks"]), card_codes(board), [parse_villain(villain)])
+    assert result.equity == pytest.approx(expected.equity)
+    assert result.win == pytest.approx(expected.win)
+    assert result.tie == pytest.approx(expected.tie)
+    assert result.n == expected.n
+
+
+def test_range_vs_range_symmetry():
+    board = ["qs", "js", "2d", "3c", "9h"]
+    hero, villain = Range("77+, AK, KQs"), Range("22+, ATs+, T9s:0.3")
+    a, b = range_equity(hero, villain, board), range_equity(villain, hero, board)
+    assert a.equity + b.equity == pytest.approx(1.0)
+    assert a.win == pytest.approx(b.loss)
+
+
+def test_board_strengths():
+    strengths = board_strengths([[0, 1, 2, 3, 4]])
+    assert strengths.shape == (1, 1326)
+    assert np.count_nonzero(strengths) == 47 * 46 // 2
+
+
+def test_combo_equities_match_exact_equity():
+    board = ["qs", "js", "2d", "3c", "9h"]
+    equities = combo_equities(board_strengths([card_codes(board)]))[0]
+    assert np.isnan(equities[combo_index(["qs", "as"])])
+    for hand in (["as", "ks"], ["2h", "2c"], ["7h", "5c"]):
+        assert equities[combo_index(hand)] == pytest.approx(exact_equity(hand, board, [~Range()]).equity)
@@ -0,0 +1,56 @@
+import pytest
+
+from pokerbot.equity import exact_equity
+from pokerbot.ranges import Range
+
+
+@pytest.mark.parametrize("notation, n", [
+    ("QQ+", 18), ("AKs", 4), ("AKo", 12), ("AK", 16), ("T9s-65s", 20), ("A5o+", 9 * 12),
+    ("22-44", 18), ("A2s-A5s", 16), ("10Ts", 0), ("AsKd", 1), ("QQ+, AKs, T9s-65s, A5o+", 18 + 4 + 20 + 108),
+])
+def test_parse(notation, n):
+    if n == 0:
+        with pytest.raises(ValueError):
+            Range(notation)
+    else:
+        assert len(Range(notation)) == n
+
+
+def test_weights_and_tens():
+    r = Range("A10s:0.5, JJ")
+    assert len(r) == 10
+    assert r.weights[r.mask].tolist().count(0.5) == 4
+    assert ["as", "10s"] in r
+    assert ["as", "10d"] not in r
+
+
+def test_set_operations():
+    a, b = Range("QQ+"), Range("KK+, AKs")
+    assert len(a | b) == 22
+    assert (a & b) == Range("KK+")
+    assert (a - b) == Range("QQ")
+    assert len(~Range()) == 1326
+
+
+def test_card_removal():
+    r = Range("AA, KK").without(["as", "2d", "3c"])
+    assert len(r) == 3 + 6
+    assert ["as", "ah"] not in r
+    assert all(51 not in codes for codes, _ in r)
+
+
+def test_iteration():
+    combos = Range("AKs").combos()
+    assert len(combos) == 4
+    assert all(len(codes) == 2 and w == 1.0 for codes, w in combos)
+
+
+def test_equity_against_range():
+    board = ["qs", "js", "2d", "3c"]
+    r = Range.from_hands([["qh", "qd"], ["2h", "2c"]])
+    expected = exact_equity(["as", "ks"], board, [[("qh", "qd"), ("2h", "2c")]])
+    assert exact_equity(["as", "ks"], board, [r]).equity == pytest.approx(expected.equity)
+    weighted = Range("QhQd:1, 2h2c:0.5")
+    a = exact_equity(["as", "ks"], board, [["qh", "qd"]]).equity
+    b = exact_equity(["as", "ks"], board, [["2h", "2c"]]).equity
+    assert exact_equity(["as", "ks"], board, [weighted]).equity == pytest.approx((a + 0.5 * b) / 1.5)
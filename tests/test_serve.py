@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+from pokerbot.evaluator import evaluate
+from pokerbot.card import card_codes
+from pokerbot.serve import EquityServer, evaluate_requests
+
+
+def test_evaluate_requests():
+    results = evaluate_requests([{"cards": ["as", "ks", "qs", "js", "10s"]}, {"cards": ["as", "as"]},
+                                 {"cards": ["2c", "2d", "2h", "7s", "9c", "jd"]}])
+    assert results[0] == ("result", {"strength": 7462, "category": "RF"})
+    assert results[1][0] == "error"
+    assert results[2][1]["strength"] == evaluate(card_codes(["2c", "2d", "2h", "7s", "9c", "jd"]))
+
+
+async def _session(path, requests):
+    server = EquityServer(window=0.01)
+    await server.start(path=str(path))
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in requests))
+        writer.write(b"not json\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(len(requests) + 1)]
+        writer.write(json.dumps({"id": "stats", "method": "stats"}).encode() + b"\n")
+        await writer.drain()
+        stats = json.loads(await reader.readline())
+        writer.close()
+        return responses, stats
+    finally:
+        await server.close()
+
+
+def test_server(tmp_path):
+    hands = [["as", "ks", "qs", "js", "10s"], ["2c", "2d", "7h", "9s", "jc"]] * 50
+    requests = [{"id": i, "method": "evaluate", "params": {"cards": h}} for i, h in enumerate(hands)]
+    requests.append({"id": "eq", "method": "equity",
+                     "params": {"hole": ["as", "ks"], "board": ["qs", "js", "2d", "3c", "4h"], "villains": [["qh", "qd"]]}})
+    requests.append({"id": "bad", "method": "nope"})
+    responses, stats = asyncio.run(_session(tmp_path / "pokerbot.sock", requests))
+    by_id = {r["id"]: r for r in responses}
+    assert by_id[0]["result"] == {"strength": 7462, "category": "RF"}
+    assert by_id[1]["result"]["category"] == "P"
+    assert by_id["eq"]["result"]["equity"] == pytest.approx(0.0)
+    assert "error" in by_id["bad"] and "error" in by_id[None]
+    assert stats["result"]["evaluate"]["requests"] == 100
+    assert stats["result"]["evaluate"]["mean_batch"] > 1
+    assert stats["result"]["evaluate"]["p99"] >= stats["result"]["evaluate"]["p50"]
+
+
+async def _responses_in_order(path, requests):
+    server = EquityServer(window=0.05)
+    await server.start(path=str(path))
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in requests))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(len(requests))]
+        writer.close()
+        return responses
+    finally:
+        await server.close()
+
+
+def test_fast_request_not_held_back(tmp_path):
+    slow = {"id": "slow", "method": "monte_carlo",
+            "params": {"hole": ["as", "ks"], "villains": 3, "samples": 1000000, "seed": 0}}
+    fast = {"id": "fast", "method": "equity",
+            "params": {"hole": ["as", "ks"], "board": ["qs", "js", "2d", "3c", "4h"], "villains": [["qh", "qd"]]}}
+    responses = asyncio.run(_responses_in_order(tmp_path / "pokerbot.sock", [slow, slow, fast]))
+    assert responses[0]["id"] == "fast"
+    assert [r["id"] for r in responses[1:]] == ["slow", "slow"]
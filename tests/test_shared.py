@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+
+from pokerbot import batch_evaluator, indexes, shared
+
+
+def _worker_state(_):
+    flop = indexes.load_index("flop")
+    keys, _ = batch_evaluator.unsuited_arrays(7)
+    return type(flop).__name__, flop.filename, flop.flags.writeable, keys.filename, int(flop.sum())
+
+
+def test_workers_attach_to_shared_tables():
+    with shared.SharedTables() as tables, tables.executor(2) as executor:
+        results = list(executor.map(_worker_state, range(4)))
+        paths = set(tables.manifest.values())
+        assert all(os.path.exists(p) for p in paths)
+    assert tables.closed and not any(os.path.exists(p) for p in paths)
+    expected = int(indexes.build_index("flop").sum())
+    for kind, flop_path, writeable, keys_path, total in results:
+        assert kind == "memmap" and not writeable and total == expected
+        assert flop_path in paths and keys_path in paths
+
+
+def test_attach_and_detach():
+    tables = shared.SharedTables({("index", "river"): indexes.build_index("river")})
+    try:
+        before = indexes.load_index("river")
+        shared.attach(tables.manifest)
+        river = indexes.load_index("river")
+        assert river.filename == tables.manifest[("index", "river")]
+        assert np.array_equal(river, before)
+        shared.detach()
+        assert indexes.load_index("river") is not river
+    finally:
+        tables.close()
@@ -0,0 +1,97 @@
+import numpy as np
+
+from pokerbot.card import card_codes
+from pokerbot.table import CALL, FOLD, RAISE, Table, TableBatch, call_policy, first_seat, random_policy
+
+
+def test_first_seat():
+    mask = np.array([[True, False, True], [False, False, False]])
+    assert first_seat(mask, np.array([1, 0])).tolist() == [2, -1]
+
+
+def test_chips_are_conserved():
+    policies = [random_policy(seed=i) for i in range(6)]
+    batch = TableBatch(500, policies, seed=0, rebuy=False)
+    for _ in range(20):
+        batch.play_hand()
+        assert (batch.stacks.sum(axis=1) == 6 * 200).all()
+        assert (batch.stacks >= 0).all()
+    assert (batch.winnings.sum(axis=1) == 0).all()
+
+
+def test_folds_to_the_big_blind():
+    batch = TableBatch(10, [lambda b, t, s: (np.full(len(t), FOLD), np.zeros(len(t)))] * 3, seed=0)
+    won = batch.play_hand()
+    # Button (0) and small blind (1) fold, the big blind (2) wins the small blind:
+    assert (won == [0, -1, 1]).all()
+
+
+def test_side_pots():
+    batch = TableBatch(1, [call_policy] * 3, seed=0)
+    batch.start_hand()
+    batch.hole[0] = [card_codes(["as", "ad"]), card_codes(["ks", "kd"]), card_codes(["qs", "qd"])]
+    batch.board[0] = card_codes(["2c", "7h", "9d", "jc", "3s"])
+    batch.committed[0] = [50, 100, 200]
+    batch.folded[0] = False
+    batch.stacks[0] = [0, 0, 0]
+    batch._showdown(np.array([0]))
+    # Main pot of 150 to AA, side pot of 100 to KK, and the uncalled 100 back to QQ:
+    assert batch.stacks[0].tolist() == [150, 100, 100]
+
+
+def test_split_pot_odd_chip():
+    batch = TableBatch(1, [call_policy] * 3, seed=0)
+    batch.start_hand()
+    batch.hole[0] = [card_codes(["2s", "3d"]), card_codes(["4s", "5d"]), card_codes(["6s", "7d"])]
+    batch.board[0] = card_codes(["ac", "kh", "qd", "jc", "10s"])
+    batch.committed[0] = [1, 2, 2]
+    batch.folded[0] = False
+    batch.stacks[0] = [0, 0, 0]
+    batch._showdown(np.array([0]))
+    assert batch.stacks[0].sum() == 5
+    assert sorted(batch.stacks[0].tolist()) == [1, 2, 2]
+
+
+def test_scalar_table():
+    seen = list()
+
+    def raiser(obs):
+        seen.append(obs)
+        return RAISE, obs["max_raise_to"]
+
+    table = Table([raiser, lambda obs: (CALL, None)], seed=1)
+    won = table.play_hand()
+    assert won.sum() == 0 and abs(won[0]) == 200
+    assert seen[0]["to_call"] == 1 and len(seen[0]["hole"]) == 2
+
+
+def test_short_all_in_does_not_reopen_raising():
+    seen = list()
+
+    def opener(batch, tables, seat):
+        seen.append((batch.to_call(tables, seat)[0], batch.can_raise(tables, seat)[0]))
+        return np.full(len(tables), RAISE), np.full(len(tables), 20)
+
+    def shover(batch, tables, seat):
+        return np.full(len(tables), RAISE), batch.max_raise_to(tables, seat)
+
+    def folder(batch, tables, seat):
+        return np.full(len(tables), FOLD), np.zeros(len(tables))
+
+    batch = TableBatch(1, [opener, shover, folder], seed=0)
+    batch.start_hand()
+    batch.stacks[0, 1] = 29  # The small blind can only raise to 30, less than a full raise to 38.
+    for _ in range(4):
+        batch.step()
+    # The opener faces the short all-in, and may only call or fold: its raise is a call.
+    assert seen == [(2, True), (10, False)]
+    assert batch.committed[0].tolist() == [30, 30, 2]
+
+
+def test_full_raise_reopens_raising():
+    batch = TableBatch(1, [call_policy] * 3, seed=0)
+    batch.start_hand()
+    batch._act(np.array([0]), 0, np.array([RAISE]), np.array([20]))
+    batch.to_act[0] = 1
+    batch._act(np.array([0]), 1, np.array([RAISE]), np.array([38]))
+    assert batch.can_raise(np.array([0]), 0).tolist() == [True]